@@ -1,4 +1,7 @@
+import os
 import re
+# MTGO writes its logs in the Windows ANSI code page.
+LOG_ENCODING = "ansi" if os.name == "nt" else "cp1252"
 MULL_DICT = {"seven":0,"six":1,"five":2,"four":3,"three":4,"two":5,"one":6,"zero":7}
 SPLIT_CARDS = {
     'Alive': 'Alive/Well',
@@ -317,6 +320,9 @@ ARCHETYPES = [
     ]
 
 CARDS_DRAWN_DICT = {"zero":0,"a":1,"two":2,"three":3,"four":4,"five":5,"six":6,"seven":7}
+# Second word of a game action -> Plays.Action
+# These take precedence over the key phrases checked in modo.play_data.
+PLAY_KEYWORDS = {"plays":"Land Drop","casts":"Casts","draws":"Draws"}
 
 MATCHES_HEADER = [
     "Match_ID",
@@ -417,6 +423,30 @@ HEADERS = {
     'Matches': MATCHES_HEADER
 }
 
+# Columns holding whole numbers in every table they appear in.
+INTEGER_COLUMNS = {
+    'P1_Roll', 'P2_Roll', 'P1_Wins', 'P2_Wins', 'Game_Num', 'P1_Mulls',
+    'P2_Mulls', 'Turns', 'Play_Num', 'Turn_Num', 'Opp_Target', 'Self_Target',
+    'Cards_Drawn', 'Attackers', 'Match_Wins', 'Match_Losses', 'Pack_Num',
+    'Pick_Num', 'Pick_Ovr'
+}
+
+# Columns that trade places when a Match/Game is seen from P2's perspective.
+SWAPPED_COLUMNS = {
+    'Matches': [('P1', 'P2'), ('P1_Arch', 'P2_Arch'), ('P1_Subarch', 'P2_Subarch'),
+                ('P1_Roll', 'P2_Roll'), ('P1_Wins', 'P2_Wins')],
+    'Games': [('P1', 'P2'), ('P1_Mulls', 'P2_Mulls'), ('On_Play', 'On_Draw')]
+}
+# Columns holding 'P1'/'P2' that flip when the players are swapped.
+TRANSLATED_COLUMNS = {
+    'Matches': ['Roll_Winner', 'Match_Winner'],
+    'Games': ['PD_Selector', 'Game_Winner']
+}
+# Match columns that are filled in by hand after importing,
+# kept when a changed GameLog is imported again.
+MANUAL_MATCH_COLUMNS = ['P1_Arch', 'P1_Subarch', 'P2_Arch', 'P2_Subarch',
+    'Format', 'Limited_Format', 'Match_Type', 'Draft_ID']
+
 BASIC_LAND_DICT = {
     'Plains': 'W',
     'Island': 'U',
@@ -435,5 +465,8 @@ COMMON_WORDS = [
 ]
 
 CARD_PATTERN = re.compile(r"@\[(.+?)@]")
+COMMON_WORDS_PATTERN = re.compile('|'.join(COMMON_WORDS))
+# the @:NUMBERS,NUMBERS: id in @[Cardname@:NUMBERS,NUMBERS:@]
+CARD_ID_PATTERN = re.compile(r"@:\d+?,\d+?:(?=@\])")
 DIE_ROLL_PATTERN = re.compile(r"^(.*?) rolled a ([1-6])", re.MULTILINE)
 P1_P2_TRANSLATION = str.maketrans('12','21')
\ No newline at end of file
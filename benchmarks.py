@@ -0,0 +1,427 @@
+# Benchmark Module
+# Times the current implementation of a function against the one it replaced
+# on a folder of real logs, after checking that both give the same results.
+import argparse
+import io
+import mmap
+import os
+import pickle
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Union
+import modo
+from importer import (DEFAULT_WORKERS, LOG_ENCODING, find_gamelogs, import_gamelogs,
+    map_file)
+from MODO_DATA import CARD_PATTERN, CARDS_DRAWN_DICT, COMMON_WORDS, HEADERS
+from datatypes import AllData, MatchActions, PlayData
+
+def legacy_remove_text_artifacts(game_action: str) -> str:
+    for word in COMMON_WORDS:
+        if word in game_action[-10:]:
+            raise ValueError('Expected string with text artifacts, got '
+                f'"{game_action}"')
+    game_action = game_action[:-10]
+    if '.' in game_action[-4:-1]:
+        game_action = game_action.rsplit('.', 1)[0]
+    return game_action
+
+def legacy_all_actions(game_log: str) -> MatchActions:
+    """modo.all_actions before it was rewritten as a single pass tokenizer."""
+    match_actions = MatchActions([modo.get_match_id(game_log)])
+    players_list = modo.players(game_log)
+    turn_header = modo.new_turn_regex(players_list)
+    lost_conn = {player: False for player in players_list}
+    for player in players_list:
+        game_log = game_log.replace(player,modo.alter(player))
+    split_log = game_log.split("@P")
+    game_log_list = [
+        legacy_remove_text_artifacts(game_action) for game_action in split_log[1:-1]]
+    game_log_list.append(split_log[-1])
+    for game_action in game_log_list:
+        if not game_action:
+            continue
+        first_word = game_action.split()[0]
+        turn_header_match = turn_header.search(game_action)
+        if turn_header_match:
+            match_actions.append(turn_header_match[0])
+        elif " has lost connection to the game" in game_action:
+            lost_conn[first_word] = True
+        elif " joined the game." in game_action:
+            if lost_conn[first_word]:
+                lost_conn[first_word] = False
+            else:
+                match_actions.append(game_action)
+        elif any(action in game_action for action in [
+            " draws their next card.",
+            " has left the game." ]):
+            continue
+        elif ('.' not in game_action) and ("is being attacked" not in game_action):
+            continue
+        elif ("@[" in game_action) and ("@]" in game_action):
+            newstring = re.sub(
+                r"(@\[.+?)(@:\d+?,\d+?:)(@\])",
+                r'\g<1>\g<3>',
+                game_action)
+            match_actions.append(newstring)
+        elif "." in game_action:
+            match_actions.append(game_action)
+    return match_actions
+
+def legacy_is_play(play: str) -> bool:
+    action_keywords = ["plays","casts","draws","chooses","discards"]
+    action_keyphrases = [
+        "is being attacked by",
+        "puts triggered ability from",
+        "activates an ability of",]
+    curr_list = play.split()
+    if len(curr_list) > 1:
+        if curr_list[1] in action_keywords:
+            return True
+        if any([phrase in play for phrase in action_keyphrases]):
+            return True
+    return False
+
+def legacy_play_data(game_actions: MatchActions) -> list[PlayData]:
+    """modo.play_data before plays were classified by their second word."""
+    all_plays = []
+    p1, p2 = game_actions.players[0:2]
+    turn_regex = modo.new_turn_regex([p1,p2])
+    game_num = turn_num = play_num = 0
+    active_player = nonactive_player = ''
+    alter = modo.alter
+
+    for current_action in game_actions:
+        play = PlayData()
+        play.Match_ID = game_actions.match_id
+        play.Casting_Player = play.Action = ""
+        play.Primary_Card = play.Target1 = play.Target2 = play.Target3 = "NA"
+        play.Opp_Target = play.Self_Target = play.Cards_Drawn = play.Attackers = 0
+        new_turn_match = turn_regex.search(current_action)
+        curr_word_list = current_action.split()
+        cards_in_action = CARD_PATTERN.findall(current_action)
+        if "chooses to " in current_action and ' play first' in current_action:
+            game_num += 1
+            play_num = 0
+        elif new_turn_match:
+            turn_num = int(new_turn_match[1])
+            active_player = new_turn_match[2]
+            nonactive_player = p2 if active_player == p1 else p1
+        elif legacy_is_play(current_action) and curr_word_list[1] != "chooses":
+            all_plays.append(play)
+            play_num += 1
+            play.Active_Player = alter(active_player, original=True)
+            play.Nonactive_Player = alter(nonactive_player, original=True)
+            play.Casting_Player = alter(curr_word_list[0], original=True)
+            play.Play_Num = play_num
+            play.Game_Num = game_num
+            play.Turn_Num = turn_num
+            if curr_word_list[1] == "plays":
+                play.Primary_Card = cards_in_action[0] if cards_in_action else 'NA'
+                play.Action = "Land Drop"
+            elif curr_word_list[1] == "casts":
+                play.Primary_Card = cards_in_action[0] if cards_in_action else 'NA'
+                play.Action = 'Casts'
+                if "targeting" in current_action:
+                    play.parse_targets(current_action)
+            elif curr_word_list[1] == "draws":
+                play.Action = 'Draws'
+                play.Cards_Drawn = CARDS_DRAWN_DICT.get(curr_word_list[2], 8)
+            elif "activates an ability of" in current_action:
+                play.Action = "Activated Ability"
+                play.parse_targets(current_action)
+                if cards_in_action:
+                    play.Primary_Card = cards_in_action[0]
+                else:
+                    card = current_action.split(
+                        "activates an ability of ")[1].split(" (")[0]
+                    play.Primary_Card = 'NA' if card in (p1,p2) else card
+            elif curr_word_list[1] == "discards":
+                play.Action = 'Discards'
+                play.Primary_Card = cards_in_action[0] if cards_in_action else 'NA'
+            elif "is being attacked by" in current_action:
+                play.Casting_Player = alter(active_player, original=True)
+                play.Action = "Attacks"
+                play.Attackers = len(CARD_PATTERN.findall(current_action.split("is being attacked by")[1]))
+            elif "puts triggered ability from" in current_action:
+                play.Action = "Triggers"
+                play.parse_targets(current_action)
+                if cards_in_action:
+                    play.Primary_Card = cards_in_action[0]
+                else:
+                    play.Primary_Card = current_action.split("triggered ability from ")[1].split(" onto the stack ")[0]
+                    if play.Primary_Card in (p1,p2):
+                        play.Primary_Card = "NA"
+    return all_plays
+
+def legacy_read_actions(file_path: str) -> MatchActions:
+    """Reads a GameLog as text before tokenizing it, like importer.parse_gamelog did."""
+    with io.open(file_path,"r",encoding=LOG_ENCODING) as gamelog:
+        return modo.all_actions(gamelog.read())
+
+def read_actions(file_path: str) -> MatchActions:
+    with open(file_path,"rb") as gamelog:
+        content = map_file(gamelog)
+    try:
+        return modo.all_actions(content)
+    finally:
+        if isinstance(content, mmap.mmap):
+            content.close()
+
+def legacy_update_game_wins(all_data: AllData, timeout: dict[str, str]) -> None:
+    """modo.update_game_wins before games were counted with one group-by."""
+    for match in all_data.matches:
+        match.P1_Wins = 0
+        match.P2_Wins = 0
+        match.Match_Winner = "NA"
+        for winner in [game.Game_Winner for game in all_data[1] 
+                    if match.Match_ID == game.Match_ID]:
+            if winner == "P1":
+                match.P1_Wins += 1
+            elif winner == "P2":
+                match.P2_Wins += 1
+        if match.P1_Wins > match.P2_Wins:
+            match.Match_Winner = "P1"
+        elif match.P2_Wins > match.P1_Wins:
+            match.Match_Winner = "P2"
+        else:
+            if match.Match_ID in timeout:
+                if match.P1 == timeout[match.Match_ID]:
+                    match.Match_Winner = "P2"
+                elif match.P2 == timeout[match.Match_ID]:
+                    match.Match_Winner = "P1"
+
+def legacy_closest_list(
+    cards_played: set[str],
+    ad: dict[str, tuple[str, str, set[str]]],
+    yyyy_mm: str) -> tuple[str, str]:
+    """modo.closest_list before decklists were scored through a DeckIndex."""
+    decks = []
+    yyyy = yyyy_mm[0:4]
+    mm = yyyy_mm[5:7]
+    if mm == "01":
+        mm = "12"
+        yyyy = str(int(yyyy) - 1)
+    else:
+        mm = str(int(mm) - 1).zfill(2)
+    yyyy_mm_prev = yyyy + "-" + mm
+
+    if yyyy_mm in ad:
+        decks = ad.get(yyyy_mm).copy()
+    if yyyy_mm_prev in ad:
+        decks.extend(ad.get(yyyy_mm_prev).copy())
+    if decks == []:
+        return ["Unknown","NA"]
+
+    similarity_list = []
+    for i in decks:
+        if i == None:
+            print("error: Null List")
+            continue
+
+        if len(i[2]) == 0:
+            similarity = 0
+        else:
+            similarity = len(cards_played.intersection(i[2]))/len(i[2])
+        similarity = round((similarity * 100),3)
+        similarity_list.append(similarity)
+
+    index = similarity_list.index(max(similarity_list))
+    if max(similarity_list) > 20:
+        return [decks[index][0],decks[index][1]]
+    else:
+        return ["Unknown","NA"]
+
+def read_gamelogs(logs_path: str) -> list[str]:
+    game_logs = []
+    for file_path in find_gamelogs(logs_path, {}):
+        with io.open(file_path,"r",encoding=LOG_ENCODING) as gamelog:
+            game_logs.append(gamelog.read())
+    return game_logs
+
+def time_function(function: Callable, inputs: list, repeat: int) -> tuple[float, list]:
+    """Best of repeat runs over all inputs.
+
+    Returns:
+        tuple[float, list]: (seconds, outputs of the last run)
+            Outputs are the ValueError/KeyError raised for failing inputs.
+    """
+    best = None
+    for _ in range(repeat):
+        outputs = []
+        start = time.perf_counter()
+        for value in inputs:
+            try:
+                outputs.append(function(value))
+            except (ValueError, KeyError) as error:
+                outputs.append(type(error))
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, outputs
+
+def compare(name: str, legacy: Callable, current: Callable, inputs: list,
+    repeat: int, convert: Callable=lambda output: output) -> int:
+    """Checks that legacy and current agree on every input and prints timings.
+        convert is applied to the outputs of current before comparing,
+        outside of the timed runs.
+
+    Returns:
+        int: 0 if both give the same results, 1 otherwise.
+    """
+    legacy_seconds, legacy_outputs = time_function(legacy, inputs, repeat)
+    current_seconds, current_outputs = time_function(current, inputs, repeat)
+    current_outputs = [output if isinstance(output, type) else convert(output)
+        for output in current_outputs]
+    # legacy failures that the current version handles are not mismatches
+    mismatches = [index for index, (old, new) in
+        enumerate(zip(legacy_outputs, current_outputs))
+        if (old != new) and not isinstance(old, type)]
+    fixed = sum(1 for old, new in zip(legacy_outputs, current_outputs)
+        if isinstance(old, type) and not isinstance(new, type))
+    print(f"{name}: {len(inputs)} inputs, best of {repeat}")
+    print(f"  legacy:  {legacy_seconds:.3f}s")
+    print(f"  current: {current_seconds:.3f}s "
+        f"({legacy_seconds / max(current_seconds, 1e-9):.2f}x)")
+    if fixed:
+        print(f"  {fixed} inputs failed with the legacy version only")
+    if mismatches:
+        print(f"  {len(mismatches)} inputs give different results, "
+            f"first: {mismatches[0]}")
+        return 1
+    return 0
+
+def bench_all_actions(logs_path: str, repeat: int) -> int:
+    game_logs = read_gamelogs(logs_path)
+    return compare("all_actions", legacy_all_actions, modo.all_actions,
+        game_logs, repeat)
+
+def bench_play_data(logs_path: str, repeat: int) -> int:
+    match_actions = [modo.all_actions(game_log) 
+        for game_log in read_gamelogs(logs_path)]
+    return compare("play_data", legacy_play_data, modo.play_data, 
+        match_actions, repeat, convert=list)
+
+def bench_read_actions(logs_path: str, repeat: int) -> int:
+    return compare("read_actions", legacy_read_actions, read_actions,
+        find_gamelogs(logs_path, {}), repeat)
+
+def bench_update_game_wins(logs_path: str, repeat: int) -> int:
+    all_data, _ = import_gamelogs(find_gamelogs(logs_path, {}), {}, {})
+    # every fifth match timed out, so ties are resolved by the join
+    timeout = {match.Match_ID: match.P1 for match in all_data.matches[::5]}
+    def wins(update: Callable) -> Callable:
+        def run(data: AllData) -> list[tuple]:
+            update(data, timeout)
+            return [(m.P1_Wins, m.P2_Wins, m.Match_Winner) for m in data.matches]
+        return run
+    return compare("update_game_wins", wins(legacy_update_game_wins), 
+        wins(modo.update_game_wins), [all_data], repeat)
+
+def imported_rows(file_paths: list[str], workers: int) -> tuple:
+    all_data, _ = import_gamelogs(file_paths, {}, {}, workers=workers)
+    return ([list(row) for row in all_data.matches],
+        [list(row) for row in all_data.games],
+        [list(row) for row in all_data.plays], dict(all_data.raw_game_data))
+
+def seeded_import(file_paths: list[str], workers: int, seed: int) -> tuple:
+    """imported_rows in a new interpreter with PYTHONHASHSEED=seed. 
+        Worker processes inherit the seed of their parent, so only this 
+        catches results that depend on the order of a set."""
+    with tempfile.TemporaryDirectory() as folder:
+        input_path = os.path.join(folder, "input")
+        output_path = os.path.join(folder, "output")
+        with open(input_path, "wb") as file:
+            pickle.dump(file_paths, file)
+        script = ("import pickle, sys, benchmarks\n"
+            "paths = pickle.load(open(sys.argv[1], 'rb'))\n"
+            "rows = benchmarks.imported_rows(paths, int(sys.argv[3]))\n"
+            "pickle.dump(rows, open(sys.argv[2], 'wb'))")
+        subprocess.run([sys.executable, "-c", script, input_path, output_path, str(workers)],
+            check=True, stdout=subprocess.DEVNULL, cwd=os.path.dirname(os.path.abspath(__file__)),
+            env={**os.environ, "PYTHONHASHSEED": str(seed)})
+        with open(output_path, "rb") as file:
+            return pickle.load(file)
+
+def swapped_games(rows: tuple) -> int:
+    """Games whose P1/P2 are not the ones of their Match."""
+    p1, p2 = HEADERS["Matches"].index("P1"), HEADERS["Matches"].index("P2")
+    players = {match[0]: (match[p1], match[p2]) for match in rows[0]}
+    return sum(1 for game in rows[1] if players.get(game[0], (game[1], game[2])) != (game[1], game[2]))
+
+def bench_import_gamelogs(logs_path: str, repeat: int) -> int:
+    """The parallel import has to give exactly the data of the serial one,
+        whatever the hash seed of the process."""
+    file_paths = find_gamelogs(logs_path, {})
+    workers = max(DEFAULT_WORKERS, 2)
+    failed = compare("import_gamelogs (serial vs parallel)", 
+        lambda paths: imported_rows(paths, 1), lambda paths: imported_rows(paths, workers),
+        [file_paths], repeat)
+    serial = imported_rows(file_paths, 1)
+    for seed, seed_workers in ((1, 1), (2, workers), (3, 1)):
+        rows = seeded_import(file_paths, seed_workers, seed)
+        swapped = swapped_games(rows)
+        if rows != serial:
+            print(f"  PYTHONHASHSEED={seed}, {seed_workers} workers: different results")
+            failed = 1
+        if swapped:
+            print(f"  PYTHONHASHSEED={seed}: {swapped} games with P1/P2 swapped against their Match")
+            failed = 1
+    return failed
+
+def sample_decks(logs_path: str) -> tuple[dict[str, list], list[tuple[set[str], str]]]:
+    """Cards played in every other match stand in for the sample decklists,
+        the players of the remaining matches are matched against them.
+
+    Returns:
+        tuple[dict[str, list], list[tuple[set[str], str]]]:
+            (decklists like ALL_DECKS, (cards played, "yyyy-mm") pairs)
+    """
+    all_data, _ = import_gamelogs(find_gamelogs(logs_path, {}), {}, {})
+    card_sets = all_data.card_sets()
+    ad = {}
+    inputs = []
+    for position, match in enumerate(all_data.matches):
+        yyyy_mm = match.Date[0:4] + "-" + match.Date[5:7]
+        for player in (match.P1, match.P2):
+            cards = set(card_sets.get((match.Match_ID, player), ())) - {"NA"}
+            if position % 2:
+                inputs.append((cards, yyyy_mm))
+            else:
+                ad.setdefault(yyyy_mm, []).append((player, match.Format, cards))
+    return ad, inputs
+
+def bench_closest_list(logs_path: str, repeat: int) -> int:
+    ad, inputs = sample_decks(logs_path)
+    def guess(closest: Callable) -> Callable:
+        return lambda value: closest(value[0], ad, value[1])
+    return compare("closest_list", guess(legacy_closest_list), 
+        guess(modo.closest_list), inputs, repeat)
+
+def bench_closest_lists(logs_path: str, repeat: int) -> int:
+    ad, inputs = sample_decks(logs_path)
+    def legacy(values: list[tuple[set[str], str]]) -> list[tuple[str, str]]:
+        return [legacy_closest_list(cards, ad, yyyy_mm) for cards, yyyy_mm in values]
+    return compare("closest_lists", legacy, 
+        lambda values: modo.closest_lists(values, ad), [inputs], repeat)
+
+BENCHMARKS = {"all_actions": bench_all_actions, "play_data": bench_play_data,
+    "read_actions": bench_read_actions, "update_game_wins": bench_update_game_wins,
+    "closest_list": bench_closest_list, "closest_lists": bench_closest_lists,
+    "import_gamelogs": bench_import_gamelogs}
+
+def main(argv: Union[list[str], None]=None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks",
+        description="Compare optimized functions against their previous versions.")
+    parser.add_argument("benchmark",choices=BENCHMARKS)
+    parser.add_argument("logs",help="GameLogs folder")
+    parser.add_argument("--repeat",type=int,default=3,
+        help="runs per version, the best one is reported")
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.logs):
+        parser.error(f"{args.logs} is not a folder")
+    return BENCHMARKS[args.benchmark](args.logs, args.repeat)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,13 @@
+import bisect
+from collections.abc import Iterable, Iterator, MutableMapping, Sequence
 from typing import Literal, Union
 from MODO_DATA import (GAME_HEADER, LIMITED_FORMATS, PLAYS_HEADER, 
-    MATCHES_HEADER, CARD_PATTERN)
+    MATCHES_HEADER, CARD_PATTERN, HEADERS, SWAPPED_COLUMNS, TRANSLATED_COLUMNS,
+    P1_P2_TRANSLATION, INTEGER_COLUMNS)
+import numpy as np
+import pandas as pd
 import re
+import zlib
 
 class MatchActions(list):
     def __init__(self, *args):
@@ -26,7 +32,8 @@ class MatchActions(list):
     def players(self):
         player_name_re = re.compile(r'^(.*?) joined the game', re.MULTILINE)
         players_list = list(set(player_name_re.findall('\n'.join(self))))
-        players_list.sort(key=len, reverse=True)
+        # same order as modo.players, ties by name
+        players_list.sort(key=lambda name: (-len(name), name))
         return players_list
 
 def property_factory(index: int) -> property:
@@ -123,37 +130,901 @@ class PlayData(list):
         Args:
             action_string (str): The line in the game log that describes this play.
         """
-        self.Target1 = self.Target2 = self.Target3 = 'NA'
-        self.Opp_Target = self.Self_Target = 0
-        if 'targeting' not in action_string:
+        (self.Target1, self.Target2, self.Target3, self.Opp_Target, 
+            self.Self_Target) = action_targets(action_string, 
+                self.Casting_Player, self.Active_Player, self.Nonactive_Player)
+    for category in PLAYS_HEADER:
+        exec(f'{category} = property_factory(PLAYS_HEADER.index("{category}"))')
+
+NO_TARGETS = ('NA', 'NA', 'NA', 0, 0)
+
+def action_targets(
+    action_string: str, 
+    casting_player: str, 
+    active_player: str, 
+    nonactive_player: str) -> tuple[str, str, str, int, int]:
+    """Parses the targets of a play from the whole log line.
+
+    Args:
+        action_string (str): The line in the game log that describes the play.
+        casting_player (str): Player making the play.
+        active_player (str): Player whose turn it is.
+        nonactive_player (str): The other player.
+
+    Returns:
+        tuple[str, str, str, int, int]: 
+            (Target1, Target2, Target3, Opp_Target, Self_Target)
+    """
+    if 'targeting' not in action_string:
+        return NO_TARGETS
+    target_string = action_string.split("targeting")[1]
+    targets = CARD_PATTERN.findall(target_string) + ['NA'] * 3
+    without_brackets = re.sub(r'\[.*?\]', '', target_string)
+    other_player = (
+        nonactive_player if casting_player == active_player else active_player)
+    return (targets[0], targets[1], targets[2], 
+        int(other_player in without_brackets), 
+        int(casting_player in without_brackets))
+
+class PlayBuffer(Sequence):
+    """Plays collected column by column while parsing (see modo.play_data).
+        Rows are only built as PlayData when the buffer is indexed or 
+        iterated, ColumnTable.extend takes the columns as they are.
+    """
+    def __init__(self):
+        self.columns = tuple([] for _ in PLAYS_HEADER)
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return PlayData([column[index] for column in self.columns])
+
+    def __iter__(self):
+        for row in zip(*self.columns):
+            yield PlayData(row)
+
+    def add(self, *values) -> None:
+        """Appends one play, values in PLAYS_HEADER order."""
+        for column, value in zip(self.columns, values):
+            column.append(value)
+
+class CodeColumn:
+    """Column stored as integer codes into a list of distinct values.
+        Used for strings (players, cards, actions, formats, ...)."""
+    def __init__(self, values: list=()):
+        self.categories = []
+        self.lookup = {}
+        self.codes = np.zeros(0, dtype=np.int32)
+        self.category_array = None
+        self.extend(values, 0)
+
+    def code(self, value) -> int:
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.categories)
+            self.categories.append(value)
+            self.category_array = None
+        return code
+
+    def reserve(self, capacity: int) -> None:
+        if capacity > len(self.codes):
+            self.codes = np.resize(self.codes, capacity)
+
+    def extend(self, values: list, start: int) -> None:
+        self.reserve(start + len(values))
+        self.codes[start:start + len(values)] = [self.code(v) for v in values]
+
+    def get(self, index: int):
+        return self.categories[self.codes[index]]
+
+    def set(self, index: int, value) -> None:
+        self.codes[index] = self.code(value)
+
+    def array(self, length: int, categorical: bool) -> Union[np.ndarray, pd.Categorical]:
+        if self.category_array is None:
+            self.category_array = np.empty(len(self.categories), dtype=object)
+            self.category_array[:] = self.categories
+        if categorical:
+            return pd.Categorical.from_codes(self.codes[:length], 
+                categories=pd.Index(self.category_array, dtype=object))
+        return self.category_array[self.codes[:length]]
+
+    def take(self, positions: np.ndarray) -> np.ndarray:
+        """Values at positions only, without decoding the whole column."""
+        self.array(0, False)
+        return self.category_array[self.codes[positions]]
+
+class IntColumn:
+    """Column stored as an int64 array (turns, mulligans, rolls, ...)."""
+    def __init__(self):
+        self.values = np.zeros(0, dtype=np.int64)
+
+    @staticmethod
+    def accepts(values: list) -> bool:
+        return all(isinstance(v, (int, np.integer)) and not isinstance(v, bool)
+            for v in values)
+
+    def reserve(self, capacity: int) -> None:
+        if capacity > len(self.values):
+            self.values = np.resize(self.values, capacity)
+
+    def extend(self, values: list, start: int) -> None:
+        self.reserve(start + len(values))
+        self.values[start:start + len(values)] = values
+
+    def get(self, index: int) -> int:
+        return int(self.values[index])
+
+    def set(self, index: int, value: int) -> None:
+        self.values[index] = value
+
+    def array(self, length: int, categorical: bool) -> np.ndarray:
+        return self.values[:length]
+
+    def take(self, positions: np.ndarray) -> np.ndarray:
+        return self.values[positions]
+
+class ColumnTable(Sequence):
+    """Matches, Games or Plays held as one typed array per column instead of
+        a list of row lists. Rows are handed out as proxies (MatchRow, 
+        GameRow, PlayRow) that read and write the columns, so code written
+        for MatchData/GameData/PlayData keeps working.
+    """
+    def __init__(self, table: Literal["Matches","Games","Plays"], rows: list=()):
+        self.table = table
+        self.header = HEADERS[table]
+        self.row_type = ROW_PROXIES[table]
+        self.length = 0
+        self.columns = [IntColumn() if column in INTEGER_COLUMNS else CodeColumn()
+            for column in self.header]
+        self.extend(rows)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("ColumnTable index out of range")
+        return self.row_type(self, index)
+
+    def __setitem__(self, index: int, row: list) -> None:
+        if index < 0:
+            index += self.length
+        values = list(row)
+        for column_index in range(len(self.header)):
+            self.set(index, column_index, values[column_index])
+
+    def get(self, index: int, column_index: int):
+        return self.columns[column_index].get(index)
+
+    def set(self, index: int, column_index: int, value) -> None:
+        column = self.columns[column_index]
+        if isinstance(column, IntColumn) and not IntColumn.accepts([value]):
+            column = self.to_codes(column_index)
+        column.set(index, value)
+
+    def column(self, column_index: int, 
+        positions: Union[np.ndarray, None]=None) -> np.ndarray:
+        if positions is not None:
+            return self.columns[column_index].take(positions)
+        return np.asarray(self.columns[column_index].array(self.length, False))
+
+    def set_column(self, column_index: int, values: Sequence) -> None:
+        """Overwrites a whole column, values has one entry per row."""
+        column = self.columns[column_index]
+        values = list(values)
+        if isinstance(column, IntColumn) and not IntColumn.accepts(values):
+            column = self.to_codes(column_index)
+        column.extend(values, 0)
+
+    def take(self, positions: np.ndarray) -> "ColumnTable":
+        """New table with the rows at positions, in that order."""
+        table = ColumnTable(self.table)
+        for column_index, column in enumerate(self.columns):
+            if isinstance(column, IntColumn):
+                new_column = IntColumn()
+                new_column.values = column.values[:self.length][positions]
+            else:
+                new_column = CodeColumn()
+                new_column.categories = list(column.categories)
+                new_column.lookup = dict(column.lookup)
+                new_column.codes = column.codes[:self.length][positions]
+            table.columns[column_index] = new_column
+        table.length = len(positions)
+        return table
+
+    def to_codes(self, column_index: int) -> CodeColumn:
+        """Stores an integer column as codes once it gets a non-integer value."""
+        column = self.columns[column_index]
+        self.columns[column_index] = CodeColumn(
+            column.values[:self.length].tolist())
+        return self.columns[column_index]
+
+    def append(self, row: list) -> None:
+        self.extend([row])
+
+    def extend(self, rows: Union[list, PlayBuffer]) -> None:
+        if isinstance(rows, PlayBuffer):
+            columns = rows.columns
+        else:
+            columns = list(zip(*[list(row) for row in rows]))
+        if not (columns and len(columns[0])):
             return
-        target_string = action_string.split("targeting")[1]
-        targets = CARD_PATTERN.findall(target_string)
-        try:
-            self.Target1 = targets[0]
-            self.Target2 = targets[1]
-            self.Target3 = targets[2]
-        except IndexError:
-            pass
-        without_brackets = re.sub(r'\[.*?\]', '', target_string)
-        self.Self_Target = int(self.Casting_Player in without_brackets)
-        other_player = (
-            self.Nonactive_Player if self.Casting_Player == self.Active_Player 
-            else self.Active_Player)
-        self.Opp_Target = int(other_player in without_brackets)
+        count = len(columns[0])
+        capacity = max(self.length + count, 2 * self.length)
+        for column_index, values in enumerate(columns):
+            column = self.columns[column_index]
+            if isinstance(column, IntColumn) and not IntColumn.accepts(values):
+                column = self.to_codes(column_index)
+            column.reserve(capacity)
+            column.extend(values, self.length)
+        self.length += count
+
+    def frame(self, categorical: bool=False) -> pd.DataFrame:
+        """Builds a DataFrame straight from the column arrays.
+
+        Args:
+            categorical (bool): Hand out string columns as pd.Categorical 
+                sharing the stored codes. Default is plain object columns, 
+                which behave like a DataFrame built from row lists.
+
+        Returns:
+            pd.DataFrame: Same content as pd.DataFrame(list(self), columns=header).
+        """
+        if self.length == 0:
+            return pd.DataFrame([],columns=self.header)
+        return pd.DataFrame({name: column.array(self.length, categorical)
+            for name, column in zip(self.header, self.columns)}, copy=False)
+
+class RowProxy:
+    """One row of a ColumnTable. Indexing and properties work like on the
+        row lists, the values live in the table."""
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: ColumnTable, index: int):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self.table.header)
+        return self.table.get(self.index, index)
+
+    def __setitem__(self, index: int, value) -> None:
+        if index < 0:
+            index += len(self.table.header)
+        self.table.set(self.index, index, value)
+
+    def __len__(self) -> int:
+        return len(self.table.header)
+
+    def __iter__(self):
+        for column_index in range(len(self.table.header)):
+            yield self.table.get(self.index, column_index)
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+class MatchRow(RowProxy):
+    __slots__ = ()
+    for category in MATCHES_HEADER:
+        exec(f'{category} = property_factory(MATCHES_HEADER.index("{category}"))')
+
+class GameRow(RowProxy):
+    __slots__ = ()
+    for category in GAME_HEADER:
+        exec(f'{category} = property_factory(GAME_HEADER.index("{category}"))')
+
+class PlayRow(RowProxy):
+    __slots__ = ()
     for category in PLAYS_HEADER:
         exec(f'{category} = property_factory(PLAYS_HEADER.index("{category}"))')
 
+ROW_PROXIES = {"Matches": MatchRow, "Games": GameRow, "Plays": PlayRow}
+TABLE_INDEX = {"Matches": 0, "Games": 1, "Plays": 2}
+
+# Joins the actions of a game before compressing, never part of an action.
+ACTION_SEPARATOR = "\x1e"
+
+def pack_actions(game_actions: list[str]) -> bytes:
+    """Compresses the actions of a game, see unpack_actions."""
+    return zlib.compress(ACTION_SEPARATOR.join(game_actions).encode("utf-8"))
+
+def unpack_actions(blob: bytes) -> list[str]:
+    text = zlib.decompress(blob).decode("utf-8")
+    return text.split(ACTION_SEPARATOR) if text else []
+
+class RawGameData(MutableMapping):
+    """Actions of the games without a Game_Winner by "Match_ID-Game_Num".
+        Every game is held zlib compressed in self.blobs and only 
+        decompressed when it is read, eg. to ask for its winner.
+    """
+    def __init__(self, games: Union[dict[str, list[str]], None]=None):
+        self.blobs = {}
+        if games:
+            self.update(games)
+
+    def __getitem__(self, key: str) -> list[str]:
+        return unpack_actions(self.blobs[key])
+
+    def __setitem__(self, key: str, game_actions: list[str]) -> None:
+        self.blobs[key] = pack_actions(game_actions)
+
+    def __delitem__(self, key: str) -> None:
+        del self.blobs[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.blobs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.blobs)
+
+    def __len__(self) -> int:
+        return len(self.blobs)
+
+    def __repr__(self) -> str:
+        return f"RawGameData({len(self.blobs)} games)"
+
+class ParsedFiles(dict):
+    """PARSED_FILE_DICT: GameLog file name -> (Match_ID, last modified).
+        Keeps a reverse index from Match_ID to file names, so the files of
+        removed matches are found without scanning every entry.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.files = {}
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        return (ParsedFiles, (dict(self),))
+
+    def __setitem__(self, file: str, value: tuple) -> None:
+        if file in self:
+            self.unindex(file)
+        super().__setitem__(file, value)
+        self.files.setdefault(value[0], set()).add(file)
+
+    def __delitem__(self, file: str) -> None:
+        self.unindex(file)
+        super().__delitem__(file)
+
+    def unindex(self, file: str) -> None:
+        match_id = self[file][0]
+        files = self.files[match_id]
+        files.discard(file)
+        if not files:
+            del self.files[match_id]
+
+    def pop(self, file: str, *default):
+        if file in self:
+            self.unindex(file)
+        return super().pop(file, *default)
+
+    def popitem(self) -> tuple:
+        file, value = super().popitem()
+        self.files[value[0]].discard(file)
+        if not self.files[value[0]]:
+            del self.files[value[0]]
+        return (file, value)
+
+    def setdefault(self, file: str, default: tuple=None):
+        if file not in self:
+            self[file] = default
+        return self[file]
+
+    def update(self, *args, **kwargs) -> None:
+        for file, value in dict(*args, **kwargs).items():
+            self[file] = value
+
+    def clear(self) -> None:
+        super().clear()
+        self.files.clear()
+
+    def remove_matches(self, match_ids: set[str]) -> list[str]:
+        """Removes the files of the given matches.
+
+        Returns:
+            list[str]: The removed file names.
+        """
+        removed = []
+        for match_id in match_ids:
+            for file in list(self.files.get(match_id, ())):
+                del self[file]
+                removed.append(file)
+        return removed
+
+class DeckIndex:
+    """Sample decklists of one or more months as a sparse card x decklist 
+        matrix, stored by card (CSR) so the decklists containing a card are
+        one slice of self.lists. Sets of played cards are scored against 
+        every list at once, see similarities. 
+        Lists that could not be parsed (None) are left out.
+    """
+    def __init__(self, *months: list[Union[tuple[str, str, set[str]], None]]):
+        self.months = months
+        self.lengths = [len(decks) for decks in months]
+        self.lists = [deck for decks in months for deck in decks if deck is not None]
+        self.sizes = np.array([len(deck[2]) for deck in self.lists], dtype=float)
+        cards = [card for deck in self.lists for card in deck[2]]
+        codes, vocabulary = pd.factorize(pd.Series(cards, dtype=object))
+        self.vocabulary = {card: code for code, card in enumerate(vocabulary)}
+        positions = np.repeat(np.arange(len(self.lists), dtype=np.int32), 
+            self.sizes.astype(int))
+        self.indices = positions[np.argsort(codes, kind="stable")]
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.intp)
+        np.cumsum(np.bincount(codes, minlength=len(self.vocabulary)), out=self.indptr[1:])
+
+    def is_current(self, *months: list) -> bool:
+        """Whether the index was built from these lists of decks as they are now."""
+        return (len(months) == len(self.months)) and all(
+            (decks is indexed) and (len(decks) == length) 
+            for decks, indexed, length in zip(months, self.months, self.lengths))
+
+    def similarities(self, card_sets: list[set[str]]) -> np.ndarray:
+        """Percentage of the cards of every decklist found in each set,
+            the product of the sets (as a sparse matrix) and the decklists.
+            Empty decklists score 0.
+
+        Returns:
+            np.ndarray: Shape (len(card_sets), len(self.lists)).
+        """
+        rows = np.repeat(np.arange(len(card_sets)), [len(cards) for cards in card_sets])
+        vocabulary = self.vocabulary
+        codes = np.array([vocabulary.get(card, -1) for cards in card_sets for card in cards],
+            dtype=np.intp)
+        rows, codes = rows[codes >= 0], codes[codes >= 0]
+        starts = self.indptr[codes]
+        lengths = self.indptr[codes + 1] - starts
+        # positions of every (set, card) -> decklist hit in self.indices
+        ends = np.cumsum(lengths)
+        hits = np.arange(ends[-1] if len(ends) else 0) + np.repeat(starts - ends + lengths, lengths)
+        cells = np.repeat(rows * len(self.lists), lengths) + self.indices[hits]
+        counts = np.bincount(cells, minlength=len(card_sets) * len(self.lists)
+            ).reshape(len(card_sets), len(self.lists))
+        similarities = np.zeros(counts.shape)
+        np.divide(counts, self.sizes, out=similarities, where=self.sizes > 0)
+        return similarities * 100
+
+class DraftIndex:
+    """Drafts of every hero sorted by date and an inverted index of the 
+        cards picked in each draft, to find the drafts a match could have 
+        been played with.
+    """
+    def __init__(self, drafts: list[list], picks: list[list]):
+        """
+        Args:
+            drafts (list[list]): Rows of the Drafts table.
+            picks (list[list]): Rows of the Picks table.
+        """
+        df_drafts = pd.DataFrame(drafts, columns=HEADERS["Drafts"]
+            ).drop_duplicates("Draft_ID")
+        df_picks = pd.DataFrame(picks, columns=HEADERS["Picks"])
+        # Draft_ID -> position in the Drafts table, the order drafts are listed in
+        self.order = {draft_id: position for position, draft_id in 
+            enumerate(df_drafts.Draft_ID)}
+        # Draft_ID -> (hero, date)
+        self.info = dict(zip(df_drafts.Draft_ID, zip(df_drafts.Hero, df_drafts.Date)))
+        # hero -> (dates, Draft_IDs) sorted by date
+        self.heroes = {}
+        for hero, df in df_drafts.sort_values("Date", kind="stable").groupby("Hero", sort=False):
+            self.heroes[hero] = (df.Date.tolist(), df.Draft_ID.tolist())
+        # card -> Draft_IDs of the drafts it was picked in
+        self.drafts = {}
+        for card, draft_ids in df_picks.groupby("Card", sort=False).Draft_ID:
+            self.drafts[card] = set(draft_ids)
+
+    def drafts_before(self, hero: str, date: str) -> list[str]:
+        """Draft_IDs of the drafts of a hero that started before date."""
+        dates, draft_ids = self.heroes.get(hero, ((), ()))
+        return draft_ids[:bisect.bisect_left(dates, date)]
+
+    def acceptable(self, cards_dict: dict[str, set[str]], date: str) -> list[str]:
+        """Drafts a match could have been played with: drafted by one of the 
+            players before the match, with every card that player cast picked.
+
+        Args:
+            cards_dict (dict[str, set[str]]): Player -> cards cast in the match.
+            date (str): Date of the match.
+
+        Returns:
+            list[str]: Draft_IDs in the order of the Drafts table.
+        """
+        acceptable = []
+        for hero, cards in cards_dict.items():
+            if not cards:
+                acceptable.extend(self.drafts_before(hero, date))
+                continue
+            # starting from the rarest card keeps the intersection small
+            postings = sorted((self.drafts.get(card, set()) for card in cards), key=len)
+            picked = postings[0].intersection(*postings[1:])
+            acceptable.extend(draft_id for draft_id in picked 
+                if self.info.get(draft_id, (None,))[0] == hero and self.info[draft_id][1] < date)
+        return sorted(acceptable, key=self.order.get)
+
+class MatchIndex:
+    """Positions of the rows of every match in the Matches, Games and Plays
+        tables of an AllData, and of the matches of every Draft_ID.
+        Plays are added match by match, so they are kept as a slice, 
+        or a list of positions for a match whose plays are not next to each other.
+        Rows appended to the tables are indexed on the next update,
+        anything else (tables replaced or shortened) rebuilds the index.
+    """
+    def __init__(self):
+        self.tables = (None, None, None)
+        self.lengths = (0, 0, 0)
+        self.matches = {}
+        self.games = {}
+        self.plays = {}
+        self.drafts = {}
+
+    def update(self, all_data: "AllData") -> None:
+        tables = tuple(all_data[index] for index in range(3))
+        lengths = tuple(len(table) for table in tables)
+        if lengths == self.lengths and all(
+            new is old for new, old in zip(tables, self.tables)):
+            return
+        if not all(new is old and length >= old_length for new, old, length, old_length
+            in zip(tables, self.tables, lengths, self.lengths)):
+            self.__init__()
+            self.tables = tables
+        starts = self.lengths
+        match_ids = all_data.column("Matches", "Match_ID", starts[0])
+        for position, match_id in enumerate(match_ids.tolist(), starts[0]):
+            self.matches.setdefault(match_id, position)
+        draft_ids = all_data.column("Matches", "Draft_ID", starts[0])
+        for position, draft_id in enumerate(draft_ids.tolist(), starts[0]):
+            self.drafts.setdefault(draft_id, []).append(position)
+        game_ids = all_data.column("Games", "Match_ID", starts[1])
+        for position, match_id in enumerate(game_ids.tolist(), starts[1]):
+            self.games.setdefault(match_id, []).append(position)
+        play_ids = all_data.column("Plays", "Match_ID", starts[2])
+        if len(play_ids):
+            # one run of rows per match, unless its plays were split up
+            run_starts = np.flatnonzero(play_ids[1:] != play_ids[:-1]) + 1
+            run_starts = [0] + run_starts.tolist()
+            run_stops = run_starts[1:] + [len(play_ids)]
+            for start, stop in zip(run_starts, run_stops):
+                self.add_plays(play_ids[start], starts[2] + start, starts[2] + stop)
+        self.lengths = lengths
+
+    def add_plays(self, match_id: str, start: int, stop: int) -> None:
+        rows = self.plays.get(match_id)
+        if rows is None:
+            self.plays[match_id] = slice(start, stop)
+        elif isinstance(rows, slice) and rows.stop == start:
+            self.plays[match_id] = slice(rows.start, stop)
+        else:
+            if isinstance(rows, slice):
+                rows = list(range(rows.start, rows.stop))
+            rows.extend(range(start, stop))
+            self.plays[match_id] = rows
+
 class AllData(list):
-    def __init__(self, *args):
+    def __init__(self, *args, columnar: bool=False):
         if len(args) == 0:
-            super(AllData, self).__init__([[],[],[],{}])
+            super(AllData, self).__init__([[],[],[],RawGameData()])
         else:
             super(AllData, self).__init__(*args)
+        self.columnar = columnar
+        if not isinstance(self[3], RawGameData):
+            self[3] = RawGameData(self[3])
+        self.touch()
+        if columnar:
+            for table, index in TABLE_INDEX.items():
+                self[index] = self[index]
     matches: list[MatchData] = property_factory(0)
     games: list[GameData] = property_factory(1)
     plays: list[PlayData] = property_factory(2)
-    raw_game_data: dict[str, list[str]] = property_factory(3)
+    raw_game_data: RawGameData = property_factory(3)
+
+    def __setitem__(self, index, value) -> None:
+        # Tables replaced by plain lists (e.g. after filtering) stay columnar.
+        if getattr(self, "columnar", False) and (index in (0,1,2)
+            ) and not isinstance(value, ColumnTable):
+            value = ColumnTable(list(TABLE_INDEX)[index], value)
+        elif (index == 3) and not isinstance(value, RawGameData):
+            value = RawGameData(value)
+        super(AllData, self).__setitem__(index, value)
+        self.touch()
+
+    def touch(self) -> None:
+        """Marks the data as changed, dropping cached DataFrames and card sets.
+            Has to be called after rows are added or edited in place."""
+        self.version = getattr(self, "version", 0) + 1
+        self.frames = {}
+        self.card_index = {}
+
+    def column(self, table: Literal["Matches","Games","Plays"], column: str,
+        start: int=0, positions: Union[Sequence[int], None]=None) -> np.ndarray:
+        """Current values of one column as an array, not cached.
+            Rows before start are left out, positions reads only those rows, in order."""
+        rows = self[TABLE_INDEX[table]]
+        column_index = HEADERS[table].index(column)
+        if positions is not None:
+            if isinstance(rows, ColumnTable):
+                return rows.column(column_index, np.asarray(positions, dtype=np.intp))
+            values = np.empty(len(positions), dtype=object)
+            values[:] = [rows[index][column_index] for index in positions]
+            return values
+        if isinstance(rows, ColumnTable):
+            return rows.column(column_index)[start:]
+        values = np.empty(max(len(rows) - start, 0), dtype=object)
+        values[:] = [rows[index][column_index] for index in range(start, len(rows))]
+        return values
+
+    def set_column(self, table: Literal["Matches","Games","Plays"], column: str,
+        values: Sequence) -> None:
+        """Overwrites one column in place. Call touch afterwards."""
+        rows = self[TABLE_INDEX[table]]
+        column_index = HEADERS[table].index(column)
+        if isinstance(rows, ColumnTable):
+            rows.set_column(column_index, values)
+            return
+        for row, value in zip(rows, values):
+            row[column_index] = value
+
+    def match_index(self) -> MatchIndex:
+        """Row positions by Match_ID, see MatchIndex. 
+            Brought up to date with the tables on every call."""
+        if getattr(self, "row_index", None) is None:
+            self.row_index = MatchIndex()
+        self.row_index.update(self)
+        return self.row_index
+
+    def remove_matches(self, match_ids: set[str]) -> tuple[int, int, int]:
+        """Removes every Match, Game, Play and raw game data of the given
+            matches, one pass per table.
+
+        Returns:
+            tuple[int, int, int]: Number of removed Matches, Games and Plays.
+        """
+        match_ids = set(match_ids)
+        counts = []
+        for table, index in TABLE_INDEX.items():
+            rows = self[index]
+            if isinstance(rows, ColumnTable):
+                removed = pd.Series(self.column(table, "Match_ID"), 
+                    dtype=object).isin(match_ids).to_numpy()
+                kept = rows.take(np.flatnonzero(~removed))
+            else:
+                kept = [row for row in rows if row[0] not in match_ids]
+            counts.append(len(rows) - len(kept))
+            if counts[-1]:
+                self[index] = kept
+        for game_key in [game_key for game_key in self.raw_game_data
+            if game_key.rsplit("-", 1)[0] in match_ids]:
+            del self.raw_game_data[game_key]
+        return tuple(counts)
 
     def get_match(self, match_id: str) -> Union[MatchData, None]:
-        return next(x for x in self.matches if x.Match_ID == match_id)
\ No newline at end of file
+        position = self.match_index().matches.get(match_id)
+        if position is None:
+            return None
+        match = self.matches[position]
+        if match[0] != match_id: # Match_ID edited in place
+            self.row_index = None
+            return self.get_match(match_id)
+        return match
+
+    def draft_rows(self, draft_ids: Iterable[str]) -> dict[str, list[int]]:
+        """Positions in the Matches table of the matches of each draft.
+            A Draft_ID edited in place is noticed through the rows of its 
+            old Draft_ID, so the old ids of changed matches have to be included.
+        """
+        draft_ids = list(dict.fromkeys(draft_ids))
+        drafts = self.match_index().drafts
+        positions = [position for draft_id in draft_ids 
+            for position in drafts.get(draft_id, ())]
+        expected = [draft_id for draft_id in draft_ids 
+            for _ in drafts.get(draft_id, ())]
+        if positions and (self.column("Matches", "Draft_ID", positions=positions
+            ) != np.array(expected, dtype=object)).any():
+            self.row_index = None
+            drafts = self.match_index().drafts
+        return {draft_id: drafts.get(draft_id, []) for draft_id in draft_ids}
+
+    def match_games(self, match_id: str) -> list[GameData]:
+        games = self.games
+        match_games = [games[position] for position in 
+            self.match_index().games.get(match_id, ())]
+        if any(game[0] != match_id for game in match_games): # rows replaced in place
+            self.row_index = None
+            return self.match_games(match_id)
+        return match_games
+
+    def get_game(self, match_id: str, game_num: Union[int, str]) -> Union[GameData, None]:
+        """Game game_num of a match, None if it is not in the Games table."""
+        for game in self.match_games(match_id):
+            if str(game.Game_Num) == str(game_num):
+                return game
+        return None
+
+    def play_rows(self, match_id: str) -> Union[slice, list[int]]:
+        """Positions of the plays of a match, 
+            eg. for self.frame("Plays").iloc[rows]."""
+        rows = self.match_index().plays.get(match_id, slice(0, 0))
+        plays = self.plays
+        if isinstance(rows, slice):
+            # one run of rows: its ends are the match's, the rows around are not
+            valid = (rows.start == rows.stop) or ((plays[rows.start][0] == match_id) and 
+                (plays[rows.stop - 1][0] == match_id) and 
+                ((rows.start == 0) or (plays[rows.start - 1][0] != match_id)) and
+                ((rows.stop == len(plays)) or (plays[rows.stop][0] != match_id)))
+        else:
+            valid = all(plays[position][0] == match_id for position in rows)
+        if not valid: # rows replaced or Match_ID edited in place
+            self.row_index = None
+            return self.play_rows(match_id)
+        return rows
+
+    def match_plays(self, match_id: str) -> list[PlayData]:
+        rows = self.play_rows(match_id)
+        if isinstance(rows, slice):
+            return list(self.plays[rows])
+        plays = self.plays
+        return [plays[position] for position in rows]
+
+    def card_sets(self, action: Union[str, None]=None
+        ) -> dict[tuple[str, str], frozenset[str]]:
+        """Primary_Cards played by each player in each match, built with
+            one group-by over the Plays. Cached until the next call to touch.
+
+        Args:
+            action (Union[str, None]): Only plays with this Action, eg. "Casts".
+                None for every play.
+
+        Returns:
+            dict[tuple[str, str], frozenset[str]]: 
+                (Match_ID, Casting_Player) -> cards. Players without plays are left out.
+        """
+        if not hasattr(self, "card_index"):
+            self.touch()
+        if action not in self.card_index:
+            df = pd.DataFrame({column: self.column("Plays", column) for column in 
+                ("Match_ID","Casting_Player","Action","Primary_Card")})
+            if action is not None:
+                df = df[df.Action == action]
+            df = df.drop_duplicates(["Match_ID","Casting_Player","Primary_Card"])
+            groups = {}
+            for key, card in zip(zip(df.Match_ID, df.Casting_Player), df.Primary_Card):
+                groups.setdefault(key, []).append(card)
+            self.card_index[action] = {key: frozenset(cards) for key, cards in groups.items()}
+        return self.card_index[action]
+
+    def frame(self, table: Literal["Matches","Games","Plays"], 
+        categorical: bool=False) -> pd.DataFrame:
+        """DataFrame of one table. Built from the column arrays if columnar.
+            Cached until the next call to touch.
+
+        Args:
+            table (Literal["Matches","Games","Plays"]): Table to convert.
+            categorical (bool): Categorical string columns, columnar data only.
+
+        Returns:
+            pd.DataFrame: Same as pd.DataFrame(rows, columns=HEADERS[table]).
+        """
+        if not hasattr(self, "frames"):
+            self.touch()
+        if (table, categorical) not in self.frames:
+            rows = self[TABLE_INDEX[table]]
+            if isinstance(rows, ColumnTable):
+                df = rows.frame(categorical)
+            else:
+                df = pd.DataFrame(rows,columns=HEADERS[table])
+            self.frames[(table, categorical)] = df
+        # Callers may add columns or sort in place, which must not reach the cache.
+        return self.frames[(table, categorical)].copy(deep=False)
+
+def swapped_header_indices(table: str) -> list[int]:
+    """For every column, the index of the column it is read from when inverted."""
+    header = HEADERS[table]
+    indices = list(range(len(header)))
+    for column1, column2 in SWAPPED_COLUMNS.get(table, []):
+        index1, index2 = header.index(column1), header.index(column2)
+        indices[index1], indices[index2] = index2, index1
+    return indices
+
+class InvertedRows(Sequence):
+    """Read-only view of a Match or Game list that looks like every row
+        inverted (P1 and P2 swapped) followed by every original row.
+        Rows are inverted when they are read, so edits to the underlying
+        list show up immediately.
+    """
+    def __init__(self, all_data: AllData, table: Literal["Matches","Games"]):
+        self.all_data = all_data
+        self.table = table
+        self.row_type = MatchData if table == "Matches" else GameData
+        self.indices = swapped_header_indices(table)
+        self.translated = [HEADERS[table].index(column) 
+            for column in TRANSLATED_COLUMNS[table]]
+
+    @property
+    def rows(self) -> list:
+        return self.all_data[TABLE_INDEX[self.table]]
+
+    def invert(self, row: list) -> Union[MatchData, GameData]:
+        inverted = self.row_type([row[index] for index in self.indices])
+        for index in self.translated:
+            inverted[index] = inverted[index].translate(P1_P2_TRANSLATION)
+        return inverted
+
+    def __len__(self) -> int:
+        return 2 * len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        rows = self.rows
+        if index < 0:
+            index += 2 * len(rows)
+        if not 0 <= index < 2 * len(rows):
+            raise IndexError("InvertedRows index out of range")
+        if index < len(rows):
+            return self.invert(rows[index])
+        return rows[index - len(rows)]
+
+class InvertedData:
+    """Matches and Games of an AllData from both players' perspective,
+        without copying any rows. Replaces the deep copy previously built
+        by modo.invert_join; indexing works like on AllData.
+    """
+    def __init__(self, all_data: AllData):
+        self.all_data = all_data
+        self.matches = InvertedRows(all_data, "Matches")
+        self.games = InvertedRows(all_data, "Games")
+        self.frames = {}
+
+    @property
+    def plays(self) -> list[PlayData]:
+        return self.all_data.plays
+
+    @property
+    def raw_game_data(self) -> RawGameData:
+        return self.all_data.raw_game_data
+
+    def __getitem__(self, index: int):
+        return [self.matches, self.games, self.plays, self.raw_game_data][index]
+
+    def __len__(self) -> int:
+        return 4
+
+    def frame(self, table: Literal["Matches","Games","Plays"], 
+        hero: Union[str, None]=None) -> pd.DataFrame:
+        """Builds a DataFrame of a table with inverted rows followed by
+            original rows, by swapping columns instead of inverting rows.
+
+        Args:
+            table (Literal["Matches","Games","Plays"]): Plays are not inverted.
+            hero (Union[str, None]): Only keep rows where P1 is this player.
+
+        Returns:
+            pd.DataFrame: Same rows and order as pd.DataFrame(self[index]).
+        """
+        header = HEADERS[table]
+        df = self.all_data.frame(table)
+        if table not in SWAPPED_COLUMNS:
+            return df
+        version, cached = self.frames.get(table, (None, None))
+        if version != self.all_data.version:
+            inverted = pd.DataFrame({column: df.iloc[:, index] for column, index
+                in zip(header, swapped_header_indices(table))})
+            for column in TRANSLATED_COLUMNS[table]:
+                inverted[column] = inverted[column].str.translate(P1_P2_TRANSLATION)
+            cached = pd.concat([inverted, df], ignore_index=True)
+            self.frames[table] = (self.all_data.version, cached)
+        df = cached.copy(deep=False)
+        if hero is not None:
+            df = df[(df.P1 == hero)]
+        return df
@@ -0,0 +1,680 @@
+# GameLog Import Module
+import argparse
+import concurrent.futures
+import datetime
+import hashlib
+import io
+import mmap
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+from time import struct_time
+from typing import Iterable, Iterator, Union
+import modo
+import log_parser
+import storage
+from datatypes import AllData
+from MODO_DATA import HEADERS, LOG_ENCODING, MANUAL_MATCH_COLUMNS
+
+# Worker processes used when parsing GameLogs.
+# 1 parses every file in the calling process.
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Folders modified this recently are listed again on the next scan,
+# a file written right after listing could share the folder's mtime.
+FOLDER_MTIME_GRACE_NS = 2 * 10**9
+# MTGO appends to the GameLog of a running match without changing its folder.
+# GameLogs modified this recently are checked even if their folder is unchanged.
+GAMELOG_SETTLE_NS = 24 * 3600 * 10**9
+
+# (size, mtime_ns, content hash)
+Fingerprint = tuple[int, int, str]
+ParsedGameLog = tuple[str, struct_time, Union[tuple, None], Union[str, None], Fingerprint]
+
+def is_gamelog(file: str) -> bool:
+    return ("Match_GameLog_" in file) and (len(file) >= 30)
+
+def is_draftlog(file: str) -> bool:
+    return (file.count(".") == 3) and (file.count("-") == 4) and (".txt" in file)
+
+def find_gamelogs(logs_path: str, parsed_file_dict: dict) -> list[str]:
+    """Walks the GameLogs folder for files that have not been imported yet.
+
+    Args:
+        logs_path (str): Folder containing (subfolders with) GameLog files.
+        parsed_file_dict (dict): Previously imported file names.
+
+    Returns:
+        list[str]: Full paths of GameLog files in os.walk order.
+    """
+    file_paths = []
+    for (root,dirs,files) in os.walk(logs_path):
+        for file in files:
+            if is_gamelog(file) and (file not in parsed_file_dict):
+                file_paths.append(os.path.join(root,file))
+    return file_paths
+
+def map_file(file) -> Union[mmap.mmap, bytes]:
+    """Maps an open file into memory read-only, 
+        falls back to reading it for empty files.
+    """
+    try:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        return file.read()
+
+def content_hash(content: Union[bytes, mmap.mmap]) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+def fingerprint_file(file_path: str) -> Fingerprint:
+    with open(file_path,"rb") as file:
+        content = file.read()
+        stat = os.fstat(file.fileno())
+    return (stat.st_size, stat.st_mtime_ns, content_hash(content))
+
+def is_within(path: str, folder: str) -> bool:
+    return (path == folder) or path.startswith(os.path.join(folder, ""))
+
+def scan_gamelogs(
+    logs_path: str,
+    fingerprints: dict[str, tuple],
+    folder_mtimes: dict[str, int],
+    parsed_file_dict: dict,
+    full: bool=False
+    ) -> list[str]:
+    """Finds GameLog files that are new or changed since the last scan.
+        Only folders whose mtime changed are listed again, plus the files
+        modified in the last day, and only files whose size or mtime changed
+        are returned. Files imported before fingerprints were recorded get 
+        one here without being parsed again.
+
+    Args:
+        logs_path (str): Folder containing (subfolders with) GameLog files.
+        fingerprints (dict[str, tuple]): Full path to 
+            (file name, size, mtime_ns, content hash, Match_ID), 
+            Match_ID is "NA" for files that did not give a match.
+            Updated in place, files that no longer exist are dropped.
+        folder_mtimes (dict[str, int]): Full path of each scanned folder to 
+            its mtime_ns. Updated in place.
+        parsed_file_dict (dict): Previously imported file names.
+        full (bool): List every folder, this also finds files that were
+            rewritten without changing the mtime of their folder.
+
+    Returns:
+        list[str]: Full paths of GameLog files in os.walk order.
+    """
+    root = os.path.abspath(logs_path)
+    now = time.time_ns()
+    recent = now - FOLDER_MTIME_GRACE_NS
+    children = {}
+    for folder in folder_mtimes:
+        children.setdefault(os.path.dirname(folder), []).append(folder)
+    visited, listed, seen = set(), set(), set()
+    file_paths = []
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            continue
+        visited.add(folder)
+        if (not full) and (folder_mtimes.get(folder) == mtime):
+            stack.extend(reversed(children.get(folder, [])))
+            continue
+        listed.add(folder)
+        subfolders = []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subfolders.append(entry.path)
+                elif is_gamelog(entry.name):
+                    seen.add(entry.path)
+                    previous = fingerprints.get(entry.path)
+                    if previous is None:
+                        if entry.name in parsed_file_dict:
+                            fingerprints[entry.path] = (entry.name, 
+                                *fingerprint_file(entry.path), 
+                                parsed_file_dict[entry.name][0])
+                        else:
+                            file_paths.append(entry.path)
+                        continue
+                    stat = entry.stat()
+                    if previous[1:3] != (stat.st_size, stat.st_mtime_ns):
+                        file_paths.append(entry.path)
+        if mtime < recent:
+            folder_mtimes[folder] = mtime
+        else:
+            folder_mtimes.pop(folder, None)
+        stack.extend(reversed(subfolders))
+
+    for folder in list(folder_mtimes):
+        if is_within(folder, root) and (folder not in visited):
+            del folder_mtimes[folder]
+    found = set(file_paths)
+    for file_path, fingerprint in list(fingerprints.items()):
+        folder = os.path.dirname(file_path)
+        if not is_within(folder, root):
+            continue
+        if (folder not in visited) or ((folder in listed) and (file_path not in seen)):
+            del fingerprints[file_path]
+            continue
+        if (folder not in listed) and (fingerprint[2] > now - GAMELOG_SETTLE_NS):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                del fingerprints[file_path]
+                continue
+            if fingerprint[1:3] != (stat.st_size, stat.st_mtime_ns):
+                file_paths.append(file_path)
+                continue
+        # matches removed from the data without ignoring them are imported again
+        if (fingerprint[4] != "NA") and (fingerprint[0] not in parsed_file_dict
+            ) and (file_path not in found):
+            file_paths.append(file_path)
+    return file_paths
+
+def parse_gamelog(file_path: str, known_hash: Union[str, None]=None) -> ParsedGameLog:
+    """Reads and parses a single GameLog file.
+        Module level function so it can be sent to worker processes.
+
+    Args:
+        file_path (str): Full path of the GameLog file.
+        known_hash (Union[str, None]): Content hash from the last import,
+            the file is not parsed again if it is unchanged.
+
+    Returns:
+        ParsedGameLog: (file_path, last modified, parsed data, error, fingerprint)
+            Parsed data is the tuple returned by modo.get_all_data or None
+            if the file was skipped. Error is None unless parsing failed.
+    """
+    with open(file_path,"rb") as gamelog:
+        content = map_file(gamelog)
+        stat = os.fstat(gamelog.fileno())
+    try:
+        fingerprint = (stat.st_size, stat.st_mtime_ns, content_hash(content))
+        mtime = time.localtime(stat.st_mtime)
+        if fingerprint[2] == known_hash:
+            return (file_path, mtime, None, None, fingerprint)
+        # games you spectate are almost impossible to parse
+        if content.find(b'has started watching') != -1:
+            return (file_path, mtime, None, None, fingerprint)
+        try:
+            # decoded record by record, see modo.log_records
+            parsed_data = modo.get_all_data(content, mtime)
+        except ValueError as e: #  catch parsing errors
+            return (file_path, mtime, None, str(e), fingerprint)
+        return (file_path, mtime, parsed_data, None, fingerprint)
+    finally:
+        if isinstance(content, mmap.mmap):
+            content.close()
+
+def parse_gamelogs(file_paths: list[str], workers: int=1,
+    known_hashes: Union[list[Union[str, None]], None]=None
+    ) -> Iterator[ParsedGameLog]:
+    """Parses GameLog files, optionally in a pool of worker processes.
+
+    Args:
+        file_paths (list[str]): Full paths of the GameLog files.
+        workers (int): Number of worker processes.
+            Values below 2 parse serially in the calling process.
+        known_hashes (list[Union[str, None]]): See parse_gamelog, 
+            one per file path.
+
+    Yields:
+        ParsedGameLog: One result per file, always in the order of file_paths.
+    """
+    if known_hashes is None:
+        known_hashes = [None] * len(file_paths)
+    if (workers < 2) or (len(file_paths) < 2):
+        yield from map(parse_gamelog, file_paths, known_hashes)
+        return
+    workers = min(workers, len(file_paths))
+    chunksize = max(1, min(64, len(file_paths) // (workers * 4)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            yield from executor.map(parse_gamelog, file_paths, known_hashes, 
+                chunksize=chunksize)
+        finally:
+            # closed early, eg. by a cancelled import: drop the queued files
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def import_gamelogs(
+    file_paths: list[str],
+    timeout: dict[str, str],
+    parsed_file_dict: dict[str, tuple[str, datetime.datetime]],
+    copy_path: Union[str, None]=None,
+    workers: int=1,
+    fingerprints: Union[dict[str, tuple], None]=None,
+    replaced: Union[dict[str, str], None]=None
+    ) -> tuple[AllData, int]:
+    """Parses GameLog files into a new AllData.
+        Results are merged in file_paths order regardless of the worker count,
+        so the serial and parallel paths produce identical data.
+
+    Args:
+        file_paths (list[str]): Full paths like returned from find_gamelogs
+            or scan_gamelogs.
+        timeout (dict[str, str]): Updated in place with new timeouts.
+        parsed_file_dict (dict): Updated in place with new file names.
+        copy_path (Union[str, None]): Folder to copy imported files to.
+        workers (int): Number of worker processes.
+        fingerprints (Union[dict[str, tuple], None]): Like in scan_gamelogs, 
+            updated in place. If given, previously imported files whose 
+            content changed are parsed again.
+        replaced (Union[dict[str, str], None]): Updated in place with 
+            the new Match_ID of every file parsed again -> its old Match_ID.
+            Pass to merge_gamelogs.
+
+    Returns:
+        tuple[AllData, int]: The newly parsed data and the number of matches.
+    """
+    known_hashes = None
+    if fingerprints is not None:
+        # unchanged files are only parsed again if their match was removed
+        known_hashes = [fingerprints[file_path][3] if (file_path in fingerprints) 
+            and (os.path.basename(file_path) in parsed_file_dict) else None
+            for file_path in file_paths]
+    return collect_gamelogs(parse_gamelogs(file_paths, workers, known_hashes),
+        timeout, parsed_file_dict, copy_path, fingerprints, replaced)
+
+def collect_gamelogs(
+    results: Iterable[ParsedGameLog],
+    timeout: dict[str, str],
+    parsed_file_dict: dict[str, tuple[str, datetime.datetime]],
+    copy_path: Union[str, None]=None,
+    fingerprints: Union[dict[str, tuple], None]=None,
+    replaced: Union[dict[str, str], None]=None
+    ) -> tuple[AllData, int]:
+    """Puts already parsed GameLogs into a new AllData, see import_gamelogs.
+
+    Args:
+        results (Iterable[ParsedGameLog]): Like returned from parse_gamelog.
+        Rest like in import_gamelogs.
+
+    Returns:
+        tuple[AllData, int]: The newly parsed data and the number of matches.
+    """
+    new_data = AllData()
+    match_count = 0
+    if replaced is None:
+        replaced = {}
+    imported = set()
+    for file_path, mtime, parsed_data, error, fingerprint in results:
+        file = os.path.basename(file_path)
+        if fingerprints is not None:
+            previous = fingerprints.get(file_path)
+            if (previous is not None) and (previous[3] == fingerprint[2]) and (
+                file in parsed_file_dict):
+                fingerprints[file_path] = (file, *fingerprint, previous[4])
+                continue
+            fingerprints[file_path] = (file, *fingerprint, 
+                parsed_data[0].Match_ID if parsed_data else "NA")
+        if error is not None:
+            print(f'Encountered {error} in file {file}. Skipping match')
+            continue
+        # spectated game or same file name found earlier in this import
+        if (parsed_data is None) or (file in imported):
+            continue
+        if file in parsed_file_dict:
+            if fingerprints is None:
+                continue
+            # imported before, the content changed since
+            replaced[parsed_data[0].Match_ID] = parsed_file_dict[file][0]
+            timeout.pop(parsed_file_dict[file][0], None)
+        imported.add(file)
+        parsed_file_dict[file] = (parsed_data[0].Match_ID,
+            datetime.datetime.fromtimestamp(time.mktime(mtime)))
+        if copy_path:
+            try:
+                shutil.copy(file_path,copy_path)
+                os.utime(os.path.join(copy_path,file),
+                    (datetime.datetime.now().timestamp(),parsed_file_dict[file][1].timestamp()))
+            except shutil.SameFileError:
+                pass
+        new_data.matches.append(parsed_data[0])
+        new_data.games.extend(parsed_data[1])
+        new_data.plays.extend(parsed_data[2])
+        new_data.raw_game_data.update(parsed_data[3])
+        if parsed_data[4][0]: # if there was a timeout in match
+            timeout[parsed_data[0][0]] = parsed_data[4][1]
+        match_count += 1
+    return (new_data, match_count)
+
+def merge_gamelogs(all_data: AllData, new_data: AllData, replaced: dict[str, str]) -> int:
+    """Adds newly imported GameLog data to all_data.
+        The rows of matches whose GameLog was parsed again are replaced in 
+        one step, keeping the columns that were filled in by hand. 
+        Matches that were removed and ignored stay removed.
+
+    Args:
+        all_data (AllData): Updated in place.
+        new_data (AllData): Like returned from import_gamelogs.
+        replaced (dict[str, str]): Like filled in by import_gamelogs.
+
+    Returns:
+        int: Number of matches added, including replaced ones.
+    """
+    if replaced:
+        old_ids = set(replaced.values())
+        old_matches = {match.Match_ID: list(match) for match in all_data.matches
+            if match.Match_ID in old_ids}
+        ignored = {new_id for new_id, old_id in replaced.items() 
+            if old_id not in old_matches}
+        if ignored:
+            for index in range(3):
+                new_data[index] = [row for row in new_data[index] if row[0] not in ignored]
+        header = HEADERS["Matches"]
+        for match in new_data.matches:
+            old_match = old_matches.get(replaced.get(match.Match_ID))
+            if old_match is None:
+                continue
+            for column in MANUAL_MATCH_COLUMNS:
+                index = header.index(column)
+                if match[index] == "NA":
+                    match[index] = old_match[index]
+        for index in range(3):
+            all_data[index] = [row for row in all_data[index] if row[0] not in old_ids]
+        for game_key in list(all_data.raw_game_data):
+            if game_key.rsplit("-", 1)[0] in old_ids:
+                del all_data.raw_game_data[game_key]
+        for game_key in list(new_data.raw_game_data):
+            if game_key.rsplit("-", 1)[0] in ignored:
+                del new_data.raw_game_data[game_key]
+    for index in range(3):
+        all_data[index].extend(new_data[index])
+    all_data.raw_game_data.update(new_data.raw_game_data)
+    return len(new_data.matches)
+
+def import_draftlogs(
+    drafts_path: str,
+    drafts_table: list[list],
+    picks_table: list[list],
+    parsed_draft_dict: dict[str, str],
+    copy_path: Union[str, None]=None
+    ) -> int:
+    """Parses every new DraftLog file in a folder.
+
+    Args:
+        drafts_path (str): Folder containing (subfolders with) DraftLog files.
+        drafts_table (list[list]): Updated in place with new drafts.
+        picks_table (list[list]): Updated in place with new picks.
+        parsed_draft_dict (dict[str, str]): Updated in place with new file names.
+        copy_path (Union[str, None]): Folder to copy imported files to.
+
+    Returns:
+        int: Number of imported drafts.
+    """
+    draft_count = 0
+    for (root,dirs,files) in os.walk(drafts_path):
+        for file in files:
+            if (not is_draftlog(file)) or (file in parsed_draft_dict):
+                continue
+            file_path = os.path.join(root,file)
+            draft_count += add_draftlog(file_path,parse_draftlog(file_path),
+                drafts_table,picks_table,parsed_draft_dict,copy_path)
+    return draft_count
+
+def parse_draftlog(file_path: str) -> tuple:
+    """Reads and parses a single DraftLog file.
+
+    Returns:
+        tuple: Like returned from log_parser.parse_draft_log.
+    """
+    with io.open(file_path,"r",encoding=LOG_ENCODING) as draftlog:
+        initial = draftlog.read()
+    return log_parser.parse_draft_log(os.path.basename(file_path),initial)
+
+def add_draftlog(
+    file_path: str,
+    parsed_data: tuple,
+    drafts_table: list[list],
+    picks_table: list[list],
+    parsed_draft_dict: dict[str, str],
+    copy_path: Union[str, None]=None
+    ) -> bool:
+    """Adds a parsed DraftLog to the tables, see import_draftlogs.
+
+    Returns:
+        bool: Whether the draft was added, False if the file was imported before.
+    """
+    file = os.path.basename(file_path)
+    if file in parsed_draft_dict:
+        return False
+    drafts_table.extend(parsed_data[0])
+    picks_table.extend(parsed_data[1])
+    parsed_draft_dict[file] = parsed_data[2]
+    if copy_path:
+        try:
+            shutil.copy(file_path,copy_path)
+        except shutil.SameFileError:
+            pass
+    return True
+
+class ImportThread(threading.Thread):
+    """Finds and parses new GameLogs and DraftLogs on a daemon thread.
+        Nothing is added to the session, the results are put on a queue
+        for the caller to merge, so cancelling leaves the session unchanged:
+            ("progress", dict): Counts of "scanned" files to parse and files
+                "parsed", "skipped" and with "errors" so far, "eta" in seconds
+                or None before the first file is parsed.
+            ("done", tuple): (gamelog results, draftlog results, fingerprints,
+                folder_mtimes). Pass the gamelog results to collect_gamelogs 
+                and every (file_path, parsed_data) draftlog result to add_draftlog.
+            ("cancelled", None)
+            ("failed", str): An error that stopped the import.
+    """
+    def __init__(
+        self,
+        logs_path: Union[str, None],
+        drafts_path: Union[str, None],
+        results: queue.Queue,
+        fingerprints: dict[str, tuple],
+        folder_mtimes: dict[str, int],
+        parsed_file_dict: dict,
+        parsed_draft_dict: dict,
+        workers: int=DEFAULT_WORKERS,
+        full_scan: bool=False):
+        """
+        Args:
+            logs_path (Union[str, None]): GameLogs folder, None to skip.
+            drafts_path (Union[str, None]): DraftLogs folder, None to skip.
+            results (queue.Queue): Progress and results are put here.
+            fingerprints, folder_mtimes, parsed_file_dict: See scan_gamelogs.
+                The fingerprints and folder_mtimes are updated by the scan, 
+                pass copies.
+            parsed_draft_dict (dict): Previously imported DraftLog file names.
+            workers (int): Number of worker processes for GameLog parsing.
+            full_scan (bool): See scan_gamelogs.
+        """
+        super().__init__(name="ImportThread", daemon=True)
+        self.logs_path = logs_path
+        self.drafts_path = drafts_path
+        self.results = results
+        self.fingerprints = fingerprints
+        self.folder_mtimes = folder_mtimes
+        self.parsed_file_dict = parsed_file_dict
+        self.parsed_draft_dict = parsed_draft_dict
+        self.workers = workers
+        self.full_scan = full_scan
+        self.cancel_event = threading.Event()
+        self.progress = {"scanned": 0, "parsed": 0, "skipped": 0, "errors": 0, "eta": None}
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    def run(self) -> None:
+        try:
+            result = self.import_logs()
+        except Exception as e:
+            self.results.put(("failed", str(e)))
+            return
+        if result is None:
+            self.results.put(("cancelled", None))
+        else:
+            self.results.put(("done", result))
+
+    def report(self, start: float) -> None:
+        done = self.progress["parsed"] + self.progress["skipped"] + self.progress["errors"]
+        if done:
+            seconds = time.perf_counter() - start
+            self.progress["eta"] = seconds / done * (self.progress["scanned"] - done)
+        self.results.put(("progress", dict(self.progress)))
+
+    def import_logs(self) -> Union[tuple, None]:
+        gamelog_paths = []
+        if self.logs_path:
+            gamelog_paths = scan_gamelogs(self.logs_path, self.fingerprints,
+                self.folder_mtimes, self.parsed_file_dict, self.full_scan)
+        draftlog_paths = []
+        if self.drafts_path:
+            for (root,dirs,files) in os.walk(self.drafts_path):
+                draftlog_paths.extend(os.path.join(root,file) for file in files
+                    if is_draftlog(file) and (file not in self.parsed_draft_dict))
+        self.progress["scanned"] = len(gamelog_paths) + len(draftlog_paths)
+        start = time.perf_counter()
+        self.report(start)
+        if self.cancel_event.is_set():
+            return None
+
+        known_hashes = [self.fingerprints[file_path][3] if (file_path in self.fingerprints)
+            and (os.path.basename(file_path) in self.parsed_file_dict) else None
+            for file_path in gamelog_paths]
+        gamelogs = []
+        last_report = start
+        parsed = parse_gamelogs(gamelog_paths, self.workers, known_hashes)
+        try:
+            for result in parsed:
+                gamelogs.append(result)
+                if result[3] is not None:
+                    self.progress["errors"] += 1
+                elif result[2] is None:
+                    self.progress["skipped"] += 1
+                else:
+                    self.progress["parsed"] += 1
+                if self.cancel_event.is_set():
+                    return None
+                if time.perf_counter() - last_report > 0.1:
+                    last_report = time.perf_counter()
+                    self.report(start)
+        finally:
+            parsed.close()
+
+        draftlogs = []
+        for file_path in draftlog_paths:
+            if self.cancel_event.is_set():
+                return None
+            try:
+                draftlogs.append((file_path, parse_draftlog(file_path)))
+                self.progress["parsed"] += 1
+            except Exception as e:
+                print(f"Encountered {e} in file {os.path.basename(file_path)}. Skipping.")
+                self.progress["errors"] += 1
+            self.report(start)
+        self.report(start)
+        return (gamelogs, draftlogs, self.fingerprints, self.folder_mtimes)
+
+def ingest(
+    logs_path: Union[str, None],
+    drafts_path: Union[str, None],
+    save_path: str,
+    workers: int=DEFAULT_WORKERS,
+    copy: bool=False,
+    full_scan: bool=False
+    ) -> dict[str, float]:
+    """Imports new GameLogs and DraftLogs into a saved session without the GUI.
+
+    Args:
+        logs_path (Union[str, None]): GameLogs folder, None to skip.
+        drafts_path (Union[str, None]): DraftLogs folder, None to skip.
+        save_path (str): The save folder of an MTGO-Tracker installation.
+        workers (int): Number of worker processes for GameLog parsing.
+        copy (bool): Copy imported files to the gamelogs/draftlogs folders
+            next to the save folder, like the GUI does.
+        full_scan (bool): List every GameLogs folder instead of only the ones
+            whose mtime changed since the last import, see scan_gamelogs.
+
+    Returns:
+        dict[str, float]: Counts and timings of the import.
+    """
+    start = time.perf_counter()
+    root = Path(save_path).resolve().parent
+    database = storage.open_database(save_path)
+    session = database.load()
+    stats = {"files": 0, "matches": 0, "replaced": 0, "games": 0, "plays": 0, "drafts": 0}
+
+    if logs_path:
+        copy_path = None
+        if copy:
+            copy_path = root / "gamelogs"
+            os.makedirs(copy_path,exist_ok=True)
+        file_paths = scan_gamelogs(logs_path,session["GAMELOG_FINGERPRINTS"],
+            session["GAMELOG_FOLDERS"],session["PARSED_FILE_DICT"],full_scan)
+        replaced = {}
+        new_data, _ = import_gamelogs(file_paths,session["TIMEOUT"],
+            session["PARSED_FILE_DICT"],copy_path,workers,
+            session["GAMELOG_FINGERPRINTS"],replaced)
+        stats["matches"] = merge_gamelogs(session["ALL_DATA"],new_data,replaced)
+        database.expire_matches(replaced.values())
+        database.mark_changed([match[0] for match in new_data.matches])
+        stats["replaced"] = len(replaced)
+        stats["files"] += len(file_paths)
+        stats["games"] = len(new_data.games)
+        stats["plays"] = len(new_data.plays)
+
+    if drafts_path:
+        copy_path = None
+        if copy:
+            copy_path = root / "draftlogs"
+            os.makedirs(copy_path,exist_ok=True)
+        draft_start = len(session["DRAFTS_TABLE"])
+        stats["drafts"] = import_draftlogs(drafts_path,session["DRAFTS_TABLE"],
+            session["PICKS_TABLE"],session["PARSED_DRAFT_DICT"],copy_path)
+        database.mark_changed(draft_ids=[draft[0] for draft in 
+            session["DRAFTS_TABLE"][draft_start:]])
+        stats["files"] += stats["drafts"]
+
+    # also saves the fingerprints of files that did not give new data
+    database.save(session)
+    database.close()
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+def main(argv: Union[list[str], None]=None) -> int:
+    parser = argparse.ArgumentParser(prog="mtgo_tracker",
+        description="Import MTGO GameLogs and DraftLogs without the GUI.")
+    commands = parser.add_subparsers(dest="command",required=True)
+    ingest_parser = commands.add_parser("ingest",
+        help="import new log files into a saved session")
+    ingest_parser.add_argument("--logs",help="GameLogs folder")
+    ingest_parser.add_argument("--drafts",help="DraftLogs folder")
+    ingest_parser.add_argument("--save",default="save",
+        help="save folder to update (default: ./save)")
+    ingest_parser.add_argument("--workers",type=int,default=DEFAULT_WORKERS,
+        help="worker processes for GameLog parsing, 1 imports serially")
+    ingest_parser.add_argument("--copy",action="store_true",
+        help="copy imported files next to the save folder like the GUI does")
+    ingest_parser.add_argument("--full-scan",action="store_true",
+        help="list every GameLogs folder, not only the ones changed since the last import")
+    args = parser.parse_args(argv)
+
+    if not (args.logs or args.drafts):
+        parser.error("ingest needs --logs and/or --drafts")
+    stats = ingest(args.logs,args.drafts,args.save,args.workers,args.copy,
+        args.full_scan)
+    seconds = max(stats["seconds"], 1e-9)
+    print(f"Imported {stats['matches']} Matches, {stats['games']} Games, "
+        f"{stats['plays']} Plays and {stats['drafts']} Drafts "
+        f"from {stats['files']} files in {stats['seconds']:.2f}s.")
+    if stats["replaced"]:
+        print(f"{stats['replaced']} Matches were replaced by their changed GameLogs.")
+    print(f"{stats['files'] / seconds:.1f} files/s, "
+        f"{stats['matches'] / seconds:.1f} matches/s, "
+        f"{stats['plays'] / seconds:.1f} plays/s")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,33 @@
 # MODO GameLog Cleaning Module
-import copy
 from time import strftime, struct_time
-from typing import Literal, Union
+from typing import Callable, Iterable, Iterator, Literal, Union
+import itertools
+import mmap
 import re
+import numpy as np
+import pandas as pd
 from MODO_DATA import (
     BASIC_LAND_DICT, CARDS_DRAWN_DICT, CONSTRUCTED_FORMATS, CONSTRUCTED_PLAY_TYPES, 
     CUBE_FORMATS, DRAFT_FORMATS, DRAFT_PLAY_TYPES, GAME_HEADER, LIMITED_FORMATS, HEADERS,
-    ADVENTURE_CARDS, COMMON_WORDS, SEALED_FORMATS, SEALED_PLAY_TYPES, SPLIT_CARDS, MULL_DICT,
-    MATCHES_HEADER, PLAYS_HEADER, CARD_PATTERN, DIE_ROLL_PATTERN, P1_P2_TRANSLATION)
-from datatypes import MatchActions, GameData, MatchData, PlayData, AllData
+    ADVENTURE_CARDS, SEALED_FORMATS, SEALED_PLAY_TYPES, SPLIT_CARDS, MULL_DICT,
+    MATCHES_HEADER, PLAYS_HEADER, CARD_PATTERN, DIE_ROLL_PATTERN, P1_P2_TRANSLATION,
+    COMMON_WORDS_PATTERN, CARD_ID_PATTERN, PLAY_KEYWORDS, LOG_ENCODING)
+from datatypes import (MatchActions, GameData, MatchData, PlayData, PlayBuffer, AllData,
+    InvertedData, DeckIndex, NO_TARGETS, action_targets)
+
+# Characters (or bytes) of a game log that are decoded and split at once.
+RECORD_BLOCK_SIZE = 64 * 1024
+# DeckIndex of the sample decklists used for the matches of each month,
+# rebuilt when the lists change.
+DECK_INDEXES: dict[str, DeckIndex] = {}
+# Confidence of each rule of infer_winner in the winner it points to.
+WINNER_RULES = {
+    "next_game_choice": 0.9,  # the loser chooses play or draw in the next game
+    "match_over": 0.75,       # the last game gave one player the second win
+    "lethal_attack": 0.7,     # the active player attacked in the final turn
+    "last_turn": 0.55,        # the active player of the final turn
+    "last_action": 0.55,      # the player who acted last
+}
 
 # To add a column to a database:
 # Add the column to MODO_DATA.HEADERS dict.
@@ -57,66 +76,133 @@ def invert_gamedata(data: GameData):
     data.PD_Selector = data.PD_Selector.translate(P1_P2_TRANSLATION)
     data.Game_Winner = data.Game_Winner.translate(P1_P2_TRANSLATION)
 
-def invert_join(ad: AllData) -> AllData:
+def invert_join(ad: AllData) -> InvertedData:
     """Invert P1 and P2 in all match and game data provided and also keep original data.
 
     Args:
         ad AllData: The original data.
 
     Returns:
-        AllData: Game and Match lists 
+        InvertedData: Game and Match lists 
             will be twice as long because every original entry will be there 
-            in addition to every reversed entry.
+            in addition to every reversed entry. This is a view on ad,
+            later changes to ad show up without calling invert_join again.
     """
-    ad_inverted = AllData(copy.deepcopy(ad))
-    for match in ad_inverted.matches:
-        invert_matchdata(match)
-    for game in ad_inverted.games:
-        invert_gamedata(game)
-    ad_inverted.matches.extend(ad.matches)
-    ad_inverted.games.extend(ad.games)
-    return ad_inverted
+    return InvertedData(ad)
 
 def update_game_wins(
     all_data: AllData,
-    timeout: dict[str, str]) -> None:
+    timeout: dict[str, str],
+    match_ids: Union[Iterable[str], None]=None) -> None:
     """Modifies the list of Matches of the provided all_data in place, 
-        updating match wins.
+        updating match wins. Game wins are counted per Match_ID in one pass,
+        ties are broken by a join against timeout.
 
     Args:
         all_data (AllData): 
             A tuple of match, game, and play data like returned from get_all_data
         timeout (dict[str, str]): Mapping of match_id to the player name that timed out.
+        match_ids (Union[Iterable[str], None]): Only update these matches, 
+            eg. the ones with edited games. None for every match.
     """
+    if match_ids is None:
+        rows = game_rows = None
+        match_ids = all_data.column("Matches", "Match_ID")
+        unique_ids, match_codes = np.unique(match_ids.astype(str), return_inverse=True)
+        game_codes = pd.Index(unique_ids).get_indexer(
+            all_data.column("Games", "Match_ID").astype(str))
+    else:
+        # only the indexed rows are read, a match's games are found by position
+        index = all_data.match_index()
+        match_ids = [match_id for match_id in dict.fromkeys(match_ids) 
+            if match_id in index.matches]
+        rows = [index.matches[match_id] for match_id in match_ids]
+        games = [index.games.get(match_id, ()) for match_id in match_ids]
+        game_rows = [position for positions in games for position in positions]
+        unique_ids = match_codes = np.arange(len(match_ids))
+        game_codes = np.repeat(match_codes, [len(positions) for positions in games])
+        match_ids = np.array(match_ids, dtype=object)
+    if not len(match_ids):
+        return
+    winners = all_data.column("Games", "Game_Winner", positions=game_rows)
+    counted = game_codes >= 0
+    p1_wins = np.bincount(game_codes[counted & (winners == "P1")], 
+        minlength=len(unique_ids))[match_codes]
+    p2_wins = np.bincount(game_codes[counted & (winners == "P2")], 
+        minlength=len(unique_ids))[match_codes]
+
+    timed_out = pd.Series(match_ids, dtype=object).map(timeout).to_numpy(dtype=object)
+    tied = p1_wins == p2_wins
+    match_winner = np.full(len(match_ids), "NA", dtype=object)
+    match_winner[tied & (timed_out == all_data.column("Matches", "P2", positions=rows))] = "P1"
+    match_winner[tied & (timed_out == all_data.column("Matches", "P1", positions=rows))] = "P2"
+    match_winner[p1_wins > p2_wins] = "P1"
+    match_winner[p2_wins > p1_wins] = "P2"
+
+    if rows is None:
+        all_data.set_column("Matches", "P1_Wins", p1_wins.tolist())
+        all_data.set_column("Matches", "P2_Wins", p2_wins.tolist())
+        all_data.set_column("Matches", "Match_Winner", match_winner.tolist())
+        return
+    columns = [HEADERS["Matches"].index(column) for column in 
+        ("P1_Wins","P2_Wins","Match_Winner")]
+    for position, values in zip(rows, 
+        zip(p1_wins.tolist(), p2_wins.tolist(), match_winner.tolist())):
+        match = all_data.matches[position]
+        for column, value in zip(columns, values):
+            match[column] = value
+
+def update_draft_wins(
+    all_data: AllData,
+    drafts: list[list],
+    draft_ids: Union[Iterable[str], None]=None) -> None:
+    """Modifies the Drafts table in place, updating Match_Wins and Match_Losses
+        of the hero of each draft. Matches are counted per (Draft_ID, player)
+        in one group-by, with the hero as either player.
 
-    for match in all_data.matches: # Iterate through Matches.
-        match.P1_Wins = 0
-        match.P2_Wins = 0
-        match.Match_Winner = "NA"
-        for winner in [game.Game_Winner for game in all_data[1] 
-                    if match.Match_ID == game.Match_ID]:
-            if winner == "P1":
-                match.P1_Wins += 1
-            elif winner == "P2":
-                match.P2_Wins += 1
-            elif winner == "NA":
-                pass
-        if match.P1_Wins > match.P2_Wins:
-            match.Match_Winner = "P1"
-        elif match.P2_Wins > match.P1_Wins:
-            match.Match_Winner = "P2"
-        else:
-            if match.Match_ID in timeout:
-                if match.P1 == timeout[match.Match_ID]:
-                    match.Match_Winner = "P2"
-                elif match.P2 == timeout[match.Match_ID]:
-                    match.Match_Winner = "P1"
-
-def players(game_log: Union[str, list[str]]) -> list[str]:
+    Args:
+        all_data (AllData): Matches are read from here.
+        drafts (list[list]): Rows of the Drafts table.
+        draft_ids (Union[Iterable[str], None]): Only update these drafts, 
+            eg. the old and new Draft_IDs of matches that changed. 
+            None for every draft.
+    """
+    if draft_ids is None:
+        rows = None
+        draft_column = all_data.column("Matches", "Draft_ID")
+    else:
+        # only the matches of the drafts in the table are read
+        draft_ids = set(draft_ids)
+        draft_rows = all_data.draft_rows(draft_ids)
+        counted = list(dict.fromkeys(draft[0] for draft in drafts if draft[0] in draft_rows))
+        rows = [position for draft_id in counted for position in draft_rows[draft_id]]
+        draft_column = np.array([draft_id for draft_id in counted 
+            for _ in draft_rows[draft_id]], dtype=object)
+    winners = all_data.column("Matches", "Match_Winner", positions=rows)
+    # each match counts for P1 as is and for P2 with the result flipped
+    df = pd.DataFrame({
+        "Draft_ID": np.concatenate([draft_column] * 2),
+        "Player": np.concatenate([all_data.column("Matches", "P1", positions=rows), 
+            all_data.column("Matches", "P2", positions=rows)]),
+        "Won": np.concatenate([winners == "P1", winners == "P2"]),
+        "Lost": np.concatenate([winners == "P2", winners == "P1"])})
+    totals = df.groupby(["Draft_ID","Player"], sort=False)[["Won","Lost"]].sum()
+    totals = dict(zip(totals.index, zip(totals.Won.tolist(), totals.Lost.tolist())))
+
+    hero_index = HEADERS["Drafts"].index("Hero")
+    wins_index = HEADERS["Drafts"].index("Match_Wins")
+    losses_index = HEADERS["Drafts"].index("Match_Losses")
+    for draft in drafts:
+        if (draft_ids is None) or (draft[0] in draft_ids):
+            draft[wins_index], draft[losses_index] = totals.get(
+                (draft[0], draft[hero_index]), (0, 0))
+
+def players(game_log: Union[str, list[str], bytes, mmap.mmap]) -> list[str]:
     """Parses a gamelog for player names.
 
     Args:
-        init (Union[str, list[str]]): The pure game log.
+        init (Union[str, list[str], bytes, mmap.mmap]): The pure game log,
+            undecoded if given as bytes.
 
     Returns:
         list[str]: all player names
@@ -128,12 +214,18 @@ def players(game_log: Union[str, list[str]]) -> list[str]:
     elif isinstance(game_log, list):
         game_log = '\n'.join(game_log)
         player_name_re = re.compile(r'^(.*?) joined the game', re.MULTILINE)
+    elif isinstance(game_log, (bytes, mmap.mmap)):
+        # \r is a newline once decoded
+        player_name_re = re.compile(rb'@P@P([^\r\n]+?) joined the game\.')
     else:
         raise TypeError(f"Expected log as list of strings or string,"
                         f"got {type(game_log)}")
     # remove duplicates 
-    players = list(set(player_name_re.findall(game_log)))
-    players.sort(key=len, reverse=True) # not sure why sorting
+    players = list(set(name if isinstance(name, str) else decode_log(name)
+        for name in player_name_re.findall(game_log)))
+    # longest first, names that contain a shorter name are altered before it;
+    # ties by name so the order (and the Match_ID) does not depend on the set
+    players.sort(key=lambda name: (-len(name), name))
     return players
 
 def alter(player_name: str, original: bool=False) -> str:
@@ -156,12 +248,9 @@ def alter(player_name: str, original: bool=False) -> str:
         player = player_name.replace(" ","+")
         return player.replace(".","*")
 
-def closest_list(
-    cards_played: set[str],
-    ad: dict[str, tuple[str, str, set[str]]],
-    yyyy_mm: str) -> tuple[str, str]:
-    
-    decks = []
+def deck_index(ad: dict[str, list], yyyy_mm: str) -> DeckIndex:
+    """Cached DeckIndex of the sample decklists of a month and the month 
+        before, in that order."""
     yyyy = yyyy_mm[0:4]
     mm = yyyy_mm[5:7]
     if mm == "01":
@@ -171,31 +260,76 @@ def closest_list(
         mm = str(int(mm) - 1).zfill(2)
     yyyy_mm_prev = yyyy + "-" + mm
 
-    if yyyy_mm in ad:
-        decks = ad.get(yyyy_mm).copy()
-    if yyyy_mm_prev in ad:
-        decks.extend(ad.get(yyyy_mm_prev).copy())
-    if decks == []:
-        return ["Unknown","NA"]
-
-    similarity_list = []
-    for i in decks:
-        if i == None:
-            print("error: Null List")
-            continue
+    months = [ad[month] for month in (yyyy_mm, yyyy_mm_prev) if month in ad]
+    index = DECK_INDEXES.get(yyyy_mm)
+    if (index is None) or not index.is_current(*months):
+        index = DECK_INDEXES[yyyy_mm] = DeckIndex(*months)
+    return index
 
-        if len(i[2]) == 0:
-            similarity = 0
-        else:
-            similarity = len(cards_played.intersection(i[2]))/len(i[2])
-        similarity = round((similarity * 100),3)
-        similarity_list.append(similarity)
+def closest_list(
+    cards_played: set[str],
+    ad: dict[str, list[tuple[str, str, set[str]]]],
+    yyyy_mm: str) -> tuple[str, str]:
+    """Finds the sample decklist of this or the previous month that
+        contains the largest share of the played cards.
+
+    Args:
+        cards_played (set[str]): Cards played by one player in a match.
+        ad (dict[str, list[tuple[str, str, set[str]]]]): 
+            Sample decklists by "yyyy-mm", see parse_list.
+        yyyy_mm (str): Month of the match.
+
+    Returns:
+        tuple[str, str]: (deck name, format) of the closest list,
+            ["Unknown","NA"] if no list has more than 20% of its cards played.
+            Ties go to the first list, lists of this month come first.
+    """
+    return closest_lists([(cards_played, yyyy_mm)], ad)[0]
+
+def closest_lists(
+    card_sets: list[tuple[set[str], str]],
+    ad: dict[str, list[tuple[str, str, set[str]]]],
+    batch_cells: int=2**22) -> list[tuple[str, str]]:
+    """closest_list for many sets of played cards at once. 
+        The sets of each month are scored together against its decklists.
+
+    Args:
+        card_sets (list[tuple[set[str], str]]): (cards played, "yyyy-mm") pairs.
+        ad (dict[str, list[tuple[str, str, set[str]]]]): See closest_list.
+        batch_cells (int): Most scores held in memory at once.
+
+    Returns:
+        list[tuple[str, str]]: closest_list of every pair, in order.
+    """
+    results = [["Unknown","NA"]] * len(card_sets)
+    months = {}
+    for position, (cards, yyyy_mm) in enumerate(card_sets):
+        months.setdefault(yyyy_mm, []).append(position)
+    for yyyy_mm, positions in months.items():
+        index = deck_index(ad, yyyy_mm)
+        decks = index.lists
+        if decks == []:
+            continue
+        batch = max(1, batch_cells // len(decks))
+        for first in range(0, len(positions), batch):
+            batch_positions = positions[first:first + batch]
+            batch_sets = [card_sets[position][0] for position in batch_positions]
+            similarity_list = index.similarities(batch_sets)
+            best = similarity_list.max(axis=1)
+            # Scores are compared rounded to 3 decimals, 
+            # so near ties go to the first list.
+            near = similarity_list >= (best - 0.001)[:, None]
+            for row, position in enumerate(batch_positions):
+                if best[row] <= 20:
+                    continue
+                candidates = np.flatnonzero(near[row])
+                rounded = [round(float(similarity_list[row, column]), 3) 
+                    for column in candidates]
+                if max(rounded) > 20:
+                    deck = decks[candidates[rounded.index(max(rounded))]]
+                    results[position] = [deck[0],deck[1]]
+    return results
 
-    index = similarity_list.index(max(similarity_list))
-    if max(similarity_list) > 20:
-        return [decks[index][0],decks[index][1]]
-    else:
-        return ["Unknown","NA"]
 def get_limited_subarch(cards_played: set[str]) -> Union[str, Literal["NA"]]:
     """Names the sub-archetype after the basic lands played.
 
@@ -279,10 +413,9 @@ def remove_text_artifacts(game_action: str) -> str:
             0.1% of the time there might remain a second '.' at the end.
     """
     # failsafe not to delete good data
-    for word in COMMON_WORDS:
-        if word in game_action[-10:]:
-            raise ValueError('Expected string with text artifacts, got '
-                f'"{game_action}"')
+    if COMMON_WORDS_PATTERN.search(game_action[-10:]):
+        raise ValueError('Expected string with text artifacts, got '
+            f'"{game_action}"')
     # artifacts are at least 10 characters long
     game_action = game_action[:-10]
     # sometimes they're longer, try to catch
@@ -290,26 +423,38 @@ def remove_text_artifacts(game_action: str) -> str:
         game_action = game_action.rsplit('.', 1)[0]
     return game_action
 
-def get_match_id(game_log: str) -> str:
+def get_match_id(game_log: Union[str, bytes, mmap.mmap],
+    players_list: Union[list[str], None]=None) -> str:
     """Creates the match ID at the start of the game log.
         Match ids are started with $ and are 36 characters long.
 
     Args:
-        game_log (str): String containing a match id as present in game logs.
+        game_log (Union[str, bytes, mmap.mmap]): String containing a match id 
+            as present in game logs, undecoded if given as bytes.
+        players_list (Union[list[str], None]): Like returned from players,
+            found in game_log if not given.
 
     Returns:
         str: The match id without the $ sign, but with both player names added
             e.g. 36characterstring_Jackomatrus_Toffel
     """
-    match_id_re = re.compile(r'\$([0-9a-zA-Z-]{36}).{1,2}\$\1')
-    try:
-        pure_id = match_id_re.findall(game_log)[0]
-        player1, player2 = players(game_log)[0:2]
-        return f'{pure_id}_{player1}_{player2}'
-    except IndexError:
+    if isinstance(game_log, str):
+        match_id_re = re.compile(r'\$([0-9a-zA-Z-]{36}).{1,2}\$\1')
+    else:
+        match_id_re = re.compile(rb'\$([0-9a-zA-Z-]{36})[^\r\n]{1,2}\$\1')
+    # the first match id, the log is not searched any further
+    match_id_match = match_id_re.search(game_log)
+    if match_id_match is None:
         raise ValueError(
             f'No match id in passed game log: {game_log}'
         )
+    pure_id = match_id_match[1]
+    if isinstance(pure_id, bytes):
+        pure_id = pure_id.decode("ascii")
+    if players_list is None:
+        players_list = players(game_log)
+    player1, player2 = players_list[0:2]
+    return f'{pure_id}_{player1}_{player2}'
 
 def new_turn_regex(players: list[str]) -> re.Pattern:
     """Creates a regular expression that matches anything that looks like
@@ -325,54 +470,154 @@ def new_turn_regex(players: list[str]) -> re.Pattern:
     player_group_string = f"({'|'.join(escaped_and_altered)})"
     return re.compile(r'Turn (\d+): ' + player_group_string)
 
-def all_actions(game_log: str) -> MatchActions:
-    # Input:  String
+def player_alterer(players_list: list[str]) -> Callable[[str], str]:
+    """Creates a function that replaces every player name in a string
+        with its altered version (see alter) in a single pass.
+
+    Args:
+        players_list (list[str]): Player names like returned from players.
+
+    Returns:
+        Callable[[str], str]: Takes and returns (a part of) the game log.
+    """
+    altered = {player: alter(player) for player in players_list 
+        if alter(player) != player}
+    if not altered:
+        return lambda game_log: game_log
+    # players_list is sorted longest first, so longer names win
+    player_pattern = re.compile('|'.join(re.escape(player) for player in altered))
+    return lambda game_log: player_pattern.sub(lambda match: altered[match[0]], game_log)
+
+def alter_players(game_log: str, players_list: list[str]) -> str:
+    """Replaces every player name in the log with its altered version 
+        (see alter) in a single pass.
+
+    Args:
+        game_log (str): The pure game log.
+        players_list (list[str]): Player names like returned from players.
+
+    Returns:
+        str: The game log with altered player names.
+    """
+    return player_alterer(players_list)(game_log)
+
+def decode_log(content: bytes) -> str:
+    """Decodes a part of a GameLog like reading the file in text mode,
+        bytes that are not valid in LOG_ENCODING are replaced.
+    """
+    text = content.decode(LOG_ENCODING, errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def log_records(
+    game_log: Union[str, bytes, mmap.mmap], 
+    transform: Union[Callable[[str], str], None]=None
+    ) -> Iterator[str]:
+    """Splits a game log at "@P" without building a list or a decoded copy 
+        of the whole log. The log is read in blocks of at least 
+        RECORD_BLOCK_SIZE that end at a record boundary.
+
+    Args:
+        game_log (Union[str, bytes, mmap.mmap]): The pure game log,
+            bytes (eg. a memory mapped GameLog file) are decoded 
+            block by block with decode_log.
+        transform (Union[Callable[[str], str], None]): Applied to every block
+            before it is split, eg. from player_alterer. Must keep "@P" intact.
+
+    Yields:
+        str: The records in order, like game_log.split("@P").
+    """
+    separator = "@P" if isinstance(game_log, str) else b"@P"
+    start = 0
+    while True:
+        # end the block at the next record boundary
+        end = game_log.find(separator, start + RECORD_BLOCK_SIZE)
+        block = game_log[start:] if end == -1 else game_log[start:end]
+        if not isinstance(block, str):
+            block = decode_log(block)
+        if transform is not None:
+            block = transform(block)
+        yield from block.split("@P")
+        if end == -1:
+            return
+        start = end + len(separator)
+
+def tokenize_actions(records: Iterable[str], turn_header: re.Pattern
+    ) -> Iterator[tuple[Literal["turn","join","disconnect","action"], str, str]]:
+    """Classifies the records of a game log with altered player names.
+        Actions that are not needed (extra draws, sideboarding, 
+        game state changes) are skipped.
+
+    Args:
+        records (Iterable[str]): Like returned from log_records, 
+            with player names altered.
+        turn_header (re.Pattern): Like returned from new_turn_regex.
+
+    Yields:
+        tuple[str, str, str]: (kind, first word of the action, action)
+            For "turn" the action is just 'Turn X: NAME', for "action" 
+            card ids are removed from card names.
+    """
+    records = iter(records)
+    first = next(records, "")
+    record = next(records, None)
+    for next_record in itertools.chain(records, (None,)):
+        # skip first entry (unless it's the only one), final entry doesn't have artifacts
+        if record is None:
+            game_action = first
+        elif next_record is not None:
+            game_action = remove_text_artifacts(record)
+        else:
+            game_action = record
+        record = next_record
+        if not game_action:
+            continue
+        first_word = game_action.split(None, 1)[0]
+        if "Turn " in game_action:
+            turn_header_match = turn_header.search(game_action)
+            if turn_header_match:
+                # entire match 'Turn X: NAME'
+                yield ("turn", first_word, turn_header_match[0])
+                continue
+        if " has lost connection to the game" in game_action:
+            yield ("disconnect", first_word, game_action)
+        elif " joined the game." in game_action:
+            yield ("join", first_word, game_action)
+        # Skip looking at extra cards and sideboarding.
+        elif (" draws their next card." in game_action) or (
+            " has left the game." in game_action):
+            continue
+        elif ("@[" in game_action) and ("@]" in game_action) and (
+            ('.' in game_action) or ("is being attacked" in game_action)):
+            if "@:" in game_action:
+                # change every @[Cardname@:NUMBERS,NUMBERS:@] to @[Cardname@]
+                game_action = CARD_ID_PATTERN.sub('', game_action)
+            yield ("action", first_word, game_action)
+        # Skip game state changes.
+        elif "." in game_action:
+            yield ("action", first_word, game_action)
+
+def all_actions(game_log: Union[str, bytes, mmap.mmap]) -> MatchActions:
+    # Input:  String, or undecoded bytes of a GameLog file
     # Output: List[Strings]
-    match_actions = MatchActions([get_match_id(game_log)])
     players_list = players(game_log)
+    match_actions = MatchActions([get_match_id(game_log, players_list)])
     turn_header = new_turn_regex(players_list)
-    lost_conn = {player: False for player in players_list}
-    for player in players_list:
-        game_log = game_log.replace(player,alter(player))
-    split_log = game_log.split("@P")
-    game_log_list = [
-        # skip first entry, final entry doesn't have artifacts
-        remove_text_artifacts(game_action) for game_action in split_log[1:-1]]
-    game_log_list.append(split_log[-1])
-    for game_action in game_log_list:
-        if not game_action:
-            continue
-        first_word = game_action.split()[0]
-        turn_header_match = turn_header.search(game_action)
-        if turn_header_match:
-            # appends entire match 'Turn X: NAME'
-            match_actions.append(turn_header_match[0])
-        elif " has lost connection to the game" in game_action:
+    # actions start with the altered player names
+    lost_conn = {alter(player): False for player in players_list}
+    records = log_records(game_log, player_alterer(players_list))
+    for kind, first_word, game_action in tokenize_actions(records, turn_header):
+        if kind == "disconnect":
             lost_conn[first_word] = True
-        elif " joined the game." in game_action:
+        elif kind == "join":
             if lost_conn[first_word]:
                 # don't append reconnects
                 lost_conn[first_word] = False
             else:
                 # append regular joins
                 match_actions.append(game_action)
-        # Skip any of these
-        elif any(action in game_action for action in [
-            " draws their next card.", # looking at extra cards
-            " has left the game." ]): # sideboarding
-            continue
-        # Skip game state changes.
-        elif ('.' not in game_action) and ("is being attacked" not in game_action):
-            continue
-        elif ("@[" in game_action) and ("@]" in game_action):
-            # change every @[Cardname@:NUMBERS,NUMBERS:@] to @[Cardname@]
-            newstring = re.sub(
-                r"(@\[.+?)(@:\d+?,\d+?:)(@\])", 
-                r'\g<1>\g<3>', # remove group 2
-                game_action)
-            match_actions.append(newstring)
-        # Everything else
-        elif "." in game_action:
+        else:
             match_actions.append(game_action)
     return match_actions
 
@@ -459,6 +704,100 @@ def get_winner(curr_game_list: list[str], p1: str, p2: str
         return "NA"
 
 
+def infer_winner(
+    game_actions: list[str],
+    p1: str,
+    p2: str,
+    next_selector: Union[str, None]=None,
+    prior_wins: Union[tuple[int, int], None]=None
+    ) -> tuple[Union[Literal["NA"], Literal["P1"], Literal["P2"]], float]:
+    """Infers the winner of a game that get_winner could not decide from
+        the rules in WINNER_RULES. The confidence of all rules pointing to 
+        the same player is combined as 1 - product(1 - confidence), rules 
+        pointing to the other player lower it. Winners found by get_winner
+        have confidence 1.
+
+    Args:
+        game_actions (list[str]): Game actions like in raw_game_data.
+        p1 (str): P1 as written in the game actions (see alter).
+        p2 (str): P2 as written in the game actions.
+        next_selector (Union[str, None]): PD_Selector of the next game of
+            the match, None if this is the last game.
+        prior_wins (Union[tuple[int, int], None]): (P1, P2) wins of the 
+            earlier games if this is the last game and all of them have a
+            Game_Winner, None otherwise.
+
+    Returns:
+        tuple[str, float]: ("P1", "P2" or "NA", confidence between 0 and 1)
+    """
+    player_dict = {p1:'P1', p2:'P2'}
+    other = {"P1":"P2", "P2":"P1"}
+    logged_winner = get_winner(game_actions, p1, p2) if game_actions else "NA"
+    if logged_winner != "NA":
+        return (logged_winner, 1.0)
+    votes = []
+    if next_selector in other:
+        votes.append((other[next_selector], "next_game_choice"))
+    if prior_wins in ((1, 0), (0, 1)):
+        votes.append(("P1" if prior_wins[0] else "P2", "match_over"))
+
+    # actions of the final turn
+    active = None
+    final_turn = []
+    for action in game_actions:
+        words = action.split()
+        if (len(words) == 3) and (words[0] == "Turn") and words[1].endswith(":"):
+            active = player_dict.get(words[2])
+            final_turn = []
+        else:
+            final_turn.append(words)
+    if active:
+        votes.append((active, "last_turn"))
+        if any((player_dict.get(words[0]) == other[active]) and 
+            (" ".join(words[1:5]) == "is being attacked by") for words in final_turn if words):
+            votes.append((active, "lethal_attack"))
+    for words in reversed(final_turn):
+        if words and (words[0] in player_dict):
+            # the attacked player does not act
+            player = player_dict[words[0]]
+            if " ".join(words[1:5]) == "is being attacked by":
+                player = other[player]
+            votes.append((player, "last_action"))
+            break
+
+    doubt = {"P1": 1.0, "P2": 1.0}
+    for player, rule in votes:
+        doubt[player] *= 1 - WINNER_RULES[rule]
+    if doubt["P1"] == doubt["P2"]:
+        return ("NA", 0.0)
+    winner = "P1" if doubt["P1"] < doubt["P2"] else "P2"
+    return (winner, round((1 - doubt[winner]) * doubt[other[winner]], 3))
+
+def infer_winners(all_data: AllData) -> dict[str, tuple[str, float]]:
+    """infer_winner for every game in all_data.raw_game_data.
+
+    Returns:
+        dict[str, tuple[str, float]]: Keys of raw_game_data -> (winner, confidence)
+            Games that are not in the Games table are left out.
+    """
+    inferred = {}
+    for key, game_actions in all_data.raw_game_data.items():
+        match_id, game_num = key.rsplit("-",1)
+        games = {int(game.Game_Num): game for game in all_data.match_games(match_id)
+            if str(game.Game_Num).isdigit()}
+        if (not game_num.isdigit()) or (int(game_num) not in games):
+            continue
+        game_num = int(game_num)
+        game = games[game_num]
+        next_game = games.get(game_num + 1)
+        prior = [games[num].Game_Winner for num in games if num < game_num]
+        prior_wins = None
+        if (max(games) == game_num) and ("NA" not in prior):
+            prior_wins = (prior.count("P1"), prior.count("P2"))
+        inferred[key] = infer_winner(game_actions, alter(game.P1), alter(game.P2),
+            next_game.PD_Selector if next_game is not None else None, prior_wins)
+    return inferred
+
 def game_data(
     match_actions: MatchActions
     ) -> tuple[
@@ -550,99 +889,108 @@ def is_play(play: str) -> bool:
             return True
     return False
 
-def play_data(game_actions: MatchActions) -> list[PlayData]:
-    """Parses a list of actions into a list of machine readable plays.
+def play_data(
+    game_actions: MatchActions, 
+    plays: Union[PlayBuffer, None]=None) -> PlayBuffer:
+    """Parses a list of actions into machine readable plays.
+        Each action is classified by its second word first, the key phrases
+        are only searched for actions that are not a land drop, cast or draw.
 
     Args:
         game_actions (list[str]): A list of game actions like from all_actions
+        plays (PlayBuffer): Buffer to add the plays to, 
+            e.g. to collect plays of several matches. Defaults to a new one.
 
     Returns:
-        list[list[str, int]]: A list of lists.
-            Each inner list represents a play of structure
+        PlayBuffer: The plays, iterating gives PlayData rows of structure
             [match_id, game_num, play_num, turn_num, casting_player, 
             action_type, primary_card, target_1, target_2, target_3, 
             opp_target, self_target, cards_drawn, attackers, active_player,
             non_active_player]
             opp_target, self_target are ints. Rest should be obvious.
     """
-    
-    all_plays = []
+    if plays is None:
+        plays = PlayBuffer()
+    match_id = game_actions.match_id
     p1, p2 = game_actions.players[0:2]
     turn_regex = new_turn_regex([p1,p2])
     game_num = turn_num = play_num = 0
     active_player = nonactive_player = ''
+    # original player names
+    names = {}
 
     for current_action in game_actions:
         current_action: str
-        play = PlayData()
-        play.Match_ID = game_actions.match_id
-        play.Casting_Player = play.Action = ""
-        play.Primary_Card = play.Target1 = play.Target2 = play.Target3 = "NA"
-        play.Opp_Target = play.Self_Target = play.Cards_Drawn = play.Attackers = 0
-        new_turn_match = turn_regex.search(current_action)
-        curr_word_list = current_action.split()
-        cards_in_action = CARD_PATTERN.findall(current_action)
         if "chooses to " in current_action and ' play first' in current_action:
             game_num += 1
             play_num = 0
-        elif new_turn_match:
-            turn_num = int(new_turn_match[1])
-            active_player = new_turn_match[2]
-            nonactive_player = p2 if active_player == p1 else p1
-        elif is_play(current_action) and curr_word_list[1] != "chooses":
-            all_plays.append(play)
-            play_num += 1
-            play.Active_Player = alter(active_player, original=True)
-            play.Nonactive_Player = alter(nonactive_player, original=True)
-            play.Casting_Player = alter(curr_word_list[0], original=True)
-            play.Play_Num = play_num
-            play.Game_Num = game_num
-            play.Turn_Num = turn_num
-            if curr_word_list[1] == "plays":
-                play.Primary_Card = cards_in_action[0] if cards_in_action else 'NA'
-                play.Action = "Land Drop"
-            elif curr_word_list[1] == "casts":
-                play.Primary_Card = cards_in_action[0] if cards_in_action else 'NA'
-                play.Action = 'Casts'
-                if "targeting" in current_action:
-                    play.parse_targets(current_action)
-            elif curr_word_list[1] == "draws":
-                play.Action = 'Draws'
-                play.Cards_Drawn = CARDS_DRAWN_DICT.get(curr_word_list[2], 8)
+            continue
+        if "Turn " in current_action:
+            new_turn_match = turn_regex.search(current_action)
+            if new_turn_match:
+                turn_num = int(new_turn_match[1])
+                active_player = new_turn_match[2]
+                nonactive_player = p2 if active_player == p1 else p1
+                continue
+        curr_word_list = current_action.split(None, 3)
+        if len(curr_word_list) < 2:
+            continue
+        action = PLAY_KEYWORDS.get(curr_word_list[1])
+        if action is None:
+            if curr_word_list[1] == "chooses":
+                continue
             elif "activates an ability of" in current_action:
-                play.Action = "Activated Ability"
-                play.parse_targets(current_action)
-                if cards_in_action:
-                    play.Primary_Card = cards_in_action[0]
-                else:
-                    card = current_action.split(
-                        "activates an ability of ")[1].split(" (")[0]
-                    play.Primary_Card = 'NA' if card in (p1,p2) else card
+                action = "Activated Ability"
             elif curr_word_list[1] == "discards":
-                play.Action = 'Discards'
-                play.Primary_Card = cards_in_action[0] if cards_in_action else 'NA'
+                action = "Discards"
             elif "is being attacked by" in current_action:
-                play.Casting_Player = alter(active_player, original=True)
-                play.Action = "Attacks"
-                play.Attackers = len(CARD_PATTERN.findall(current_action.split("is being attacked by")[1]))
+                action = "Attacks"
             elif "puts triggered ability from" in current_action:
-                play.Action = "Triggers"
-                play.parse_targets(current_action)
-                if cards_in_action:
-                    play.Primary_Card = cards_in_action[0]
-                else:
-                    play.Primary_Card = current_action.split("triggered ability from ")[1].split(" onto the stack ")[0]
-                    # MODO Bug Encountered. Primary_Card = "NA"
-                    if play.Primary_Card in (p1,p2):
-                        play.Primary_Card = "NA"
-    return all_plays
+                action = "Triggers"
+            else:
+                continue
+
+        for player in (curr_word_list[0], active_player, nonactive_player):
+            if player not in names:
+                names[player] = alter(player, original=True)
+        casting_player = names[curr_word_list[0]]
+        primary_card = "NA"
+        targets = NO_TARGETS
+        cards_drawn = attackers = 0
+        play_num += 1
+        if action == "Draws":
+            cards_drawn = CARDS_DRAWN_DICT.get(curr_word_list[2], 8)
+        elif action == "Attacks":
+            casting_player = names[active_player]
+            attackers = len(CARD_PATTERN.findall(current_action.split("is being attacked by")[1]))
+        else:
+            cards_in_action = CARD_PATTERN.findall(current_action)
+            if cards_in_action:
+                primary_card = cards_in_action[0]
+            elif action == "Activated Ability":
+                card = current_action.split(
+                    "activates an ability of ")[1].split(" (")[0]
+                primary_card = 'NA' if card in (p1,p2) else card
+            elif action == "Triggers":
+                primary_card = current_action.split("triggered ability from ")[1].split(" onto the stack ")[0]
+                # MODO Bug Encountered. Primary_Card = "NA"
+                if primary_card in (p1,p2):
+                    primary_card = "NA"
+            if (action in ("Activated Ability", "Triggers")) or (
+                action == "Casts" and "targeting" in current_action):
+                targets = action_targets(current_action, casting_player, 
+                    names[active_player], names[nonactive_player])
+        plays.add(match_id, game_num, play_num, turn_num, casting_player, action,
+            primary_card, *targets, cards_drawn, attackers, 
+            names[active_player], names[nonactive_player])
+    return plays
 
 def get_all_data(
-    game_log: str, file_last_modified: struct_time
+    game_log: Union[str, bytes, mmap.mmap], file_last_modified: struct_time
     ) ->tuple[
         MatchData, 
         list[GameData], 
-        list[PlayData], 
+        PlayBuffer, 
         dict[str, list[str]], 
         tuple[bool, Union[str, Literal[None]]]]:
     # Input:  String,String
@@ -1,5 +1,5 @@
 import tkinter as tk
-from typing import Union, Literal, Callable
+from typing import Union, Literal, Callable, Iterable
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -10,16 +10,22 @@ from tkcalendar import DateEntry
 from pathlib import Path
 import csv
 from MODO_DATA import ARCHETYPES
-from datatypes import AllData, MatchData, PlayData, GameData, MatchActions
+from datatypes import AllData, MatchData, PlayData, GameData, MatchActions, ColumnTable, ParsedFiles, DraftIndex
 import modo
 import os
+import sys
 import time
 import io
 import log_parser
+import importer
+import storage
 import datetime
 import itertools
+import collections
 import pickle
+import queue
 import shutil
+import watcher
 from MODO_DATA import (
     CARDS_DRAWN_DICT, CONSTRUCTED_FORMATS, CONSTRUCTED_PLAY_TYPES, 
     CUBE_FORMATS, DRAFT_FORMATS, DRAFT_PLAY_TYPES, LIMITED_FORMATS, HEADERS,
@@ -30,13 +36,17 @@ pd.options.mode.chained_assignment = None
 
 # Saved data:
 ALL_DATA =          AllData()
-ALL_DATA_INVERTED = AllData()
+ALL_DATA_INVERTED = modo.invert_join(ALL_DATA)
 ALL_DECKS =         {}
 TIMEOUT =           {}
 DRAFTS_TABLE =      []
 PICKS_TABLE =       []
-PARSED_FILE_DICT =  {}
+PARSED_FILE_DICT =  ParsedFiles()
 PARSED_DRAFT_DICT = {}
+GAMELOG_FINGERPRINTS = {}
+GAMELOG_FOLDERS =   {}
+# Connection to the save file, opened in startup().
+DATABASE =          None
 
 # Settings imported/saved in save folder:
 FILEPATH_ROOT =          ""
@@ -48,6 +58,22 @@ FILEPATH_DRAFTS_COPY =   ""
 HERO =                   ""
 INPUT_OPTIONS =          {}
 MAIN_WINDOW_SIZE =  ("small",1000,490)
+# Worker processes for GameLog parsing. Set to 1 to import serially.
+IMPORT_WORKERS =         importer.DEFAULT_WORKERS
+# Hold Matches, Games and Plays in typed column arrays instead of row lists.
+COLUMNAR_DATA =          False
+# Only list GameLogs folders that changed since the last import.
+# Set to False to also find GameLogs rewritten without changing their folder.
+INCREMENTAL_IMPORT =     True
+# Import new logs from the default import folders while the program is open.
+WATCH_IMPORT_FOLDERS =   False
+# Milliseconds between checks for logs parsed by the watcher.
+WATCH_INTERVAL_MS =      500
+# Milliseconds between progress updates of a running import.
+IMPORT_POLL_MS =         100
+# Game_Winners inferred with at least this confidence (0 to 1) are set without asking.
+# Set above 1 to select every Game_Winner by hand.
+AUTO_WINNER_CONFIDENCE = 0.8
 
 test_mode =         False
 filter_dict =       {}
@@ -62,25 +88,49 @@ selected =          ()
 display_index =     0
 ln_per_page =       20
 curr_data =         pd.DataFrame()
+# Filtered and sorted main tables, see print_data and sort_column2.
+# Least recently used first, only the last few are kept.
+table_cache =       collections.OrderedDict()
+TABLE_CACHE_SIZE =  4
+curr_data_key =     None
+# Background import, see import_logs and start_watcher.
+import_thread =     None
+log_watcher =       None
+watch_job =         None
+watch_results =     queue.Queue()
 
 def save(exit: bool) -> None:
     global ask_to_save
     ask_to_save = False
 
     save_settings()
-    os.chdir(FILEPATH_ROOT / "save")
-    pickle.dump(ALL_DATA,open("ALL_DATA","wb"))
-    pickle.dump(TIMEOUT,open("TIMEOUT","wb"))
-    pickle.dump(DRAFTS_TABLE,open("DRAFTS_TABLE","wb"))
-    pickle.dump(PICKS_TABLE,open("PICKS_TABLE","wb"))
-    pickle.dump(PARSED_FILE_DICT,open("PARSED_FILE_DICT","wb"))
-    pickle.dump(PARSED_DRAFT_DICT,open("PARSED_DRAFT_DICT","wb"))
+    DATABASE.save({"ALL_DATA": ALL_DATA,
+        "TIMEOUT": TIMEOUT, "DRAFTS_TABLE": DRAFTS_TABLE, "PICKS_TABLE": PICKS_TABLE,
+        "PARSED_FILE_DICT": PARSED_FILE_DICT, "PARSED_DRAFT_DICT": PARSED_DRAFT_DICT,
+        "GAMELOG_FINGERPRINTS": GAMELOG_FINGERPRINTS, "GAMELOG_FOLDERS": GAMELOG_FOLDERS})
     update_status_bar(status="Save complete. Data will be loaded automatically on next startup.")
-    os.chdir(FILEPATH_ROOT)
 
     if exit:
         window.destroy()
 
+def data_changed(match_ids: Union[Iterable[str], None]=None,draft_ids: Union[Iterable[str], None]=None) -> None:
+    # Call after editing ALL_DATA or DRAFTS_TABLE so cached tables are rebuilt.
+    # The IDs of the edited Matches/Drafts are written on the next save, all rows are compared without them.
+    ALL_DATA.touch()
+    table_cache.clear()
+    if DATABASE is not None:
+        DATABASE.mark_changed(match_ids,draft_ids)
+def cached_table(cache_key) -> Union[pd.DataFrame, None]:
+    # None if the table is not cached, a hit makes it the most recently used.
+    if cache_key not in table_cache:
+        return None
+    table_cache.move_to_end(cache_key)
+    return table_cache[cache_key]
+def cache_table(cache_key, df: pd.DataFrame) -> None:
+    table_cache[cache_key] = df
+    table_cache.move_to_end(cache_key)
+    while len(table_cache) > TABLE_CACHE_SIZE:
+        table_cache.popitem(last=False)
 def save_window(exit: bool) -> None:
     height = 100
     width =  300
@@ -215,12 +265,15 @@ def clear_loaded():
     global user_entered_winner
     global ask_to_save
 
-    ALL_DATA = AllData()
-    ALL_DATA_INVERTED = AllData()
+    ALL_DATA = AllData(columnar=COLUMNAR_DATA)
+    ALL_DATA_INVERTED = modo.invert_join(ALL_DATA)
     DRAFTS_TABLE =      []
     PICKS_TABLE =       []
+    data_changed()
     PARSED_FILE_DICT.clear()
     PARSED_DRAFT_DICT.clear()
+    GAMELOG_FINGERPRINTS.clear()
+    GAMELOG_FOLDERS.clear()
     HERO =              ""
     filter_dict.clear()
     display =           ""
@@ -242,6 +295,7 @@ def clear_loaded():
     stats_button["state"] = tk.DISABLED
     next_button["state"] = tk.DISABLED
     back_button["state"] = tk.DISABLED
+    page_button["state"] = tk.DISABLED
     
     text_frame.config(text="Dataframe")
 
@@ -364,7 +418,10 @@ def delete_session():
         window.winfo_y()+(window.winfo_height()/2)-(height/2)))
 
     def del_session():
-        save_files = ["ALL_DATA","DRAFTS_TABLE","PICKS_TABLE","TIMEOUT","PARSED_FILE_DICT","PARSED_DRAFT_DICT","SETTINGS","MAIN_WINDOW_SIZE"]
+        global DATABASE
+        save_files = [storage.DATABASE_FILE,"ALL_DATA","DRAFTS_TABLE","PICKS_TABLE","TIMEOUT","PARSED_FILE_DICT","PARSED_DRAFT_DICT","SETTINGS","MAIN_WINDOW_SIZE"]
+        if DATABASE is not None:
+            DATABASE.close()
         os.chdir(FILEPATH_ROOT / "save")   
 
         session_exists = False
@@ -372,6 +429,7 @@ def delete_session():
             if os.path.exists(i):
                 session_exists = True
                 os.remove(i)
+        DATABASE = storage.open_database(FILEPATH_ROOT / "save")
 
         # os.chdir(FILEPATH_LOGS_COPY)
         # for (root,dirs,files) in os.walk(os.getcwd()):
@@ -436,6 +494,9 @@ def startup():
     global PICKS_TABLE
     global PARSED_FILE_DICT
     global PARSED_DRAFT_DICT
+    global GAMELOG_FINGERPRINTS
+    global GAMELOG_FOLDERS
+    global DATABASE
     global INPUT_OPTIONS
     global data_loaded
     global ask_to_save
@@ -472,18 +533,25 @@ def startup():
     if os.path.isfile("ALL_DECKS"):
         ALL_DECKS = pickle.load(open("ALL_DECKS","rb"))
 
-    if (not os.path.isfile("ALL_DATA")) & (not os.path.isfile("DRAFTS_TABLE")):
+    if DATABASE is not None:
+        DATABASE.close()
+    DATABASE = storage.open_database(FILEPATH_ROOT / "save")
+    if DATABASE.is_empty():
         update_status_bar(status="No session data to load. Import your MTGO GameLog files to get started.")
         os.chdir(FILEPATH_ROOT)
         return
-    ALL_DATA = pickle.load(open("ALL_DATA","rb"))
-    TIMEOUT = pickle.load(open("TIMEOUT","rb"))
-    DRAFTS_TABLE = pickle.load(open("DRAFTS_TABLE","rb"))
-    PICKS_TABLE = pickle.load(open("PICKS_TABLE","rb"))
-    PARSED_FILE_DICT = pickle.load(open("PARSED_FILE_DICT","rb"))
-    PARSED_DRAFT_DICT = pickle.load(open("PARSED_DRAFT_DICT","rb"))
+    session = DATABASE.load(columnar=COLUMNAR_DATA)
+    ALL_DATA = session["ALL_DATA"]
+    TIMEOUT = session["TIMEOUT"]
+    DRAFTS_TABLE = session["DRAFTS_TABLE"]
+    PICKS_TABLE = session["PICKS_TABLE"]
+    PARSED_FILE_DICT = session["PARSED_FILE_DICT"]
+    PARSED_DRAFT_DICT = session["PARSED_DRAFT_DICT"]
+    GAMELOG_FINGERPRINTS = session["GAMELOG_FINGERPRINTS"]
+    GAMELOG_FOLDERS = session["GAMELOG_FOLDERS"]
 
     ALL_DATA_INVERTED = modo.invert_join(ALL_DATA)
+    table_cache.clear()
 
     filter_button["state"] = tk.NORMAL
     clear_button["state"] = tk.NORMAL
@@ -545,178 +613,331 @@ def set_display(d: str, update_status: bool, reset: bool, start_index: int=0
     revise_button["state"] = tk.DISABLED
     remove_button["state"] = tk.DISABLED
 
-def get_all_data(logs_path: Path,drafts_path: Path,copy: bool) -> None:
-    global ALL_DATA
-    global ALL_DATA_INVERTED
-    global TIMEOUT
-    global DRAFTS_TABLE
-    global PICKS_TABLE
-    global PARSED_FILE_DICT
-    global PARSED_DRAFT_DICT
-    global data_loaded
-    global ask_to_save
+def import_logs(logs_path: Path,drafts_path: Path,copy: bool,overwrite: bool=False) -> None:
+    # Parses new logs on an importer.ImportThread while a progress window is open.
+    # The session is only changed in finish_import, so cancelling leaves it as it was.
+    global import_thread
 
-    match_count = 0
-    draft_count = 0
-    skip_dict = {}
-    if logs_path != "No Default GameLogs Folder":
-        new_data = AllData()
-        os.chdir(logs_path)
-        for (root,dirs,files) in os.walk(logs_path):
-            for file in files:
-                if ("Match_GameLog_" not in file) or (len(file) < 30):
-                    pass
-                elif (file in PARSED_FILE_DICT):
-                    os.chdir(root)
-                else:
-                    os.chdir(root)
-                    with io.open(file,"r",encoding="ansi") as gamelog:
-                        initial = gamelog.read()
-                    mtime = time.localtime(os.path.getmtime(file))
-                    # games you spectate are almost impossible to parse
-                    if 'has started watching' in initial: 
-                        continue
-                    try:
-                        parsed_data = modo.get_all_data(initial, mtime)
-                    except ValueError as e: #  catch parsing errors
-                        print(f'Enocountered {e} in file {file}. Skipping match')
-                        continue
-                    PARSED_FILE_DICT[file] = (parsed_data[0].Match_ID,
-                        datetime.datetime.fromtimestamp(time.mktime(mtime)))
-                    if copy:
-                        try:
-                            shutil.copy(file,FILEPATH_LOGS_COPY)
-                            os.chdir(FILEPATH_LOGS_COPY)
-                            os.utime(file,(datetime.datetime.now().timestamp(),PARSED_FILE_DICT[file][1].timestamp()))
-                            os.chdir(root)
-                        except shutil.SameFileError:
-                            pass
-                    new_data.matches.append(parsed_data[0])
-                    new_data.games.extend(parsed_data[1])
-                    new_data.plays.extend(parsed_data[2])
-                    new_data.raw_game_data = new_data[3] | parsed_data[3]
-                    if parsed_data[4][0]: # if there was a timeout in match
-                        TIMEOUT[parsed_data[0][0]] = parsed_data[4][1]
-                    match_count += 1
-        new_data_inverted = modo.invert_join(new_data)
-        for index in range(3):
-            ALL_DATA[index].extend(new_data[index])
-            ALL_DATA_INVERTED[index].extend(new_data[index])
-        ALL_DATA[3] = ALL_DATA[3] | new_data[3]
-        ALL_DATA_INVERTED[3] = ALL_DATA_INVERTED[3] | new_data_inverted[3]
-
-    if drafts_path != "No Default DraftLogs Folder":
-        os.chdir(drafts_path)
-        for (root,dirs,files) in os.walk(drafts_path):
-            for file in files:
-                if (file.count(".") != 3) or (file.count("-") != 4) or (".txt" not in file):
-                    pass
-                elif (file in PARSED_DRAFT_DICT):
-                    os.chdir(root)
-                else:
-                    os.chdir(root)
-                    with io.open(file,"r",encoding="ansi") as gamelog:
-                        initial = gamelog.read()
-                    parsed_data = log_parser.parse_draft_log(file,initial) 
-                    DRAFTS_TABLE.extend(parsed_data[0])
-                    PICKS_TABLE.extend(parsed_data[1])
-                    PARSED_DRAFT_DICT[file] = parsed_data[2]
-                    if copy:
-                        try:
-                            shutil.copy(file,FILEPATH_DRAFTS_COPY)
-                            os.chdir(FILEPATH_DRAFTS_COPY)
-                            os.chdir(root)
-                        except shutil.SameFileError:
-                            pass
-                    draft_count += 1
+    logs_path = logs_path if os.path.isdir(logs_path or "") else None
+    drafts_path = drafts_path if os.path.isdir(drafts_path or "") else None
+    if overwrite:
+        known = ({},{},{},{})
+    else:
+        known = (dict(GAMELOG_FINGERPRINTS),dict(GAMELOG_FOLDERS),
+            dict(PARSED_FILE_DICT),dict(PARSED_DRAFT_DICT))
+    results = queue.Queue()
+    import_thread = importer.ImportThread(logs_path,drafts_path,results,*known,
+        workers=IMPORT_WORKERS,full_scan=not INCREMENTAL_IMPORT)
+
+    height = 120
+    width =  350
+    progress_window = tk.Toplevel(window)
+    progress_window.title("Importing")
+    progress_window.iconbitmap(progress_window,"icon.ico")
+    progress_window.minsize(width,height)
+    progress_window.resizable(False,False)
+    progress_window.grab_set()
+    progress_window.focus()
+    progress_window.geometry("+%d+%d" %
+        (window.winfo_x()+(window.winfo_width()/2)-(width/2),
+        window.winfo_y()+(window.winfo_height()/2)-(height/2)))
+
+    def poll_import():
+        while True:
+            try:
+                kind, result = results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                show_progress(result)
+                continue
+            close_progress_window()
+            if kind == "done":
+                finish_import(result,copy,overwrite)
+            elif kind == "cancelled":
+                update_status_bar(status="Import cancelled. No data was changed.")
+            else:
+                update_status_bar(status=f"Import failed: {result}")
+            return
+        progress_window.after(IMPORT_POLL_MS,poll_import)
+
+    def show_progress(progress):
+        done = progress["parsed"] + progress["skipped"] + progress["errors"]
+        bar["maximum"] = max(progress["scanned"],1)
+        bar["value"] = done
+        label1.config(text=f'{done} of {progress["scanned"]} new or changed files read')
+        eta = "" if progress["eta"] is None else f', about {progress["eta"]:.0f}s left'
+        label2.config(text=f'{progress["skipped"]} skipped, {progress["errors"]} errors{eta}')
+
+    def cancel_import():
+        import_thread.cancel()
+        button1["state"] = tk.DISABLED
+        label2.config(text="Cancelling...")
+
+    def close_progress_window():
+        global import_thread
+        import_thread = None
+        progress_window.grab_release()
+        progress_window.destroy()
+
+    label1 = tk.Label(progress_window,text="Looking for new files...")
+    label2 = tk.Label(progress_window,text="")
+    bar = ttk.Progressbar(progress_window,orient="horizontal",length=width-40,mode="determinate")
+    button1 = tk.Button(progress_window,text="Cancel",width=10,command=lambda : cancel_import())
+
+    progress_window.grid_columnconfigure(0,weight=1)
+    label1.grid(row=0,column=0,pady=(10,0))
+    bar.grid(row=1,column=0,padx=20,pady=5)
+    label2.grid(row=2,column=0,pady=0)
+    button1.grid(row=3,column=0,pady=5)
+
+    progress_window.protocol("WM_DELETE_WINDOW", lambda : cancel_import())
+    import_thread.start()
+    progress_window.after(IMPORT_POLL_MS,poll_import)
+def finish_import(result: tuple,copy: bool,overwrite: bool) -> None:
+    # Adds the logs parsed by import_logs to the session.
+    # Re-imports keep the data entered by hand for Matches that are still there.
+    global HERO
+
+    gamelogs, draftlogs, fingerprints, folder_mtimes = result
+    if overwrite:
+        h = HERO
+        match_dict = user_inputs(type="Matches")
+        game_dict = user_inputs(type="Games")
+        clear_loaded()
+    GAMELOG_FINGERPRINTS.clear()
+    GAMELOG_FINGERPRINTS.update(fingerprints)
+    GAMELOG_FOLDERS.clear()
+    GAMELOG_FOLDERS.update(folder_mtimes)
+    match_count, draft_count = add_parsed_logs(gamelogs,draftlogs,copy)
+
+    if overwrite:
+        for match in ALL_DATA.matches:
+            try:
+                match.Draft_ID = match_dict[match[0]][1]
+                match.P1_Subarch = match_dict[match[0]][0][match.P1][1]
+                match.P1_Arch = match_dict[match[0]][0][match.P1][0]
+                match.P2_Arch = match_dict[match[0]][0][match.P2][0]
+                match.P2_Subarch = match_dict[match[0]][0][match.P2][1]
+                match.Format = match_dict[match[0]][2]
+                match.Limited_Format = match_dict[match[0]][3]
+                match.Match_Type = match_dict[match[0]][4]
+            # Found new Match for which we don't have user inputs.
+            except KeyError:
+                pass
+        for i in ALL_DATA[1]:
+            key = i[0] + "-" + str(i[HEADERS["Games"].index("Game_Num")])
+            try:
+                if (i[HEADERS["Games"].index("P1")] == game_dict[key][0]):
+                    i[HEADERS["Games"].index("Game_Winner")] = game_dict[key][2]
+            # Found new Game for which we don't have user inputs.
+            except KeyError:
+                pass
+            # Delete RawData for Games that have a manually entered Game_Winner.
+            if key in ALL_DATA[3]:
+                if i[HEADERS["Games"].index("Game_Winner")] != "NA":
+                    ALL_DATA[3].pop(key)
+        HERO = h
+        if HERO != "":
+            stats_button["state"] = tk.NORMAL
+        modo.update_game_wins(ALL_DATA,TIMEOUT)
+        modo.update_draft_wins(ALL_DATA,DRAFTS_TABLE)
+        data_changed()
 
     match_string = f'{match_count} new Match{"es" if match_count != 1 else ""}'
     draft_string = f'{draft_count} new Draft{"s" if draft_count != 1 else ""}'
     update_status_bar(status=f"Imported {match_string} and {draft_string}.")
 
+    clear_filter(update_status=False,reload_display=False)
+    set_display("Matches",update_status=False,reset=True)
+    restart_watcher()
+def add_parsed_logs(gamelogs: list[tuple],draftlogs: list[tuple],copy: bool) -> tuple[int, int]:
+    # Merges parsed GameLogs and DraftLogs into the session.
+    # Returns the number of new Matches and Drafts.
+    global data_loaded
+    global ask_to_save
+
+    match_count = 0
+    draft_count = 0
+    if gamelogs:
+        replaced = {}
+        new_data = importer.collect_gamelogs(gamelogs,TIMEOUT,PARSED_FILE_DICT,
+            FILEPATH_LOGS_COPY if copy else None,GAMELOG_FINGERPRINTS,replaced)[0]
+        match_count = importer.merge_gamelogs(ALL_DATA,new_data,replaced)
+        DATABASE.expire_matches(replaced.values())
+        new_matches = [match[0] for match in new_data.matches]
+    else:
+        new_matches = []
+    draft_start = len(DRAFTS_TABLE)
+    for file_path, parsed_data in draftlogs:
+        draft_count += importer.add_draftlog(file_path,parsed_data,DRAFTS_TABLE,
+            PICKS_TABLE,PARSED_DRAFT_DICT,FILEPATH_DRAFTS_COPY if copy else None)
+
     if match_count or draft_count:
         ask_to_save = True
+        data_changed(new_matches,[draft[0] for draft in DRAFTS_TABLE[draft_start:]])
 
     if len(ALL_DATA[0]) or len(DRAFTS_TABLE):
         filter_button["state"] = tk.NORMAL
         clear_button["state"] = tk.NORMAL
         data_loaded = True
-    os.chdir(FILEPATH_ROOT)
-
-def print_data(
-    data: Union[MatchData, GameData, PlayData, list], headers: list[str],
-    update_status: bool, start_index: int=0, apply_filter: bool=False) -> None:
-    global curr_data
-    small_headers = ["P1_Roll","P2_Roll","P1_Wins","P2_Wins","Game_Num","Play_Num","Turn_Num","Pack_Num","Pick_Num","Pick_Ovr"]
-    med_headers = ["Avail_1","Avail_2","Avail_3","Avail_4","Avail_5","Avail_6","Avail_7","Avail_8","Avail_9","Avail_10","Avail_11","Avail_12","Avail_13","Avail_14"]
-    large_headers = ["Card"]
-    header_widths = {header: 75 for header in small_headers
-    } | {header: 80 for header in med_headers
-    } | {header: 120 for header in large_headers}
-
-    # Clear existing data in tree
-    tree1.delete(*tree1.get_children())
+        data_menu.entryconfig("Set Default Hero",state=tk.NORMAL)
+        file_menu.entryconfig("Save Data",state=tk.NORMAL)
+        data_menu.entryconfig("Clear Loaded Data",state=tk.NORMAL)
+        data_menu.entryconfig("Input Missing Match Data",state=tk.NORMAL)
+        data_menu.entryconfig("Input Missing Game_Winner Data",state=tk.NORMAL)
+        data_menu.entryconfig("Apply Best Guess for Deck Names",state=tk.NORMAL)
+        data_menu.entryconfig("Apply Associated Draft_IDs to Limited Matches",state=tk.NORMAL)
+    return (match_count, draft_count)
+def start_watcher() -> None:
+    # Parses new logs in the default import folders on a background thread.
+    # The results are merged on the Tk thread by poll_watcher.
+    global log_watcher
+    global watch_job
+
+    stop_watcher()
+    logs_path = FILEPATH_LOGS if os.path.isdir(FILEPATH_LOGS or "") else None
+    drafts_path = FILEPATH_DRAFTS if os.path.isdir(FILEPATH_DRAFTS or "") else None
+    if (logs_path is None) and (drafts_path is None):
+        update_status_bar(status="Set the default import folders to watch them for new logs.")
+        return
+    log_watcher = watcher.LogWatcher(logs_path,drafts_path,watch_results,
+        dict(GAMELOG_FINGERPRINTS),dict(GAMELOG_FOLDERS),
+        dict(PARSED_FILE_DICT),dict(PARSED_DRAFT_DICT))
+    log_watcher.start()
+    watch_job = window.after(WATCH_INTERVAL_MS,poll_watcher)
+def stop_watcher() -> None:
+    global log_watcher
+    global watch_job
+
+    if log_watcher is not None:
+        log_watcher.stop()
+        log_watcher = None
+    if watch_job is not None:
+        window.after_cancel(watch_job)
+        watch_job = None
+    # parsed with the settings of the stopped watcher
+    while not watch_results.empty():
+        watch_results.get_nowait()
+def restart_watcher() -> None:
+    # Call after the default import folders changed.
+    if log_watcher is not None:
+        start_watcher()
+def toggle_watcher() -> None:
+    global WATCH_IMPORT_FOLDERS
+
+    WATCH_IMPORT_FOLDERS = watch_folders.get()
+    if WATCH_IMPORT_FOLDERS:
+        start_watcher()
+        if log_watcher is not None:
+            update_status_bar(status="Watching the default import folders for new logs.")
+    else:
+        stop_watcher()
+        update_status_bar(status="Stopped watching the default import folders.")
+def poll_watcher() -> None:
+    global watch_job
+
+    # Wait while a dialog is open, it may be editing the same data.
+    if window.grab_current() is None:
+        apply_watch_results()
+    watch_job = window.after(WATCH_INTERVAL_MS,poll_watcher)
+def apply_watch_results() -> None:
+    gamelogs = []
+    draftlogs = []
+    while True:
+        try:
+            kind, result = watch_results.get_nowait()
+        except queue.Empty:
+            break
+        if kind == "gamelog":
+            gamelogs.append(result)
+        elif kind == "draftlog":
+            draftlogs.append(result)
+        else:
+            print(result)
+    if not (gamelogs or draftlogs):
+        return
+    was_loaded = data_loaded
+    match_count, draft_count = add_parsed_logs(gamelogs,draftlogs,copy=True)
+    if not (match_count or draft_count):
+        return
 
-    tree1["columns"] = headers
+    if not was_loaded:
+        set_display("Matches",update_status=False,reset=True)
+    elif curr_data_key is not None: # not while looking at a drill-down
+        set_display(display,update_status=False,reset=False,start_index=display_index)
 
-    # Insert column headers into tree
-    for condition in tree1["columns"]:
-        width = header_widths.get(condition,100)
-        tree1.column(condition, anchor="center", stretch=False, width=width)
-        tree1.heading(condition, text=condition, 
-        command=lambda _col=condition: sort_column2(_col,False,tree1))
-    tree1.column(0,anchor="w")
-    
+    match_string = f'{match_count} new Match{"es" if match_count != 1 else ""}'
+    draft_string = f'{draft_count} new Draft{"s" if draft_count != 1 else ""}'
+    update_status_bar(status=f"Watching import folders: imported {match_string} and {draft_string}.")
+
+def filter_table(df: pd.DataFrame, filters: dict[str, list[str]]) -> pd.DataFrame:
+    """Applies filter settings like the ones in filter_dict.
+        Conditions on the same column are combined with OR, 
+        conditions on different columns with AND.
+
+    Args:
+        df (pd.DataFrame): Table to filter. Columns not in df are ignored.
+        filters (dict[str, list[str]]): Column name to conditions like "= Casts" or "> 2".
+            Date conditions with = match the day, > and < compare the full timestamp.
+
+    Returns:
+        pd.DataFrame: The rows matching all filters, in their original order.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for key, conditions in filters.items():
+        if (key not in df.columns) or (not conditions):
+            continue
+        column = df[key]
+        numeric = pd.api.types.is_numeric_dtype(column)
+        if key == "Date":
+            days = column.str[:10]
+        key_mask = np.zeros(len(df), dtype=bool)
+        for condition in conditions:
+            op, value = condition[0], condition[2:]
+            if numeric:
+                try:
+                    value = int(value) if value.isnumeric() else float(value)
+                except ValueError:
+                    continue
+            elif (op == "=") and value.isnumeric():
+                # integers stored next to strings in an object column
+                key_mask |= (column == int(value)).to_numpy()
+            if (op == "=") and (key == "Date"):
+                key_mask |= (days == value[0:10]).to_numpy()
+            elif op == "=":
+                key_mask |= (column == value).to_numpy()
+            elif op in (">", "<"):
+                try:
+                    key_mask |= (column > value if op == ">" else column < value).to_numpy()
+                except TypeError:
+                    text = column.astype(str)
+                    key_mask |= (text > value if op == ">" else text < value).to_numpy()
+        mask &= key_mask
+    return df[mask]
+def get_table(
+    data: Union[MatchData, GameData, PlayData, list], headers: list[str],
+    apply_filter: bool=False) -> pd.DataFrame:
     # Build dataframe being printed.
     if isinstance(data, pd.DataFrame):
         df = data
     elif data == None:
         df = df = pd.DataFrame([],columns=headers)
     elif (HERO != "") & (display == "Matches"):
-        df = pd.DataFrame(ALL_DATA_INVERTED.matches,columns=headers)
-        df = df[(df.P1 == HERO)]
+        df = ALL_DATA_INVERTED.frame("Matches",hero=HERO)
     elif (HERO != "") & (display == "Games"):
-        df = pd.DataFrame(ALL_DATA_INVERTED.games,columns=headers)
-        df = df[(df.P1 == HERO)]
+        df = ALL_DATA_INVERTED.frame("Games",hero=HERO)
     elif (display == "Drafts"):
         df = pd.DataFrame(DRAFTS_TABLE,columns=headers)
     elif (display == "Picks"):
         df = pd.DataFrame(PICKS_TABLE,columns=headers)
+    elif isinstance(data, ColumnTable):
+        df = data.frame()
     else:
         df = pd.DataFrame(data,columns=headers)
-    curr_data = df
 
     if apply_filter:
-        # Apply existing filters.
-        filtered_list = []
-        for key in filter_dict:
-            if key not in headers:
-                continue
-            for condition in filter_dict[key]:
-                if condition[2:].isnumeric():
-                    value = int(condition[2:])
-                else:
-                    value = condition[2:]
-                if condition[0] == "=":
-                    if key == "Date":
-                        filtered_list.append(df[(df[key].str.contains(value[0:10]))])
-                    else:
-                        filtered_list.append(df[(df[key] == value)])
-                elif condition[0] == ">":
-                    filtered_list.append(df[(df[key] > value)])
-                elif condition[0] == "<":
-                    filtered_list.append(df[(df[key] < value)])
-            if len(filtered_list) == 0:
-                pass
-            elif len(filtered_list) == 1:
-                df = filtered_list[0]
-            else:
-                index = 1
-                df = filtered_list[0]
-                while index < len(filtered_list):
-                    df = pd.merge(df,filtered_list[index],how="outer")
-                    index += 1
-            filtered_list.clear()
+        df = filter_table(df, filter_dict)
         # Apply Default Sorting.
         if display == "Matches":
             df = df.sort_values(by=["Match_ID"],ascending=False)
@@ -728,18 +949,58 @@ def print_data(
             df = df.sort_values(by=["Draft_ID"],ascending=False)
         elif display == "Picks":
             df = df.sort_values(by=["Draft_ID","Pick_Ovr"],ascending=(False,True))
-        curr_data = df
+    return df
+def print_data(
+    data: Union[MatchData, GameData, PlayData, list], headers: list[str],
+    update_status: bool, start_index: int=0, apply_filter: bool=False) -> None:
+    global curr_data
+    global curr_data_key
+    small_headers = ["P1_Roll","P2_Roll","P1_Wins","P2_Wins","Game_Num","Play_Num","Turn_Num","Pack_Num","Pick_Num","Pick_Ovr"]
+    med_headers = ["Avail_1","Avail_2","Avail_3","Avail_4","Avail_5","Avail_6","Avail_7","Avail_8","Avail_9","Avail_10","Avail_11","Avail_12","Avail_13","Avail_14"]
+    large_headers = ["Card"]
+    header_widths = {header: 75 for header in small_headers
+    } | {header: 80 for header in med_headers
+    } | {header: 120 for header in large_headers}
+
+    # Clear existing data in tree
+    tree1.delete(*tree1.get_children())
+
+    tree1["columns"] = headers
 
-    df_rows = df.to_numpy().tolist()
-    end_index = min(start_index + ln_per_page, len(df_rows))
-    next_button["state"] = tk.DISABLED if end_index == len(df_rows) else tk.NORMAL
+    # Insert column headers into tree
+    for condition in tree1["columns"]:
+        width = header_widths.get(condition,100)
+        tree1.column(condition, anchor="center", stretch=False, width=width)
+        tree1.heading(condition, text=condition, 
+        command=lambda _col=condition: sort_column2(_col,False,tree1))
+    tree1.column(0,anchor="w")
+    
+    # Reuse the filtered and sorted table until the data or filters change.
+    cache_key = None
+    if apply_filter and (not isinstance(data, pd.DataFrame)) and (data is not None):
+        cache_key = (display, HERO, ALL_DATA.version,
+            tuple((key, tuple(conditions)) for key, conditions in filter_dict.items()))
+    df = cached_table(cache_key)
+    if df is None:
+        df = get_table(data, headers, apply_filter)
+        if cache_key is not None:
+            cache_table(cache_key, df)
+    if not isinstance(data, pd.DataFrame):
+        curr_data_key = cache_key
+    curr_data = df
+
+    # Only the rows on the current page are converted.
+    end_index = min(start_index + ln_per_page, len(df))
+    next_button["state"] = tk.DISABLED if end_index == len(df) else tk.NORMAL
     back_button["state"] = tk.DISABLED if start_index == 0 else tk.NORMAL
+    page_button["state"] = tk.NORMAL if len(df) > ln_per_page else tk.DISABLED
 
-    for condition in range(start_index,end_index):
-        tree1.insert("","end",values=df_rows[condition])
+    for row in df.iloc[start_index:end_index].to_numpy().tolist():
+        tree1.insert("","end",values=row)
 
     if update_status:
-        update_status_bar(status=f"Displaying: {str(start_index + 1)}-{str(end_index)} of {str(len(df_rows))} total records.")
+        page_count = max(1, -(-len(df) // ln_per_page))
+        update_status_bar(status=f"Displaying: {str(start_index + 1)}-{str(end_index)} of {str(len(df))} total records. Page {start_index // ln_per_page + 1} of {page_count}.")
 
 def get_lists():
     global ALL_DECKS
@@ -787,8 +1048,11 @@ def input_missing_data():
     p2_arch_index = HEADERS["Matches"].index("P2_Arch")
     p2_sub_index =  HEADERS["Matches"].index("P2_Subarch")
 
+    land_drops = ALL_DATA.card_sets("Land Drop")
+    casts = ALL_DATA.card_sets("Casts")
     n = 0
     count = 0
+    changed = []
     total = len(ALL_DATA[0])
     for match in ALL_DATA[0]: # Iterate through matches.
         match: MatchData
@@ -801,17 +1065,11 @@ def input_missing_data():
                 and match.Limited_Format == 'NA')
             ):
             count += 1
-            df = pd.DataFrame(ALL_DATA[2],columns=HEADERS["Plays"])
-            df = df[(df.Match_ID == match[0])]
             players = [match.P1,match.P2]
-            cards1 =  df[(df.Casting_Player == players[0]) & (df.Action == "Land Drop")].Primary_Card.value_counts().keys().tolist()
-            cards2 =  df[(df.Casting_Player == players[0]) & (df.Action == "Casts")].Primary_Card.value_counts().keys().tolist()
-            cards3 =  df[(df.Casting_Player == players[1]) & (df.Action == "Land Drop")].Primary_Card.value_counts().keys().tolist()
-            cards4 =  df[(df.Casting_Player == players[1]) & (df.Action == "Casts")].Primary_Card.value_counts().keys().tolist()
-            cards1 = sorted(cards1,key=str.casefold)
-            cards2 = sorted(cards2,key=str.casefold)
-            cards3 = sorted(cards3,key=str.casefold)
-            cards4 = sorted(cards4,key=str.casefold)
+            cards1 = sorted(land_drops.get((match[0],players[0]),()),key=str.casefold)
+            cards2 = sorted(casts.get((match[0],players[0]),()),key=str.casefold)
+            cards3 = sorted(land_drops.get((match[0],players[1]),()),key=str.casefold)
+            cards4 = sorted(casts.get((match[0],players[1]),()),key=str.casefold)
             revise_entry_window(players,cards1,cards2,cards3,cards4,(n,total),match)
             if missing_data == "Exit":
                 break
@@ -825,18 +1083,24 @@ def input_missing_data():
                 match[mformat_index] = missing_data[4]
                 match[lformat_index] = missing_data[5]
                 match[mtype_index] =   missing_data[6]
+                changed.append(match[0])
 
     if count == 0:
         update_status_bar(status="No Matches with Missing Data.")
     else:
-        ALL_DATA_INVERTED = modo.invert_join(ALL_DATA)
+        data_changed(changed)
         set_display("Matches",update_status=True,reset=True)
 def deck_data_guess(update_type):
     global ALL_DATA
     global ALL_DATA_INVERTED
     global ask_to_save
 
-    df2 = pd.DataFrame(ALL_DATA.plays,columns=HEADERS["Plays"])
+    p1_sub_index = HEADERS["Matches"].index("P1_Subarch")
+    p2_sub_index = HEADERS["Matches"].index("P2_Subarch")
+    card_sets = ALL_DATA.card_sets()
+    # constructed decks are guessed together once every match is collected
+    to_guess = []
+    changed = []
 
     for match in ALL_DATA.matches:
         yyyy_mm = match.Date[0:4] + "-" + match.Date[5:7]
@@ -848,22 +1112,23 @@ def deck_data_guess(update_type):
         elif update_type == "Unknowns":
             update_p1 = match.P1_Subarch in ("Unknown", "NA")
             update_p2 = match.P2_Subarch in ("Unknown", "NA")
-        if update_p1:
-            ask_to_save = True
-            cards = df2[(df2.Casting_Player == match.P1) & (df2.Match_ID == match[0])].Primary_Card.value_counts().keys().tolist()
-            if match.Format in INPUT_OPTIONS["Constructed Formats"]:
-                match.P1_Subarch = modo.closest_list(set(cards),ALL_DECKS,yyyy_mm)[0]
-            elif match.Format in INPUT_OPTIONS["Limited Formats"]:
-                match.P1_Subarch = modo.get_limited_subarch(cards)
-        if update_p2:
+        for update, player, sub_index in ((update_p1, match.P1, p1_sub_index), 
+                                          (update_p2, match.P2, p2_sub_index)):
+            if not update:
+                continue
             ask_to_save = True
-            cards = df2[(df2.Casting_Player == match.P2) & (df2.Match_ID == match[0])].Primary_Card.value_counts().keys().tolist()
+            cards = card_sets.get((match[0],player),frozenset())
             if match.Format in INPUT_OPTIONS["Constructed Formats"]:
-                match.P2_Subarch = modo.closest_list(set(cards),ALL_DECKS,yyyy_mm)[0]
+                to_guess.append((match,sub_index,cards,yyyy_mm))
             elif match.Format in INPUT_OPTIONS["Limited Formats"]:
-                match.P2_Subarch = modo.get_limited_subarch(cards)
+                match[sub_index] = modo.get_limited_subarch(cards)
+                changed.append(match[0])
 
-    ALL_DATA_INVERTED = modo.invert_join(ALL_DATA)
+    guesses = modo.closest_lists([(cards,yyyy_mm) for (_,_,cards,yyyy_mm) in to_guess],ALL_DECKS)
+    for (match,sub_index,_,_), guess in zip(to_guess,guesses):
+        match[sub_index] = guess[0]
+        changed.append(match[0])
+    data_changed(changed)
 
 def rerun_decks_window():
     height = 200
@@ -1368,6 +1633,77 @@ def next_page():
         print_data(curr_data,headers=HEADERS[display],update_status=True,start_index=display_index,apply_filter=False)
     revise_button["state"] = tk.DISABLED
     remove_button["state"] = tk.DISABLED
+def go_to_page(page: int, page_size: Union[int, None]=None) -> None:
+    global display_index
+    global ln_per_page
+    if page_size:
+        ln_per_page = max(1, page_size)
+    page_count = max(1, -(-len(curr_data) // ln_per_page))
+    page = min(max(page, 1), page_count)
+    display_index = (page - 1) * ln_per_page
+    print_data(curr_data,headers=HEADERS[display],update_status=True,start_index=display_index,apply_filter=False)
+    revise_button["state"] = tk.DISABLED
+    remove_button["state"] = tk.DISABLED
+def page_window():
+    height = 150
+    width =  300
+    popup = tk.Toplevel(window)
+    popup.title("Go to Page")
+    popup.iconbitmap(popup,"icon.ico")
+    popup.minsize(width,height)
+    popup.resizable(False,False)
+    popup.grab_set()
+    popup.focus()
+    popup.geometry("+%d+%d" % 
+        (window.winfo_x()+(window.winfo_width()/2)-(width/2),
+        window.winfo_y()+(window.winfo_height()/2)-(height/2)))
+
+    def apply_page():
+        try:
+            page_size = int(size_entry.get())
+            page = int(page_entry.get())
+        except ValueError:
+            return
+        close_window()
+        go_to_page(page, page_size)
+
+    def close_window():
+        popup.grab_release()
+        popup.destroy()
+
+    mid_frame = tk.LabelFrame(popup,text="")
+    bot_frame = tk.Frame(popup)
+
+    mid_frame.grid(row=0,column=0,sticky="nsew")
+    bot_frame.grid(row=1,column=0,sticky="")
+
+    popup.grid_columnconfigure(0,weight=1)
+    popup.rowconfigure(0,weight=1)
+    mid_frame.grid_columnconfigure(0,weight=1)
+    mid_frame.grid_columnconfigure(1,weight=1)
+    bot_frame.grid_columnconfigure(0,weight=1)
+
+    page_count = max(1, -(-len(curr_data) // ln_per_page))
+    label1 = tk.Label(mid_frame,text=f"Page (1-{page_count})")
+    page_entry = tk.Spinbox(mid_frame,from_=1,to=page_count,width=10)
+    page_entry.delete(0,"end")
+    page_entry.insert(0,str(display_index // ln_per_page + 1))
+    label2 = tk.Label(mid_frame,text="Rows per Page")
+    size_entry = tk.Spinbox(mid_frame,from_=1,to=1000,width=10)
+    size_entry.delete(0,"end")
+    size_entry.insert(0,str(ln_per_page))
+    button_go = tk.Button(bot_frame,text="Go",width=10,command=lambda : apply_page())
+    button_close = tk.Button(bot_frame,text="Cancel",width=10,command=lambda : close_window())
+
+    label1.grid(row=0,column=0,padx=10,pady=5,sticky="e")
+    page_entry.grid(row=0,column=1,padx=10,pady=5,sticky="w")
+    label2.grid(row=1,column=0,padx=10,pady=5,sticky="e")
+    size_entry.grid(row=1,column=1,padx=10,pady=5,sticky="w")
+    button_go.grid(row=0,column=0,padx=5,pady=5)
+    button_close.grid(row=0,column=1,padx=5,pady=5)
+
+    popup.bind("<Return>",lambda event : apply_page())
+    popup.protocol("WM_DELETE_WINDOW", lambda : close_window())
 def export2(current=False,matches=False,games=False,plays=False,drafts=False,picks=False,_csv=False,_excel=False,inverted=False,filtered=False):
     global FILEPATH_EXPORT
     fp = FILEPATH_EXPORT
@@ -1389,18 +1725,18 @@ def export2(current=False,matches=False,games=False,plays=False,drafts=False,pic
             header_list.append(HEADERS[display])
         if display == "Matches":
             if ((HERO != "") & (filtered)):
-                df = pd.DataFrame(ALL_DATA_INVERTED[0],columns=HEADERS[display])
+                df = ALL_DATA_INVERTED.frame("Matches")
                 df = df[(df.P1 == HERO)]
             else:
-                df = pd.DataFrame(ALL_DATA[0],columns=HEADERS[display])
+                df = ALL_DATA.frame("Matches")
         elif display == "Games":
             if ((HERO != "") & (filtered)):
-                df = pd.DataFrame(ALL_DATA_INVERTED[1],columns=HEADERS[display])
+                df = ALL_DATA_INVERTED.frame("Games")
                 df = df[(df.P1 == HERO)]
             else:
-                df = pd.DataFrame(ALL_DATA[1],columns=HEADERS[display])            
+                df = ALL_DATA.frame("Games")            
         elif display == "Plays":
-            df = pd.DataFrame(ALL_DATA[2],columns=HEADERS[display])
+            df = ALL_DATA.frame("Plays")
         elif display == "Drafts":
             df = pd.DataFrame(DRAFTS_TABLE,columns=HEADERS[display])
         elif display == "Picks":
@@ -1410,9 +1746,9 @@ def export2(current=False,matches=False,games=False,plays=False,drafts=False,pic
         file_names.append("Matches")
         header_list.append(HEADERS["Matches"])
         if (inverted) or ((HERO != "") & (filtered)):
-            df = pd.DataFrame(ALL_DATA_INVERTED[0],columns=HEADERS["Matches"])
+            df = ALL_DATA_INVERTED.frame("Matches")
         else:
-            df = pd.DataFrame(ALL_DATA[0],columns=HEADERS["Matches"])
+            df = ALL_DATA.frame("Matches")
         if ((HERO != "") & (filtered)):
             df = df[(df.P1 == HERO)]
         data_to_write.append(df)
@@ -1420,16 +1756,16 @@ def export2(current=False,matches=False,games=False,plays=False,drafts=False,pic
         file_names.append("Games")
         header_list.append(HEADERS["Games"])
         if (inverted) or ((HERO != "") & (filtered)):
-            df = pd.DataFrame(ALL_DATA_INVERTED[1],columns=HEADERS["Games"])
+            df = ALL_DATA_INVERTED.frame("Games")
         else:
-            df = pd.DataFrame(ALL_DATA[1],columns=HEADERS["Games"])
+            df = ALL_DATA.frame("Games")
         if ((HERO != "") & (filtered)):
             df = df[(df.P1 == HERO)]
         data_to_write.append(df)
     if plays:
         file_names.append("Plays")
         header_list.append(HEADERS["Plays"])
-        data_to_write.append(pd.DataFrame(ALL_DATA[2],columns=HEADERS["Plays"]))
+        data_to_write.append(ALL_DATA.frame("Plays"))
     if drafts:
         file_names.append("Drafts")
         header_list.append(HEADERS["Drafts"])
@@ -1440,23 +1776,7 @@ def export2(current=False,matches=False,games=False,plays=False,drafts=False,pic
         data_to_write.append(pd.DataFrame(PICKS_TABLE,columns=HEADERS["Picks"]))
     if filtered:
         for index,table in enumerate(data_to_write):
-            for key in filter_dict:
-                if key not in header_list[index]:
-                    break
-                for i in filter_dict[key]:
-                    if i[2:].isnumeric():
-                        value = int(i[2:])
-                    else:
-                        value = i[2:]
-                    if i[0] == "=":
-                        if key == "Date":
-                            data_to_write[index] = i[(i[key].str.contains(value[0:10]))]
-                        else:
-                            data_to_write[index] = i[(i[key] == value)]
-                    elif i[0] == ">":
-                        data_to_write[index] = i[(i[key] > value)]
-                    elif i[0] == "<":
-                        data_to_write[index] = i[(i[key] < value)]
+            data_to_write[index] = filter_table(table, filter_dict)
     if _csv:
         for index,i in enumerate(file_names):
             file_names[index] += ".csv"
@@ -1529,7 +1849,7 @@ def set_default_hero():
         hero_window.grab_release()
         hero_window.destroy()
     
-    df0_i = pd.DataFrame(ALL_DATA_INVERTED[0],columns=HEADERS["Matches"])
+    df0_i = ALL_DATA_INVERTED.frame("Matches")
     hero_options = df0_i.P1.tolist()
     hero_options = sorted(list(set(hero_options)),key=str.casefold)
 
@@ -1662,6 +1982,7 @@ def set_default_import():
         else:
             FILEPATH_LOGS = label2["text"]
         save_settings()
+        restart_watcher()
         update_status_bar(status="Updated default import folder locations.")
         close_import_window()
         
@@ -1711,22 +2032,27 @@ def sort_column2(col,reverse,tree1):
     # Clear existing data in tree
     tree1.delete(*tree1.get_children())
 
-    if display == "Matches":
-        curr_data.sort_values(by=[col,"Match_ID"],inplace=True,ascending=(reverse,False),key=sort_key)
-    elif display == "Games":
-        curr_data.sort_values(by=[col,"Match_ID","Game_Num"],inplace=True,ascending=(reverse,False,True),key=sort_key)
-    elif display == "Plays":
-        curr_data.sort_values(by=[col,"Match_ID","Game_Num","Play_Num"],inplace=True,ascending=(reverse,False,True,True),key=sort_key)
-    elif display == "Drafts":
-        curr_data.sort_values(by=[col,"Draft_ID"],inplace=True,ascending=(reverse,False),key=sort_key)
-    elif display == "Picks":
-        curr_data.sort_values(by=[col,"Draft_ID","Pick_Ovr"],inplace=True,ascending=(reverse,False,True),key=sort_key)
-
-    df_rows = curr_data.to_numpy().tolist()
+    cache_key = None if curr_data_key is None else curr_data_key + (col, reverse)
+    sorted_data = cached_table(cache_key)
+    if sorted_data is not None:
+        curr_data = sorted_data
+    else:
+        if display == "Matches":
+            curr_data = curr_data.sort_values(by=[col,"Match_ID"],ascending=(reverse,False),key=sort_key)
+        elif display == "Games":
+            curr_data = curr_data.sort_values(by=[col,"Match_ID","Game_Num"],ascending=(reverse,False,True),key=sort_key)
+        elif display == "Plays":
+            curr_data = curr_data.sort_values(by=[col,"Match_ID","Game_Num","Play_Num"],ascending=(reverse,False,True,True),key=sort_key)
+        elif display == "Drafts":
+            curr_data = curr_data.sort_values(by=[col,"Draft_ID"],ascending=(reverse,False),key=sort_key)
+        elif display == "Picks":
+            curr_data = curr_data.sort_values(by=[col,"Draft_ID","Pick_Ovr"],ascending=(reverse,False,True),key=sort_key)
+        if cache_key is not None:
+            cache_table(cache_key, curr_data)
 
     end_index = display_index + ln_per_page
-    if len(df_rows) <= end_index:
-        end_index = len(df_rows)
+    if len(curr_data) <= end_index:
+        end_index = len(curr_data)
         next_button["state"] = tk.DISABLED
     else:
         next_button["state"] = tk.NORMAL
@@ -1736,8 +2062,8 @@ def sort_column2(col,reverse,tree1):
     else:
         back_button["state"] = tk.NORMAL
 
-    for i in range(display_index,end_index):
-        tree1.insert("","end",values=df_rows[i])
+    for row in curr_data.iloc[display_index:end_index].to_numpy().tolist():
+        tree1.insert("","end",values=row)
 
     # Reverse sort next time
     tree1.heading(col,text=col,command=lambda _col=col: sort_column2(_col,not reverse,tree1))
@@ -1926,20 +2252,20 @@ def set_filter():
     # Building dataframe (unfiltered) to give us our dropdown options.
     if HERO == "":
         if display == "Matches":
-            df = pd.DataFrame(ALL_DATA[0],columns=HEADERS[display])
+            df = ALL_DATA.frame("Matches")
         elif display == "Games":
-            df = pd.DataFrame(ALL_DATA[1],columns=HEADERS[display])
+            df = ALL_DATA.frame("Games")
         elif display == "Plays":
-            df = pd.DataFrame(ALL_DATA[2],columns=HEADERS[display])
+            df = ALL_DATA.frame("Plays")
     else:
         if display == "Matches":
-            df = pd.DataFrame(ALL_DATA_INVERTED[0],columns=HEADERS[display])
+            df = ALL_DATA_INVERTED.frame("Matches")
             df = df[(df.P1 == HERO)]
         elif display == "Games":
-            df = pd.DataFrame(ALL_DATA_INVERTED[1],columns=HEADERS[display])
+            df = ALL_DATA_INVERTED.frame("Games")
             df = df[(df.P1 == HERO)]
         elif display == "Plays":
-            df = pd.DataFrame(ALL_DATA_INVERTED[2],columns=HEADERS[display])
+            df = ALL_DATA_INVERTED.frame("Plays")
     if display == "Drafts":
         df = pd.DataFrame(DRAFTS_TABLE,columns=HEADERS[display])
     elif display == "Picks":
@@ -2011,6 +2337,8 @@ def revise_record2():
 
     selected = tree1.focus()
     values = ALL_DATA.get_match(tree1.item(selected,"values")[0])
+    if values is None:
+        return
     sel_matchid = values[0]
 
     p1_index      = HEADERS["Matches"].index("P1")
@@ -2023,39 +2351,35 @@ def revise_record2():
     p2_arch_index = HEADERS["Matches"].index("P2_Arch")
     p2_sub_index =  HEADERS["Matches"].index("P2_Subarch")
 
-    df = pd.DataFrame(ALL_DATA[2],columns=HEADERS["Plays"])
-    df = df[(df.Match_ID == values[0])]
+    land_drops = ALL_DATA.card_sets("Land Drop")
+    casts = ALL_DATA.card_sets("Casts")
     players = [values[p1_index],values[p2_index]]
-    cards1 =  df[(df.Casting_Player == players[0]) & (df.Action == "Land Drop")].Primary_Card.value_counts().keys().tolist()
-    cards2 =  df[(df.Casting_Player == players[0]) & (df.Action == "Casts")].Primary_Card.value_counts().keys().tolist()
-    cards3 =  df[(df.Casting_Player == players[1]) & (df.Action == "Land Drop")].Primary_Card.value_counts().keys().tolist()
-    cards4 =  df[(df.Casting_Player == players[1]) & (df.Action == "Casts")].Primary_Card.value_counts().keys().tolist()
-    cards1 = sorted(cards1,key=str.casefold)
-    cards2 = sorted(cards2,key=str.casefold)
-    cards3 = sorted(cards3,key=str.casefold)
-    cards4 = sorted(cards4,key=str.casefold)
+    cards1 = sorted(land_drops.get((values[0],players[0]),()),key=str.casefold)
+    cards2 = sorted(casts.get((values[0],players[0]),()),key=str.casefold)
+    cards3 = sorted(land_drops.get((values[0],players[1]),()),key=str.casefold)
+    cards4 = sorted(casts.get((values[0],players[1]),()),key=str.casefold)
     revise_entry_window(players,cards1,cards2,cards3,cards4,0,values)
     if (missing_data == "Exit") or (missing_data == "Skip"):
         return
 
-    for i in ALL_DATA[0]:
-        if i[0] == values[0]:
-            if i[p1_index] == values[p1_index]:
-                i[p1_arch_index] = missing_data[0]
-                i[p1_sub_index] =  missing_data[1]
-                i[p2_arch_index] = missing_data[2]
-                i[p2_sub_index] =  missing_data[3]
-            else:
-                i[p1_arch_index] = missing_data[2]
-                i[p1_sub_index] =  missing_data[3]
-                i[p2_arch_index] = missing_data[0]
-                i[p2_sub_index] =  missing_data[1]
-            i[mformat_index] = missing_data[4]
-            i[lformat_index] = missing_data[5]
-            i[mtype_index] =   missing_data[6]  
-            break
-
-    ALL_DATA_INVERTED = modo.invert_join(ALL_DATA)
+    i = ALL_DATA.get_match(values[0])
+    if i is None:
+        return
+    if i[p1_index] == values[p1_index]:
+        i[p1_arch_index] = missing_data[0]
+        i[p1_sub_index] =  missing_data[1]
+        i[p2_arch_index] = missing_data[2]
+        i[p2_sub_index] =  missing_data[3]
+    else:
+        i[p1_arch_index] = missing_data[2]
+        i[p1_sub_index] =  missing_data[3]
+        i[p2_arch_index] = missing_data[0]
+        i[p2_sub_index] =  missing_data[1]
+    i[mformat_index] = missing_data[4]
+    i[lformat_index] = missing_data[5]
+    i[mtype_index] =   missing_data[6]  
+
+    data_changed([sel_matchid])
     set_display("Matches",update_status=True,start_index=display_index,reset=False)
     revise_button["state"] = tk.NORMAL
     remove_button["state"] = tk.NORMAL
@@ -2100,6 +2424,7 @@ def revise_record3():
             i[match_losses_index] = missing_data[1]
             break
 
+    data_changed(draft_ids=[values[0]])
     set_display(display,update_status=True,start_index=display_index,reset=False)
     revise_button["state"] = tk.NORMAL
     remove_button["state"] = tk.NORMAL
@@ -2221,7 +2546,7 @@ def revise_record():
                 match.Format = match_format.get()
                 match.Limited_Format = limited_format.get()
                 match.Match_Type = match_type.get()                   
-                ALL_DATA_INVERTED = modo.invert_join(ALL_DATA)
+                data_changed([match[0]])
                 set_display("Matches",update_status=True,reset=True)
                 break
         revise_window.grab_release()
@@ -2487,7 +2812,7 @@ def revise_record_multi():
         ask_to_save = True
         for i in selected:
             values = list(tree1.item(i,"values"))
-            for index,j in enumerate(itertools.chain(*[ALL_DATA[0],ALL_DATA_INVERTED[0]])):
+            for index,j in enumerate(ALL_DATA[0]):
                 if values[0] == j[0]:
                     if field == "P1 Deck":
                         if values[HEADERS["Matches"].index("P1")] == j[HEADERS["Matches"].index("P1")]:
@@ -2528,6 +2853,7 @@ def revise_record_multi():
                                 j[HEADERS["Matches"].index("P2_Arch")] = "NA"
                     elif field == "Match Type":
                         j[HEADERS["Matches"].index("Match_Type")] = match_type.get() 
+        data_changed([tree1.item(i,"values")[0] for i in selected])
         set_display("Matches",update_status=True,start_index=display_index,reset=False)
         revise_button["state"] = tk.NORMAL
         remove_button["state"] = tk.NORMAL
@@ -2686,74 +3012,17 @@ def import_window():
             button3["state"] = tk.NORMAL
 
     def import_data(overwrite):
-        global ALL_DATA
-        global ALL_DATA_INVERTED
-        global DRAFTS_TABLE
         global FILEPATH_LOGS
         global FILEPATH_DRAFTS
-        global HERO
 
         FILEPATH_DRAFTS = label1["text"]
         FILEPATH_LOGS = label2["text"]
+        close_import_window()
 
         if overwrite:
-            h = HERO
-            match_dict = user_inputs(type="Matches")
-            game_dict = user_inputs(type="Games")
-            clear_loaded()
-            get_all_data(logs_path=FILEPATH_LOGS_COPY,drafts_path=FILEPATH_DRAFTS_COPY,copy=False)
-            for match in ALL_DATA.matches:
-                try:
-                    match.Draft_ID = match_dict[match[0]][1]
-                    match.P1_Subarch = match_dict[match[0]][0][match.P1][1]
-                    match.P1_Arch = match_dict[match[0]][0][match.P1][0]
-                    match.P2_Arch = match_dict[match[0]][0][match.P2][0]
-                    match.P2_Subarch = match_dict[match[0]][0][match.P2][1]
-                    match.Format = match_dict[match[0]][2]
-                    match.Limited_Format = match_dict[match[0]][3]
-                    match.Match_Type = match_dict[match[0]][4]
-                # Found new Match for which we don't have user inputs.
-                except KeyError:
-                    pass
-            for i in ALL_DATA[1]:
-                key = i[0] + "-" + str(i[HEADERS["Games"].index("Game_Num")])
-                try:
-                    if (i[HEADERS["Games"].index("P1")] == game_dict[key][0]):
-                        i[HEADERS["Games"].index("Game_Winner")] = game_dict[key][2]
-                # Found new Game for which we don't have user inputs.
-                except KeyError:
-                    pass
-                # Delete RawData for Games that have a manually entered Game_Winner.
-                if key in ALL_DATA[3]:
-                    if i[HEADERS["Games"].index("Game_Winner")] != "NA":
-                        ALL_DATA[3].pop(key)
-            HERO = h
-            if HERO != "":
-                stats_button["state"] = tk.NORMAL
-            modo.update_game_wins(ALL_DATA,TIMEOUT)
-
-            ALL_DATA_INVERTED = modo.invert_join(ALL_DATA)
-
-            df_inverted = pd.DataFrame(ALL_DATA_INVERTED[0],columns=HEADERS["Matches"])
-            for i in DRAFTS_TABLE:
-                wins = df_inverted[(df_inverted.Draft_ID == i[0]) & (df_inverted.P1 == i[HEADERS["Drafts"].index("Hero")]) & (df_inverted.Match_Winner == "P1")].shape[0]
-                losses = df_inverted[(df_inverted.Draft_ID == i[0]) & (df_inverted.P1 == i[HEADERS["Drafts"].index("Hero")]) & (df_inverted.Match_Winner == "P2")].shape[0]
-                i[HEADERS["Drafts"].index("Match_Wins")] = wins
-                i[HEADERS["Drafts"].index("Match_Losses")] = losses
+            import_logs(logs_path=FILEPATH_LOGS_COPY,drafts_path=FILEPATH_DRAFTS_COPY,copy=False,overwrite=True)
         else:
-            get_all_data(logs_path=FILEPATH_LOGS,drafts_path=FILEPATH_DRAFTS,copy=True)
-        clear_filter(update_status=False,reload_display=False)
-        if data_loaded != False:
-            data_menu.entryconfig("Set Default Hero",state=tk.NORMAL)
-            file_menu.entryconfig("Save Data",state=tk.NORMAL)
-            data_menu.entryconfig("Clear Loaded Data",state=tk.NORMAL)
-            data_menu.entryconfig("Input Missing Match Data",state=tk.NORMAL)
-            data_menu.entryconfig("Input Missing Game_Winner Data",state=tk.NORMAL)
-            data_menu.entryconfig("Apply Best Guess for Deck Names",state=tk.NORMAL)
-            data_menu.entryconfig("Apply Associated Draft_IDs to Limited Matches",state=tk.NORMAL)
-        #save_settings()
-        set_display("Matches",update_status=False,reset=True)
-        close_import_window()
+            import_logs(logs_path=FILEPATH_LOGS,drafts_path=FILEPATH_DRAFTS,copy=True)
 
     def close_import_window():
         import_window.grab_release()
@@ -2803,58 +3072,65 @@ def get_winners():
     global user_entered_winner
     global ask_to_save
 
-    changed = 0
-    total = 0
-    exit = False
-    raw_dict_new = {}
-    for index,key in enumerate(ALL_DATA.raw_game_data):
-        match_id = key.rsplit("-",1)[0]
-        game_num = key.rsplit("-",1)[1]
-        if not exit:
-            for game in ALL_DATA.games:
-                if (game.Match_ID == match_id) & (str(game.Game_Num) == game_num) & (game.Game_Winner == "NA"):
-                    ask_for_winner(ALL_DATA.raw_game_data[key],game.P1,game.P2,index+1,len(ALL_DATA.raw_game_data))
-                    total += 1
-                    if user_entered_winner == "Exit.":
-                        exit = True
-                        raw_dict_new[key] = ALL_DATA.raw_game_data[key]
-                    elif user_entered_winner == "NA":
-                        raw_dict_new[key] = ALL_DATA.raw_game_data[key]
-                    else:
-                        game.Game_Winner = user_entered_winner
-                        changed += 1
-                    break
-        if exit:
-            raw_dict_new[key] = ALL_DATA.raw_game_data[key]
-
-    if len(ALL_DATA.raw_game_data) > len(raw_dict_new):
-        ALL_DATA.raw_game_data = raw_dict_new
+    # Games without a Game_Winner, raw data of other games is dropped below.
+    unresolved = []
+    for key in ALL_DATA.raw_game_data:
+        match_id, game_num = key.rsplit("-",1)
+        game = ALL_DATA.get_game(match_id,game_num)
+        if (game is not None) and (game.Game_Winner == "NA"):
+            unresolved.append((key,game))
+
+    changed_matches = set()
+    resolved = set()
+    # Set the Game_Winners that can be inferred, ask for the rest.
+    inferred = modo.infer_winners(ALL_DATA)
+    to_ask = []
+    for (key,game) in unresolved:
+        winner, confidence = inferred.get(key,("NA",0.0))
+        if (winner != "NA") and (confidence >= AUTO_WINNER_CONFIDENCE):
+            game.Game_Winner = winner
+            changed_matches.add(game.Match_ID)
+            resolved.add(key)
+        else:
+            to_ask.append((key,game))
+    auto_resolved = len(resolved)
+    for index,(key,game) in enumerate(to_ask):
+        ask_for_winner(ALL_DATA.raw_game_data[key],game.P1,game.P2,index+1,len(to_ask),
+            guess=inferred.get(key))
+        if user_entered_winner == "Exit.":
+            break
+        elif user_entered_winner != "NA":
+            game.Game_Winner = user_entered_winner
+            changed_matches.add(game.Match_ID)
+            resolved.add(key)
+    changed = len(resolved)
+    keep = {key for (key,game) in unresolved} - resolved
+    stale = [key for key in ALL_DATA.raw_game_data if key not in keep]
+
+    if len(stale) > 0:
+        for key in stale:
+            del ALL_DATA.raw_game_data[key]
         # only game wins got updated above, now need to apply to matches
-        modo.update_game_wins(ALL_DATA,TIMEOUT)
-        ALL_DATA_INVERTED = modo.invert_join(ALL_DATA)
-
-        df_inverted = pd.DataFrame(ALL_DATA_INVERTED[0],columns=HEADERS["Matches"])
-        hero_index = HEADERS["Drafts"].index("Hero")
-        for draft in DRAFTS_TABLE:
-            wins = df_inverted[(df_inverted.Draft_ID == draft[0]) & (df_inverted.P1 == draft[hero_index]) & (df_inverted.Match_Winner == "P1")].shape[0]
-            losses = df_inverted[(df_inverted.Draft_ID == draft[0]) & (df_inverted.P1 == draft[hero_index]) & (df_inverted.Match_Winner == "P2")].shape[0]
-            draft[HEADERS["Drafts"].index("Match_Wins")] = wins
-            draft[HEADERS["Drafts"].index("Match_Losses")] = losses
+        modo.update_game_wins(ALL_DATA,TIMEOUT,changed_matches)
+        changed_drafts = {match.Draft_ID for match in map(ALL_DATA.get_match,changed_matches) if match is not None}
+        modo.update_draft_wins(ALL_DATA,DRAFTS_TABLE,changed_drafts)
+        data_changed(changed_matches,changed_drafts)
 
         ask_to_save = True
 
-    if not total:
+    if not unresolved:
         update_status_bar(status="No Applicable Games found.")
     else:
-        update_status_bar(status=f"Game_Winner updated for {changed} Game{'' if changed == 1 else 's'}.")
+        update_status_bar(status=f"Game_Winner updated for {changed} Game{'' if changed == 1 else 's'}, {auto_resolved} inferred.")
     set_display("Matches",update_status=False,reset=True)
 
-def ask_for_winner(ga_list,p1,p2,n,total):
+def ask_for_winner(ga_list,p1,p2,n,total,guess=None):
     # List of game actions (Strings)
     # String = P1
     # String = P2
     # Int = Count in cycle
     # Int = Total number of games missing Game_Winner
+    # Tuple = (Winner, Confidence) from modo.infer_winner or None
 
     def close_gw_window(winner):
         global user_entered_winner
@@ -2878,6 +3154,8 @@ def ask_for_winner(ga_list,p1,p2,n,total):
                  window.winfo_y()+(window.winfo_height()/2)-(height/2)))
 
     message = "Winner could not be determined.\nPlease select Game Winner."
+    if guess and guess[0] != "NA":
+        message += f"\nBest guess: {p1 if guess[0] == 'P1' else p2} ({guess[1]:.0%} confidence)."
     all_ga =  ""
     for i in ga_list[-15:]:
         all_ga += i + "\n"
@@ -3071,12 +3349,12 @@ def get_stats():
     mid_frame.grid_columnconfigure(0,weight=1)
     mid_frame.grid_columnconfigure(1,weight=1)
     
-    df_matches = pd.DataFrame(ALL_DATA[0],columns=HEADERS["Matches"])
-    df_games = pd.DataFrame(ALL_DATA[1],columns=HEADERS["Games"])
-    df_plays = pd.DataFrame(ALL_DATA[2],columns=HEADERS["Plays"])
-    df_matches_inverted = pd.DataFrame(ALL_DATA_INVERTED[0],columns=HEADERS["Matches"])
-    df_games_inverted = pd.DataFrame(ALL_DATA_INVERTED[1],columns=HEADERS["Games"])
-    df_plays_inverted = pd.DataFrame(ALL_DATA_INVERTED[2],columns=HEADERS["Plays"])
+    df_matches = ALL_DATA.frame("Matches")
+    df_games = ALL_DATA.frame("Games")
+    df_plays = ALL_DATA.frame("Plays")
+    df_matches_inverted = ALL_DATA_INVERTED.frame("Matches")
+    df_games_inverted = ALL_DATA_INVERTED.frame("Games")
+    df_plays_inverted = ALL_DATA_INVERTED.frame("Plays")
 
     def clear_frames():
         frames = [mid_frame1, mid_frame2, mid_frame3, mid_frame4, mid_frame5, 
@@ -4311,6 +4589,8 @@ def get_stats():
     stats_window.protocol("WM_DELETE_WINDOW", lambda : close_stats_window())
 
 def exit_select():
+    if import_thread is not None:
+        import_thread.cancel()
     if ask_to_save:
         save_window(exit=True)
     else:
@@ -4351,20 +4631,13 @@ def remove_record(ignore):
         return
 
     # Get Match/Draft_IDs of selected records.
-    sel_matchid = []
+    sel_matchid = set()
     for i in selected:
-        sel_matchid.append(list(tree1.item(i,"values"))[0])
+        sel_matchid.add(list(tree1.item(i,"values"))[0])
 
     # Remove records from table data and get table size differences.
     if display == "Matches":
-        precounts = [len(ALL_DATA[0]),len(ALL_DATA[1]),len(ALL_DATA[2])]
-        ALL_DATA[0] = [i for i in ALL_DATA[0] if i[0] not in sel_matchid]
-        ALL_DATA[1] = [i for i in ALL_DATA[1] if i[0] not in sel_matchid]
-        ALL_DATA[2] = [i for i in ALL_DATA[2] if i[0] not in sel_matchid]
-        ALL_DATA_INVERTED[0] = [i for i in ALL_DATA_INVERTED[0] if i[0] not in sel_matchid]
-        ALL_DATA_INVERTED[1] = [i for i in ALL_DATA_INVERTED[1] if i[0] not in sel_matchid]
-        ALL_DATA_INVERTED[2] = [i for i in ALL_DATA_INVERTED[2] if i[0] not in sel_matchid]
-        counts = [precounts[0]-len(ALL_DATA[0]),precounts[1]-len(ALL_DATA[1]),precounts[2]-len(ALL_DATA[2])]
+        counts = ALL_DATA.remove_matches(sel_matchid)
     elif display == "Drafts":
         precounts = [len(DRAFTS_TABLE),len(PICKS_TABLE)]
         DRAFTS_TABLE = [i for i in DRAFTS_TABLE if i[0] not in sel_matchid]
@@ -4374,19 +4647,16 @@ def remove_record(ignore):
     # Remove GameLog filename from list of previously parsed files.
     if not ignore:
         if display == "Matches":
-            for i in sel_matchid:
-                for j in PARSED_FILE_DICT:
-                    if PARSED_FILE_DICT[j][0] in sel_matchid:
-                        PARSED_FILE_DICT.pop(j)
-                        break
+            PARSED_FILE_DICT.remove_matches(sel_matchid)
         elif display == "Drafts":
-            for i in sel_matchid:
-                for j in PARSED_DRAFT_DICT:
-                    if PARSED_DRAFT_DICT[j] in sel_matchid:
-                        PARSED_DRAFT_DICT.pop(j)
-                        break
+            for j in [j for j in PARSED_DRAFT_DICT if PARSED_DRAFT_DICT[j] in sel_matchid]:
+                PARSED_DRAFT_DICT.pop(j)
 
     ask_to_save = True
+    if display == "Matches":
+        data_changed(sel_matchid)
+    else:
+        data_changed(draft_ids=sel_matchid)
     set_display(display,update_status=False,reset=True)
     if display == "Matches":
         if len(selected) == 1:
@@ -4474,20 +4744,11 @@ def get_associated_draftid(mode):
     global DRAFTS_TABLE
 
     draftid_index = HEADERS["Matches"].index("Draft_ID")
-    hero_index = HEADERS["Drafts"].index("Hero")
     count = 0
 
-    df_matches = pd.DataFrame(ALL_DATA[0],columns=HEADERS["Matches"])
-    df_plays = pd.DataFrame(ALL_DATA[2],columns=HEADERS["Plays"])
-    df_drafts = pd.DataFrame(DRAFTS_TABLE,columns=HEADERS["Drafts"])
-    df_picks = pd.DataFrame(PICKS_TABLE,columns=HEADERS["Picks"])
-
-    all_drafts = df_drafts.Draft_ID.tolist()
-    draft_picks_dict = {}
-    for i in all_drafts:
-        hero = df_drafts[(df_drafts.Draft_ID == i)].Hero.tolist()[0]
-        date = df_drafts[(df_drafts.Draft_ID == i)].Date.tolist()[0]
-        draft_picks_dict[i] = (hero,date,set(df_picks[(df_picks.Draft_ID == i)].Card.unique()))
+    df_matches = ALL_DATA.frame("Matches")
+    casts = ALL_DATA.card_sets("Casts")
+    draft_index = DraftIndex(DRAFTS_TABLE,PICKS_TABLE)
 
     df_matches = df_matches[df_matches.Limited_Format.isin(INPUT_OPTIONS["Cube Formats"] + INPUT_OPTIONS["Booster Draft Formats"])]
     if mode == "NA":    
@@ -4496,28 +4757,25 @@ def get_associated_draftid(mode):
 
     list_to_process = []
     for i in limited_matches:
-        acceptable = []
         cards_dict = {}
-        p1 = df_matches[(df_matches.Match_ID == i)].P1.tolist()[0]
-        p2 = df_matches[(df_matches.Match_ID == i)].P2.tolist()[0]
-        match_date = df_matches[(df_matches.Match_ID == i)].Date.tolist()[0]
-        df = df_plays[(df_plays.Match_ID == i)]
-        cards1 =  set(df[(df.Casting_Player == p1) & (df.Action == "Casts")].Primary_Card.unique())
-        cards2 =  set(df[(df.Casting_Player == p2) & (df.Action == "Casts")].Primary_Card.unique())
+        match = ALL_DATA.get_match(i)
+        if match is None:
+            continue
+        p1 = match.P1
+        p2 = match.P2
+        match_date = match.Date
+        cards1 =  set(casts.get((i,p1),()))
+        cards2 =  set(casts.get((i,p2),()))
         cards1 = modo.clean_card_set(cards1)
         cards2 = modo.clean_card_set(cards2)
         cards_dict[p1] = cards1
         cards_dict[p2] = cards2
-        for key in draft_picks_dict:
-            if draft_picks_dict[key][0] in cards_dict:
-                subset = cards_dict[draft_picks_dict[key][0]]
-                fullset = draft_picks_dict[key][2]
-                if (subset.issubset(fullset)) & (match_date > draft_picks_dict[key][1]):
-                    acceptable.append(key)
+        acceptable = draft_index.acceptable(cards_dict,match_date)
         if len(acceptable) > 0:
             list_to_process.append([p1,p2,cards1,cards2,acceptable,i,match_date])
 
     if len(list_to_process) > 0:
+        changed_drafts = set()
         for index,i in enumerate(list_to_process):
             associated_draftid_window(i,index=index+1,total=len(list_to_process))
             if (missing_data == "Exit"):
@@ -4525,19 +4783,14 @@ def get_associated_draftid(mode):
             elif (missing_data == "Skip"):
                 continue
             else:
+                match = ALL_DATA.get_match(i[5])
+                if match is None:
+                    continue
                 count += 1
-                for match in ALL_DATA[0]:
-                    if match[0] == i[5]:
-                        match[draftid_index] = missing_data
-                        break
-        ALL_DATA_INVERTED = modo.invert_join(ALL_DATA)
-
-        df_inverted = pd.DataFrame(ALL_DATA_INVERTED[0],columns=HEADERS["Matches"])
-        for i in DRAFTS_TABLE:
-            wins = df_inverted[(df_inverted.Draft_ID == i[0]) & (df_inverted.P1 == i[hero_index]) & (df_inverted.Match_Winner == "P1")].shape[0]
-            losses = df_inverted[(df_inverted.Draft_ID == i[0]) & (df_inverted.P1 == i[hero_index]) & (df_inverted.Match_Winner == "P2")].shape[0]
-            i[HEADERS["Drafts"].index("Match_Wins")] = wins
-            i[HEADERS["Drafts"].index("Match_Losses")] = losses
+                changed_drafts.update((match[draftid_index],missing_data))
+                match[draftid_index] = missing_data
+        modo.update_draft_wins(ALL_DATA,DRAFTS_TABLE,changed_drafts)
+        data_changed([i[5] for i in list_to_process],changed_drafts)
 
         if count == 1:
             update_status_bar(f"Draft_ID applied to {count} Match.")
@@ -4742,177 +4995,193 @@ def test():
     # Test function
     pass
 
-window = tk.Tk() 
-window.title("MTGO-Tracker")
-window.iconbitmap(window,"icon.ico")
-
-load_window_size_setting()
-window.geometry(f"{MAIN_WINDOW_SIZE[1]}x{MAIN_WINDOW_SIZE[2]}")
-window.resizable(False,False)
-
-window.rowconfigure(0,weight=1)
-window.columnconfigure(1,weight=1)
-
-bottom_frame = tk.LabelFrame(window)
-left_frame = tk.Frame(window)
-text_frame = tk.LabelFrame(window,text="Dataframe")
-bottom_frame.grid(row=1,column=1,sticky="ew")
-left_frame.grid(row=0,column=0,sticky="ns")
-text_frame.grid(row=0,column=1,sticky="nsew")
-
-text_frame.grid_columnconfigure(0,weight=1)
-text_frame.grid_columnconfigure(1,weight=0)
-text_frame.grid_rowconfigure(0,weight=1)
-text_frame.grid_rowconfigure(1,weight=0)
-bottom_frame.grid_columnconfigure(0,weight=1)
-
-# START buttons on the left side of the gui 
-match_button = tk.Button(left_frame,text="Matches",state=tk.DISABLED,
-    command=lambda : set_display("Matches",update_status=True,reset=True))
-game_button = tk.Button(left_frame,text="Games",state=tk.DISABLED,
-    command=lambda : set_display("Games",update_status=True,reset=True))
-play_button = tk.Button(left_frame,text="Plays",state=tk.DISABLED,
-    command=lambda : set_display("Plays",update_status=True,reset=True))
-draft_button = tk.Button(left_frame,text="Drafts",state=tk.DISABLED,
-    command=lambda : set_display("Drafts",update_status=True,reset=True))
-pick_button = tk.Button(left_frame,text="Draft Picks",state=tk.DISABLED,
-    command=lambda : set_display("Picks",update_status=True,reset=True))
-stats_button = tk.Button(left_frame,text="Statistics",state=tk.DISABLED,
-    command=lambda : get_stats())
-filter_button = tk.Button(left_frame,text="Filter",state=tk.DISABLED,
-    command=lambda : set_filter())
-clear_button = tk.Button(left_frame,text="Clear Filter",state=tk.DISABLED,\
-    command=lambda : clear_filter(update_status=True,reload_display=True))
-revise_button = tk.Button(left_frame,text="Revise Record(s)",
-    state=tk.DISABLED,command=lambda : revise_method_select())
-remove_button = tk.Button(left_frame,text="Remove Record(s)",
-    state=tk.DISABLED,command=lambda : remove_select())
-next_button = tk.Button(left_frame,text="Next",state=tk.DISABLED,
-    command=lambda : next_page())
-back_button = tk.Button(left_frame,text="Back",state=tk.DISABLED,
-    command=lambda : back())
-# END buttons on the left side of the gui
-
-status_label = tk.Label(bottom_frame,text="")
-status_label.grid(row=0,column=0)
-
-# START menu bar entries
-menu_bar = tk.Menu(window)
-
-file_menu = tk.Menu(menu_bar,tearoff=False)
-menu_bar.add_cascade(label="File",menu=file_menu)
-
-file_menu.add_command(label="Import MTGO GameLogs",command=lambda : import_window())
-file_menu.add_separator()
-file_menu.add_command(label="Load Saved Data",command=lambda : load_saved_window())
-file_menu.add_command(label="Save Data",command=lambda : save_window(exit=False),state=tk.DISABLED)
-file_menu.add_separator()
-file_menu.add_command(label="Set Main Window Size",command=lambda : set_default_window_size())
-file_menu.add_separator()
-file_menu.add_command(label="Exit",command=lambda : exit_select())
-
-export_menu = tk.Menu(menu_bar,tearoff=False)
-menu_bar.add_cascade(label="Export",menu=export_menu)
-
-export_csv = tk.Menu(export_menu,tearoff=False)
-export_csv.add_command(label="Match History",command=lambda : export2(matches=True,_csv=True))
-export_csv.add_command(label="Game History",command=lambda : export2(games=True,_csv=True))
-export_csv.add_command(label="Play History",command=lambda : export2(plays=True,_csv=True))
-export_csv.add_command(label="Draft History",command=lambda : export2(drafts=True,_csv=True))
-export_csv.add_command(label="Draft Pick History",command=lambda : export2(picks=True,_csv=True))
-export_csv.add_command(label="All Data (5 Files)",
-    command=lambda : export2(matches=True,games=True,plays=True,drafts=True,picks=True,_csv=True))
-export_csv.add_separator()
-export_csv.add_command(label="Match History (Inverse Join)",command=lambda : export2(matches=True,_csv=True,inverted=True))
-export_csv.add_command(label="Game History (Inverse Join)",command=lambda : export2(games=True,_csv=True,inverted=True))
-export_csv.add_command(label="All Data (Inverse Join, 5 Files)",
-    command=lambda : export2(matches=True,games=True,plays=True,drafts=True,picks=True,_csv=True,inverted=True))
-export_csv.add_separator()
-export_csv.add_command(label="Currently Displayed Data (with Filters)",command=lambda : export2(current=True,_csv=True,filtered=True))
-
-export_excel = tk.Menu(export_menu,tearoff=False)
-export_excel.add_command(label="Match History",command=lambda : export2(matches=True,_excel=True))
-export_excel.add_command(label="Game History",command=lambda : export2(games=True,_excel=True))
-export_excel.add_command(label="Play History",command=lambda : export2(plays=True,_excel=True))
-export_excel.add_command(label="Draft History",command=lambda : export2(drafts=True,_excel=True))
-export_excel.add_command(label="Draft Pick History",command=lambda : export2(picks=True,_excel=True))
-export_excel.add_command(label="All Data (5 Files)",
-    command=lambda : export2(matches=True,games=True,plays=True,drafts=True,picks=True,_excel=True))
-export_excel.add_separator()
-export_excel.add_command(label="Match History (Inverse Join)",command=lambda : export2(matches=True,_excel=True,inverted=True))
-export_excel.add_command(label="Game History (Inverse Join)",command=lambda : export2(games=True,_excel=True,inverted=True))
-export_excel.add_command(label="All Data (Inverse Join, 5 Files)",
-    command=lambda : export2(matches=True,games=True,plays=True,drafts=True,picks=True,_excel=True,inverted=True))
-export_excel.add_separator()
-export_excel.add_command(label="Currently Displayed Table (with Filters)",command=lambda : export2(current=True,_excel=True,filtered=True))
-
-export_menu.add_cascade(label="Export to CSV",menu=export_csv)
-export_menu.add_cascade(label="Export to Excel",menu=export_excel)
-export_menu.add_separator()
-export_menu.add_command(label="Set Default Export Folder",command=lambda : set_default_export())
-
-data_menu = tk.Menu(menu_bar,tearoff=False)
-menu_bar.add_cascade(label="Data",menu=data_menu)
-
-data_menu.add_command(label="Input Missing Match Data",command=lambda : input_missing_data(),state=tk.DISABLED)
-data_menu.add_command(label="Input Missing Game_Winner Data",command=lambda : get_winners(),state=tk.DISABLED)
-data_menu.add_command(label="Apply Best Guess for Deck Names",command=lambda : rerun_decks_window(),state=tk.DISABLED)
-data_menu.add_separator()
-data_menu.add_command(label="Apply Associated Draft_IDs to Limited Matches",command=lambda : get_associated_draftid_pre(),state=tk.DISABLED)
-data_menu.add_separator()
-data_menu.add_command(label="Set Default Hero",command=lambda : set_default_hero(),state=tk.DISABLED)
-data_menu.add_command(label="Set Default Import Folders",command=lambda : set_default_import())
-data_menu.add_separator()
-data_menu.add_command(label="Clear Loaded Data",command=lambda : clear_window(),state=tk.DISABLED)
-data_menu.add_command(label="Delete Saved Session",command=lambda : delete_session())
-# END menu bar entries
-
-if test_mode:
-    test_menu = tk.Menu(menu_bar,tearoff=False)
-    menu_bar.add_cascade(label="Test",menu=test_menu)
-    test_menu.add_command(label="Create Debug Log",command=lambda : debug())
-    test_menu.add_command(label="Test Function",command=lambda : test())
-
-window.config(menu=menu_bar)
-
-match_button.grid(row=1,column=0,sticky="ew",padx=5,pady=(15,5))
-game_button.grid(row=2,column=0,sticky="ew",padx=5,pady=(0,5))
-play_button.grid(row=3,column=0,sticky="ew",padx=5,pady=(0,5))
-draft_button.grid(row=4,column=0,sticky="ew",padx=5,pady=(0,5))
-pick_button.grid(row=5,column=0,sticky="ew",padx=5,pady=(0,5))
-stats_button.grid(row=6,column=0,sticky="ew",padx=5,pady=(20,5))
-filter_button.grid(row=7,column=0,sticky="ew",padx=5,pady=(20,5))
-clear_button.grid(row=8,column=0,sticky="ew",padx=5,pady=(0,5))
-revise_button.grid(row=9,column=0,sticky="ew",padx=5,pady=(20,5))
-remove_button.grid(row=10,column=0,sticky="ew",padx=5,pady=(0,5))
-next_button.grid(row=11,column=0,sticky="ew",padx=5,pady=(20,5))
-back_button.grid(row=12,column=0,sticky="ew",padx=5,pady=(0,5))
-
-tree1 = ttk.Treeview(text_frame,show="headings")
-tree1.grid(row=0,column=0,sticky="nsew")
-tree1.bind("<Double-1>",tree_double)
-tree1.bind("<ButtonRelease-1>",activate_revise)
-
-# tree_scrolly = tk.Scrollbar(text_frame,command=tree1.yview)
-# tree1.configure(yscrollcommand=tree_scrolly.set)
-# tree_scrolly.grid(row=0,column=1,sticky="ns")
-
-tree_scrollx = tk.Scrollbar(text_frame,orient="horizontal",command=tree1.xview)
-tree1.configure(xscrollcommand=tree_scrollx.set)
-tree_scrollx.grid(row=1,column=0,sticky="ew")
-
-s = ttk.Style()
-s.theme_use("default")
-s.configure("Treeview",
-            background='white',
-            fieldbackground='white')
-s.map("Treeview",
-    background=[("selected","#4a6984")],
-    foreground=[("selected","#ffffff")])
-
-startup()
-window.protocol("WM_DELETE_WINDOW", lambda : exit_select())
-
-# Event loop: listens for events (keypress, etc.)
-# Blocks code after from running until window is closed.
-window.mainloop()
\ No newline at end of file
+# Command line use (python -m mtgo_tracker ingest ...) never creates a Tk root.
+if __name__ == "__main__" and len(sys.argv) > 1:
+    sys.exit(importer.main(sys.argv[1:]))
+
+# Only build the GUI when run as a script. Worker processes started by
+# the GameLog importer import this module and must not open a window.
+if __name__ == "__main__":
+    window = tk.Tk() 
+    window.title("MTGO-Tracker")
+    window.iconbitmap(window,"icon.ico")
+
+    load_window_size_setting()
+    window.geometry(f"{MAIN_WINDOW_SIZE[1]}x{MAIN_WINDOW_SIZE[2]}")
+    window.resizable(False,False)
+
+    window.rowconfigure(0,weight=1)
+    window.columnconfigure(1,weight=1)
+
+    bottom_frame = tk.LabelFrame(window)
+    left_frame = tk.Frame(window)
+    text_frame = tk.LabelFrame(window,text="Dataframe")
+    bottom_frame.grid(row=1,column=1,sticky="ew")
+    left_frame.grid(row=0,column=0,sticky="ns")
+    text_frame.grid(row=0,column=1,sticky="nsew")
+
+    text_frame.grid_columnconfigure(0,weight=1)
+    text_frame.grid_columnconfigure(1,weight=0)
+    text_frame.grid_rowconfigure(0,weight=1)
+    text_frame.grid_rowconfigure(1,weight=0)
+    bottom_frame.grid_columnconfigure(0,weight=1)
+
+    # START buttons on the left side of the gui 
+    match_button = tk.Button(left_frame,text="Matches",state=tk.DISABLED,
+        command=lambda : set_display("Matches",update_status=True,reset=True))
+    game_button = tk.Button(left_frame,text="Games",state=tk.DISABLED,
+        command=lambda : set_display("Games",update_status=True,reset=True))
+    play_button = tk.Button(left_frame,text="Plays",state=tk.DISABLED,
+        command=lambda : set_display("Plays",update_status=True,reset=True))
+    draft_button = tk.Button(left_frame,text="Drafts",state=tk.DISABLED,
+        command=lambda : set_display("Drafts",update_status=True,reset=True))
+    pick_button = tk.Button(left_frame,text="Draft Picks",state=tk.DISABLED,
+        command=lambda : set_display("Picks",update_status=True,reset=True))
+    stats_button = tk.Button(left_frame,text="Statistics",state=tk.DISABLED,
+        command=lambda : get_stats())
+    filter_button = tk.Button(left_frame,text="Filter",state=tk.DISABLED,
+        command=lambda : set_filter())
+    clear_button = tk.Button(left_frame,text="Clear Filter",state=tk.DISABLED,\
+        command=lambda : clear_filter(update_status=True,reload_display=True))
+    revise_button = tk.Button(left_frame,text="Revise Record(s)",
+        state=tk.DISABLED,command=lambda : revise_method_select())
+    remove_button = tk.Button(left_frame,text="Remove Record(s)",
+        state=tk.DISABLED,command=lambda : remove_select())
+    next_button = tk.Button(left_frame,text="Next",state=tk.DISABLED,
+        command=lambda : next_page())
+    back_button = tk.Button(left_frame,text="Back",state=tk.DISABLED,
+        command=lambda : back())
+    page_button = tk.Button(left_frame,text="Go to Page",state=tk.DISABLED,
+        command=lambda : page_window())
+    # END buttons on the left side of the gui
+
+    status_label = tk.Label(bottom_frame,text="")
+    status_label.grid(row=0,column=0)
+
+    # START menu bar entries
+    menu_bar = tk.Menu(window)
+
+    file_menu = tk.Menu(menu_bar,tearoff=False)
+    menu_bar.add_cascade(label="File",menu=file_menu)
+
+    file_menu.add_command(label="Import MTGO GameLogs",command=lambda : import_window())
+    file_menu.add_separator()
+    file_menu.add_command(label="Load Saved Data",command=lambda : load_saved_window())
+    file_menu.add_command(label="Save Data",command=lambda : save_window(exit=False),state=tk.DISABLED)
+    file_menu.add_separator()
+    watch_folders = tk.BooleanVar(value=WATCH_IMPORT_FOLDERS)
+    file_menu.add_checkbutton(label="Watch Import Folders",variable=watch_folders,
+        command=lambda : toggle_watcher())
+    file_menu.add_separator()
+    file_menu.add_command(label="Set Main Window Size",command=lambda : set_default_window_size())
+    file_menu.add_separator()
+    file_menu.add_command(label="Exit",command=lambda : exit_select())
+
+    export_menu = tk.Menu(menu_bar,tearoff=False)
+    menu_bar.add_cascade(label="Export",menu=export_menu)
+
+    export_csv = tk.Menu(export_menu,tearoff=False)
+    export_csv.add_command(label="Match History",command=lambda : export2(matches=True,_csv=True))
+    export_csv.add_command(label="Game History",command=lambda : export2(games=True,_csv=True))
+    export_csv.add_command(label="Play History",command=lambda : export2(plays=True,_csv=True))
+    export_csv.add_command(label="Draft History",command=lambda : export2(drafts=True,_csv=True))
+    export_csv.add_command(label="Draft Pick History",command=lambda : export2(picks=True,_csv=True))
+    export_csv.add_command(label="All Data (5 Files)",
+        command=lambda : export2(matches=True,games=True,plays=True,drafts=True,picks=True,_csv=True))
+    export_csv.add_separator()
+    export_csv.add_command(label="Match History (Inverse Join)",command=lambda : export2(matches=True,_csv=True,inverted=True))
+    export_csv.add_command(label="Game History (Inverse Join)",command=lambda : export2(games=True,_csv=True,inverted=True))
+    export_csv.add_command(label="All Data (Inverse Join, 5 Files)",
+        command=lambda : export2(matches=True,games=True,plays=True,drafts=True,picks=True,_csv=True,inverted=True))
+    export_csv.add_separator()
+    export_csv.add_command(label="Currently Displayed Data (with Filters)",command=lambda : export2(current=True,_csv=True,filtered=True))
+
+    export_excel = tk.Menu(export_menu,tearoff=False)
+    export_excel.add_command(label="Match History",command=lambda : export2(matches=True,_excel=True))
+    export_excel.add_command(label="Game History",command=lambda : export2(games=True,_excel=True))
+    export_excel.add_command(label="Play History",command=lambda : export2(plays=True,_excel=True))
+    export_excel.add_command(label="Draft History",command=lambda : export2(drafts=True,_excel=True))
+    export_excel.add_command(label="Draft Pick History",command=lambda : export2(picks=True,_excel=True))
+    export_excel.add_command(label="All Data (5 Files)",
+        command=lambda : export2(matches=True,games=True,plays=True,drafts=True,picks=True,_excel=True))
+    export_excel.add_separator()
+    export_excel.add_command(label="Match History (Inverse Join)",command=lambda : export2(matches=True,_excel=True,inverted=True))
+    export_excel.add_command(label="Game History (Inverse Join)",command=lambda : export2(games=True,_excel=True,inverted=True))
+    export_excel.add_command(label="All Data (Inverse Join, 5 Files)",
+        command=lambda : export2(matches=True,games=True,plays=True,drafts=True,picks=True,_excel=True,inverted=True))
+    export_excel.add_separator()
+    export_excel.add_command(label="Currently Displayed Table (with Filters)",command=lambda : export2(current=True,_excel=True,filtered=True))
+
+    export_menu.add_cascade(label="Export to CSV",menu=export_csv)
+    export_menu.add_cascade(label="Export to Excel",menu=export_excel)
+    export_menu.add_separator()
+    export_menu.add_command(label="Set Default Export Folder",command=lambda : set_default_export())
+
+    data_menu = tk.Menu(menu_bar,tearoff=False)
+    menu_bar.add_cascade(label="Data",menu=data_menu)
+
+    data_menu.add_command(label="Input Missing Match Data",command=lambda : input_missing_data(),state=tk.DISABLED)
+    data_menu.add_command(label="Input Missing Game_Winner Data",command=lambda : get_winners(),state=tk.DISABLED)
+    data_menu.add_command(label="Apply Best Guess for Deck Names",command=lambda : rerun_decks_window(),state=tk.DISABLED)
+    data_menu.add_separator()
+    data_menu.add_command(label="Apply Associated Draft_IDs to Limited Matches",command=lambda : get_associated_draftid_pre(),state=tk.DISABLED)
+    data_menu.add_separator()
+    data_menu.add_command(label="Set Default Hero",command=lambda : set_default_hero(),state=tk.DISABLED)
+    data_menu.add_command(label="Set Default Import Folders",command=lambda : set_default_import())
+    data_menu.add_separator()
+    data_menu.add_command(label="Clear Loaded Data",command=lambda : clear_window(),state=tk.DISABLED)
+    data_menu.add_command(label="Delete Saved Session",command=lambda : delete_session())
+    # END menu bar entries
+
+    if test_mode:
+        test_menu = tk.Menu(menu_bar,tearoff=False)
+        menu_bar.add_cascade(label="Test",menu=test_menu)
+        test_menu.add_command(label="Create Debug Log",command=lambda : debug())
+        test_menu.add_command(label="Test Function",command=lambda : test())
+
+    window.config(menu=menu_bar)
+
+    match_button.grid(row=1,column=0,sticky="ew",padx=5,pady=(15,5))
+    game_button.grid(row=2,column=0,sticky="ew",padx=5,pady=(0,5))
+    play_button.grid(row=3,column=0,sticky="ew",padx=5,pady=(0,5))
+    draft_button.grid(row=4,column=0,sticky="ew",padx=5,pady=(0,5))
+    pick_button.grid(row=5,column=0,sticky="ew",padx=5,pady=(0,5))
+    stats_button.grid(row=6,column=0,sticky="ew",padx=5,pady=(20,5))
+    filter_button.grid(row=7,column=0,sticky="ew",padx=5,pady=(20,5))
+    clear_button.grid(row=8,column=0,sticky="ew",padx=5,pady=(0,5))
+    revise_button.grid(row=9,column=0,sticky="ew",padx=5,pady=(20,5))
+    remove_button.grid(row=10,column=0,sticky="ew",padx=5,pady=(0,5))
+    next_button.grid(row=11,column=0,sticky="ew",padx=5,pady=(20,5))
+    back_button.grid(row=12,column=0,sticky="ew",padx=5,pady=(0,5))
+    page_button.grid(row=13,column=0,sticky="ew",padx=5,pady=(0,5))
+
+    tree1 = ttk.Treeview(text_frame,show="headings")
+    tree1.grid(row=0,column=0,sticky="nsew")
+    tree1.bind("<Double-1>",tree_double)
+    tree1.bind("<ButtonRelease-1>",activate_revise)
+
+    # tree_scrolly = tk.Scrollbar(text_frame,command=tree1.yview)
+    # tree1.configure(yscrollcommand=tree_scrolly.set)
+    # tree_scrolly.grid(row=0,column=1,sticky="ns")
+
+    tree_scrollx = tk.Scrollbar(text_frame,orient="horizontal",command=tree1.xview)
+    tree1.configure(xscrollcommand=tree_scrollx.set)
+    tree_scrollx.grid(row=1,column=0,sticky="ew")
+
+    s = ttk.Style()
+    s.theme_use("default")
+    s.configure("Treeview",
+                background='white',
+                fieldbackground='white')
+    s.map("Treeview",
+        background=[("selected","#4a6984")],
+        foreground=[("selected","#ffffff")])
+
+    startup()
+    if WATCH_IMPORT_FOLDERS:
+        start_watcher()
+    window.protocol("WM_DELETE_WINDOW", lambda : exit_select())
+
+    # Event loop: listens for events (keypress, etc.)
+    # Blocks code after from running until window is closed.
+    window.mainloop()
\ No newline at end of file
@@ -0,0 +1,385 @@
+# SQLite Save File Module
+import collections
+import datetime
+import json
+import os
+import pickle
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Callable, Iterable, Union
+from MODO_DATA import HEADERS, INTEGER_COLUMNS
+from datatypes import AllData, MatchData, GameData, PlayData, ParsedFiles, pack_actions
+
+DATABASE_FILE = "MTGO_TRACKER.db"
+# Save files written by older versions, migrated into the database once.
+PICKLE_FILES = ["ALL_DATA","TIMEOUT","DRAFTS_TABLE","PICKS_TABLE",
+    "PARSED_FILE_DICT","PARSED_DRAFT_DICT"]
+PICKLE_BACKUP_FOLDER = "pickle_backup"
+
+# Matches and Drafts are upserted row by row on their unique ID.
+# Games, Plays and Picks are rewritten per Match_ID/Draft_ID when they change.
+KEYED_TABLES = {"Matches": "Match_ID", "Drafts": "Draft_ID"}
+GROUPED_TABLES = {"Games": "Match_ID", "Plays": "Match_ID", "Picks": "Draft_ID"}
+INDEXES = {
+    "Matches": ["P1", "Format", "Date"],
+    "Games": ["Match_ID"],
+    "Plays": ["Match_ID", "Casting_Player"],
+    "Picks": ["Draft_ID"]}
+# Plays and Picks never change after a log is parsed, so they are compared
+# by row count per Match_ID/Draft_ID instead of by content.
+IMMUTABLE_TABLES = ("Plays", "Picks")
+# Match_IDs/Draft_IDs per query, below the SQLite variable limit.
+QUERY_IDS = 500
+
+# session key: (table, key column, value columns)
+DICT_TABLES = {
+    "TIMEOUT": ("Timeout", "Match_ID", ["Player"]),
+    "PARSED_FILE_DICT": ("Parsed_Files", "File", ["Match_ID", "Parsed_Date"]),
+    "PARSED_DRAFT_DICT": ("Parsed_Drafts", "File", ["Draft_ID"]),
+    # zlib compressed, see datatypes.RawGameData. Older saves hold JSON lists.
+    "RAW_GAME_DATA": ("Raw_Game_Data", "Game_Key", ["Actions"]),
+    "GAMELOG_FINGERPRINTS": ("Gamelog_Fingerprints", "Path", 
+        ["File", "Size", "Mtime", "Hash", "Match_ID"]),
+    "GAMELOG_FOLDERS": ("Gamelog_Folders", "Path", ["Mtime"])}
+
+ROW_TYPES = {"Matches": MatchData, "Games": GameData, "Plays": PlayData,
+    "Drafts": list, "Picks": list}
+
+def encode_value(name: str, value: object) -> tuple:
+    """Turns a value of one of the session dicts into database columns."""
+    if name == "PARSED_FILE_DICT":
+        return (value[0], value[1].isoformat())
+    elif name == "RAW_GAME_DATA":
+        return (value if isinstance(value, bytes) else pack_actions(value),)
+    elif name == "GAMELOG_FINGERPRINTS":
+        return tuple(value)
+    return (value,)
+
+def decode_value(name: str, columns: tuple) -> object:
+    """Reverses encode_value."""
+    if name == "PARSED_FILE_DICT":
+        return (columns[0], datetime.datetime.fromisoformat(columns[1]))
+    elif name == "RAW_GAME_DATA":
+        if isinstance(columns[0], bytes):
+            return columns[0]
+        return pack_actions(json.loads(columns[0]))
+    elif name == "GAMELOG_FINGERPRINTS":
+        return (columns[0], int(columns[1]), int(columns[2]), columns[3], columns[4])
+    elif name == "GAMELOG_FOLDERS":
+        return int(columns[0])
+    return columns[0]
+
+def empty_session(columnar: bool=False) -> dict[str, object]:
+    return {"ALL_DATA": AllData(columnar=columnar), "TIMEOUT": {}, "DRAFTS_TABLE": [],
+        "PICKS_TABLE": [], "PARSED_FILE_DICT": ParsedFiles(), "PARSED_DRAFT_DICT": {},
+        "GAMELOG_FINGERPRINTS": {}, "GAMELOG_FOLDERS": {}}
+
+def session_tables(session: dict[str, object]) -> dict[str, list]:
+    all_data = session["ALL_DATA"]
+    return {"Matches": all_data.matches, "Games": all_data.games,
+        "Plays": all_data.plays, "Drafts": session["DRAFTS_TABLE"],
+        "Picks": session["PICKS_TABLE"]}
+
+def session_dicts(session: dict[str, object]) -> dict[str, dict]:
+    return {"TIMEOUT": session["TIMEOUT"],
+        "PARSED_FILE_DICT": session["PARSED_FILE_DICT"],
+        "PARSED_DRAFT_DICT": session["PARSED_DRAFT_DICT"],
+        # compressed games, a plain dict of action lists in old pickle saves
+        "RAW_GAME_DATA": getattr(session["ALL_DATA"].raw_game_data, "blobs",
+            session["ALL_DATA"].raw_game_data),
+        "GAMELOG_FINGERPRINTS": session["GAMELOG_FINGERPRINTS"],
+        "GAMELOG_FOLDERS": session["GAMELOG_FOLDERS"]}
+
+def column_definitions(table: str) -> str:
+    return ",".join(
+        f'"{column}" {"INTEGER" if column in INTEGER_COLUMNS else "TEXT"}'
+        for column in HEADERS[table])
+
+class Database:
+    """A save file holding all five tables plus the import bookkeeping.
+        Only the matches and drafts marked with mark_changed since the last 
+        load/save are compared with the file and written. The session dicts
+        are compared with a shallow copy taken at the last load/save.
+    """
+    def __init__(self, file_path: Union[str, Path]):
+        self.file_path = file_path
+        self.connection = sqlite3.connect(file_path)
+        # Match_IDs and Draft_IDs to compare on the next save, None for every row
+        self.changed = None
+        # Games and Plays rewritten on the next save, see expire_matches
+        self.expired = set()
+        self.dicts = None
+        self.create_tables()
+
+    def create_tables(self) -> None:
+        with self.connection:
+            for table, key in KEYED_TABLES.items():
+                self.connection.execute(f'CREATE TABLE IF NOT EXISTS {table} '
+                    f'({column_definitions(table)}, PRIMARY KEY ("{key}"))')
+            for table in GROUPED_TABLES:
+                self.connection.execute(f'CREATE TABLE IF NOT EXISTS {table} '
+                    f'({column_definitions(table)})')
+            for table, columns in INDEXES.items():
+                for column in columns:
+                    self.connection.execute(f'CREATE INDEX IF NOT EXISTS '
+                        f'{table}_{column} ON {table} ("{column}")')
+            for table, key, columns in DICT_TABLES.values():
+                value_columns = "".join(f', "{column}" TEXT' for column in columns)
+                self.connection.execute(f'CREATE TABLE IF NOT EXISTS {table} '
+                    f'("{key}" TEXT PRIMARY KEY{value_columns})')
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def is_empty(self) -> bool:
+        for table in ("Matches", "Drafts"):
+            if self.connection.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                return False
+        return True
+
+    def load(self, columnar: bool=False) -> dict[str, object]:
+        """Reads the whole save file.
+
+        Args:
+            columnar (bool): Hold Matches, Games and Plays in column arrays.
+
+        Returns:
+            dict[str, object]: Session with the keys ALL_DATA, TIMEOUT,
+                DRAFTS_TABLE, PICKS_TABLE, PARSED_FILE_DICT, PARSED_DRAFT_DICT,
+                GAMELOG_FINGERPRINTS and GAMELOG_FOLDERS.
+        """
+        session = empty_session(columnar)
+        tables = session_tables(session)
+        for table, rows in tables.items():
+            cursor = self.connection.execute(select_in_order(table))
+            if columnar and table in ("Matches", "Games", "Plays"):
+                rows.extend(cursor.fetchall())
+            else:
+                rows.extend(ROW_TYPES[table](row) for row in cursor)
+        dicts = session_dicts(session)
+        for name, (table, key, columns) in DICT_TABLES.items():
+            for row in self.connection.execute(f"SELECT * FROM {table} ORDER BY rowid"):
+                dicts[name][row[0]] = decode_value(name, row[1:])
+        self.reset_changes(session)
+        return session
+
+    def mark_changed(self, match_ids: Union[Iterable[str], None]=None,
+        draft_ids: Union[Iterable[str], None]=None) -> None:
+        """Makes the next save compare these matches and drafts, with their
+            Games, Plays and Picks, with the file. Without arguments every row 
+            is compared, eg. after the whole session was replaced."""
+        if (match_ids is None) and (draft_ids is None):
+            self.changed = None
+        elif self.changed is not None:
+            self.changed["Match_ID"].update(match_ids or ())
+            self.changed["Draft_ID"].update(draft_ids or ())
+
+    def reset_changes(self, session: dict[str, object]) -> None:
+        self.changed = {"Match_ID": set(), "Draft_ID": set()}
+        self.expired = set()
+        # values are shared with the session, they are replaced rather than edited
+        self.dicts = {name: dict(values) for name, values in session_dicts(session).items()}
+
+    def save(self, session: dict[str, object]) -> int:
+        """Writes the rows that changed since the last load/save.
+
+        Args:
+            session (dict[str, object]): Like returned from load.
+
+        Returns:
+            int: Number of rows written or deleted.
+        """
+        tables = session_tables(session)
+        written = 0
+        with self.connection:
+            for table in HEADERS:
+                if table not in tables:
+                    continue
+                key = KEYED_TABLES.get(table, GROUPED_TABLES.get(table))
+                ids = None if self.changed is None else self.changed[key]
+                if (ids is not None) and (not ids):
+                    continue
+                old, new = self.file_rows(table, ids), session_rows(session, table, ids)
+                if table in KEYED_TABLES:
+                    written += self.upsert_rows(table, old, new)
+                elif table in IMMUTABLE_TABLES:
+                    written += self.replace_groups(table, old, new,
+                        lambda keys, table=table: session_groups(session, table, keys))
+                else:
+                    written += self.replace_groups(table, old, new,
+                        lambda keys, new=new: new)
+            for name, (table, key, columns) in DICT_TABLES.items():
+                new = session_dicts(session)[name]
+                if self.changed is None:
+                    old = {row[0]: decode_value(name, row[1:]) for row in 
+                        self.connection.execute(f"SELECT * FROM {table}")}
+                else:
+                    old = self.dicts.get(name, {})
+                changed = [(k, *encode_value(name, v)) for k, v in new.items() 
+                    if (k not in old) or (old[k] != v)]
+                removed = [(k,) for k in old.keys() - new.keys()]
+                self.connection.executemany(f'DELETE FROM {table} WHERE "{key}" = ?', removed)
+                self.connection.executemany(f"INSERT OR REPLACE INTO {table} VALUES "
+                    f"({','.join('?' * (len(columns) + 1))})", changed)
+                written += len(changed) + len(removed)
+        self.reset_changes(session)
+        return written
+
+    def file_rows(self, table: str, ids: Union[set[str], None]) -> dict:
+        """Rows of the file in the form of session_rows, for these 
+            Match_IDs/Draft_IDs only unless ids is None."""
+        key = KEYED_TABLES.get(table, GROUPED_TABLES.get(table))
+        if table in IMMUTABLE_TABLES:
+            query = f'SELECT "{key}", COUNT(*) FROM {table}'
+            group = f' GROUP BY "{key}"'
+        else:
+            query, group = f"SELECT * FROM {table}", ""
+        if ids is None:
+            rows = list(self.connection.execute(query + group))
+        else:
+            ids, rows = list(ids), []
+            for start in range(0, len(ids), QUERY_IDS):
+                chunk = ids[start:start + QUERY_IDS]
+                rows.extend(self.connection.execute(f'{query} WHERE "{key}" IN '
+                    f"({','.join('?' * len(chunk))}){group}", chunk))
+        if table in KEYED_TABLES:
+            return {row[0]: row for row in rows}
+        # expired groups are rewritten whatever they hold
+        expired = self.expired if key == "Match_ID" else set()
+        if table in IMMUTABLE_TABLES:
+            return {row[0]: None if row[0] in expired else row[1] for row in rows}
+        groups = group_rows(rows)
+        for match_id in expired & groups.keys():
+            groups[match_id] = None
+        return groups
+
+    def expire_matches(self, match_ids) -> None:
+        """Makes the next save rewrite the Games and Plays of these matches,
+            e.g. after their GameLog was parsed again. Needed for Plays since 
+            they are only compared by row count."""
+        match_ids = set(match_ids)
+        self.expired.update(match_ids)
+        self.mark_changed(match_ids)
+
+    def upsert_rows(self, table: str, old: dict, new: dict) -> int:
+        header = HEADERS[table]
+        key = KEYED_TABLES[table]
+        changed = [row for row_id, row in new.items() if old.get(row_id) != row]
+        removed = [(row_id,) for row_id in old.keys() - new.keys()]
+        updates = ",".join(f'"{column}"=excluded."{column}"' for column in header[1:])
+        self.connection.executemany(f'DELETE FROM {table} WHERE "{key}" = ?', removed)
+        self.connection.executemany(f"INSERT INTO {table} VALUES "
+            f"({','.join('?' * len(header))}) "
+            f'ON CONFLICT("{key}") DO UPDATE SET {updates}', changed)
+        return len(changed) + len(removed)
+
+    def replace_groups(self, table: str, old: dict, new: dict,
+        get_groups: Callable[[set], dict[str, list[tuple]]]) -> int:
+        key = GROUPED_TABLES[table]
+        changed = {group for group, value in new.items() if old.get(group) != value}
+        stale = (old.keys() - new.keys()) | (changed & old.keys())
+        self.connection.executemany(f'DELETE FROM {table} WHERE "{key}" = ?',
+            [(group,) for group in stale])
+        if not changed:
+            return len(stale)
+        groups = get_groups(changed)
+        rows = [row for group in new if group in changed
+            for row in groups.get(group, ())]
+        self.connection.executemany(f"INSERT INTO {table} VALUES "
+            f"({','.join('?' * len(HEADERS[table]))})", rows)
+        return len(stale) + len(rows)
+
+def select_in_order(table: str) -> str:
+    """Rows come back in the order they were saved. Games, Plays and Picks
+        follow the order of their Match/Draft, since rewriting a group moves
+        its rows to the end of the table."""
+    if table in KEYED_TABLES:
+        return f"SELECT * FROM {table} ORDER BY rowid"
+    key = GROUPED_TABLES[table]
+    parent = [name for name, parent_key in KEYED_TABLES.items() if parent_key == key][0]
+    return (f'SELECT t.* FROM {table} t LEFT JOIN {parent} p ON p."{key}" = t."{key}" '
+        f"ORDER BY p.rowid, t.rowid")
+
+def session_rows(session: dict[str, object], table: str, 
+    ids: Union[set[str], None]) -> dict:
+    """Rows of one table by Match_ID/Draft_ID, for these ids only unless ids
+        is None. Matches and Drafts as tuples, Games grouped per match,
+        Plays and Picks as row counts."""
+    all_data = session["ALL_DATA"]
+    rows = session_tables(session)[table]
+    if ids is None:
+        if table in KEYED_TABLES:
+            return {row[0]: tuple(row) for row in rows}
+        elif table in IMMUTABLE_TABLES:
+            return collections.Counter(row[0] for row in rows)
+        return group_rows(rows)
+    if table == "Matches":
+        matches = (all_data.get_match(match_id) for match_id in ids)
+        return {match[0]: tuple(match) for match in matches if match is not None}
+    elif table == "Games":
+        return group_rows(game for match_id in ids 
+            for game in all_data.match_games(match_id))
+    elif table == "Plays":
+        counts = {}
+        for match_id in ids:
+            play_rows = all_data.play_rows(match_id)
+            if isinstance(play_rows, slice):
+                play_rows = range(len(rows))[play_rows]
+            if len(play_rows):
+                counts[match_id] = len(play_rows)
+        return counts
+    # the Drafts and Picks tables are small next to the Plays
+    elif table == "Drafts":
+        return {row[0]: tuple(row) for row in rows if row[0] in ids}
+    return collections.Counter(row[0] for row in rows if row[0] in ids)
+
+def session_groups(session: dict[str, object], table: str, 
+    ids: set[str]) -> dict[str, tuple[tuple]]:
+    """Rows of the Plays or Picks of these ids, see group_rows."""
+    if table == "Plays":
+        all_data = session["ALL_DATA"]
+        return group_rows(play for match_id in ids 
+            for play in all_data.match_plays(match_id))
+    return group_rows(row for row in session_tables(session)[table] if row[0] in ids)
+
+def group_rows(rows) -> dict[str, tuple[tuple]]:
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[0], []).append(tuple(row))
+    return {key: tuple(value) for key, value in groups.items()}
+
+def load_pickles(save_path: Union[str, Path]) -> dict[str, object]:
+    session = empty_session()
+    for name in PICKLE_FILES:
+        file_path = os.path.join(save_path,name)
+        if os.path.isfile(file_path):
+            with open(file_path,"rb") as file:
+                session[name] = pickle.load(file)
+    return session
+
+def migrate_pickles(save_path: Union[str, Path], database: Database) -> bool:
+    """Moves a session saved as pickle files into an empty database.
+        The pickle files are kept in a backup folder afterwards.
+
+    Returns:
+        bool: Whether anything was migrated.
+    """
+    pickle_files = [name for name in PICKLE_FILES
+        if os.path.isfile(os.path.join(save_path,name))]
+    if (not pickle_files) or (not database.is_empty()):
+        return False
+    database.save(load_pickles(save_path))
+    backup_path = os.path.join(save_path,PICKLE_BACKUP_FOLDER)
+    os.makedirs(backup_path,exist_ok=True)
+    for name in pickle_files:
+        shutil.move(os.path.join(save_path,name),os.path.join(backup_path,name))
+    return True
+
+def open_database(save_path: Union[str, Path]) -> Database:
+    """Opens (or creates) the save file in the save folder,
+        migrating pickled save files from older versions on first use."""
+    os.makedirs(save_path,exist_ok=True)
+    database = Database(os.path.join(save_path,DATABASE_FILE))
+    migrate_pickles(save_path, database)
+    return database
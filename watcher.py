@@ -0,0 +1,238 @@
+# Import Folder Watcher Module
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Union
+import importer
+
+# Seconds between scans of the import folders when inotify is not available.
+POLL_INTERVAL = 2.0
+# Seconds a log has to stay unchanged before it is parsed.
+# MTGO keeps appending to the GameLog of a running match.
+SETTLE_TIME = 5.0
+
+# inotify event masks, see inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct("iIII")
+
+class InotifyEvents:
+    """Files changed in a set of folders, as reported by Linux inotify.
+        Raises OSError if inotify is not available.
+    """
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.folders = {}
+
+    def watch(self, folder: str) -> list[str]:
+        """Watches a folder and its subfolders.
+
+        Returns:
+            list[str]: Files already in the folders.
+        """
+        file_paths = []
+        for (root,dirs,files) in os.walk(folder):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"Cannot watch {root}")
+            self.folders[wd] = root
+            file_paths.extend(os.path.join(root,file) for file in files)
+        return file_paths
+
+    def read(self, timeout: float) -> Union[list[str], None]:
+        """Waits up to timeout seconds for changes.
+
+        Returns:
+            Union[list[str], None]: Changed files,
+                None if events were lost and the folders have to be scanned.
+        """
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        data = os.read(self.fd, 64 * 1024)
+        file_paths = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length]
+            offset += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if (wd not in self.folders) or (not name.rstrip(b"\0")):
+                continue
+            path = os.path.join(self.folders[wd], os.fsdecode(name.rstrip(b"\0")))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        file_paths.extend(self.watch(path))
+                    except OSError:
+                        return None
+            else:
+                file_paths.append(path)
+        return file_paths
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+class LogWatcher(threading.Thread):
+    """Watches the GameLogs and DraftLogs folders on a daemon thread.
+        Uses inotify on Linux and scans the folders every POLL_INTERVAL
+        seconds elsewhere. Logs are parsed once they stopped changing for
+        SETTLE_TIME seconds, results are put on a queue for the Tk thread:
+            ("gamelog", ParsedGameLog): Pass to importer.collect_gamelogs.
+            ("draftlog", (file_path, parsed_data)): Pass to importer.add_draftlog.
+            ("error", str): A log that could not be read.
+        The thread never touches the session data, it works on copies of
+        the import bookkeeping passed in.
+    """
+    def __init__(
+        self,
+        logs_path: Union[str, None],
+        drafts_path: Union[str, None],
+        results: queue.Queue,
+        fingerprints: dict[str, tuple],
+        folder_mtimes: dict[str, int],
+        parsed_file_dict: dict,
+        parsed_draft_dict: dict,
+        settle_time: float=SETTLE_TIME,
+        poll_interval: float=POLL_INTERVAL):
+        """
+        Args:
+            logs_path (Union[str, None]): GameLogs folder, None to skip.
+            drafts_path (Union[str, None]): DraftLogs folder, None to skip.
+            results (queue.Queue): Parsed logs are put here.
+            fingerprints, folder_mtimes, parsed_file_dict, parsed_draft_dict:
+                Copies of the session dicts, see importer.scan_gamelogs.
+            settle_time (float): See SETTLE_TIME.
+            poll_interval (float): See POLL_INTERVAL.
+        """
+        super().__init__(name="LogWatcher", daemon=True)
+        self.logs_path = logs_path
+        self.drafts_path = drafts_path
+        self.results = results
+        self.fingerprints = fingerprints
+        self.folder_mtimes = folder_mtimes
+        self.parsed_file_dict = parsed_file_dict
+        self.parsed_draft_dict = parsed_draft_dict
+        self.draft_folder_mtimes = {}
+        self.settle_time = settle_time
+        self.poll_interval = poll_interval
+        self.stop_event = threading.Event()
+        # file path -> ((size, mtime_ns), time the file was first seen like that)
+        self.pending = {}
+        # file path -> (size, mtime_ns) of logs that could not be parsed
+        self.failed = {}
+        self.events = None
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+    def run(self) -> None:
+        try:
+            self.events = InotifyEvents()
+            for folder in (self.logs_path, self.drafts_path):
+                if folder:
+                    self.events.watch(folder)
+        except OSError:
+            if self.events is not None:
+                self.events.close()
+            self.events = None
+        # logs written while the watcher was not running
+        self.add_pending(self.scan())
+        while not self.stop_event.is_set():
+            if self.events is None:
+                if self.stop_event.wait(self.poll_interval):
+                    break
+                file_paths = self.scan()
+            else:
+                file_paths = self.events.read(min(self.poll_interval, self.settle_time))
+                if file_paths is None:
+                    file_paths = self.scan()
+            self.add_pending(file_paths)
+            self.parse_settled()
+        if self.events is not None:
+            self.events.close()
+
+    def is_gamelog(self, file_path: str) -> bool:
+        return bool(self.logs_path) and importer.is_gamelog(os.path.basename(file_path))
+
+    def is_draftlog(self, file_path: str) -> bool:
+        return bool(self.drafts_path) and importer.is_draftlog(os.path.basename(file_path))
+
+    def scan(self) -> list[str]:
+        """GameLogs and DraftLogs that are new or changed since the last scan."""
+        file_paths = []
+        if self.logs_path:
+            file_paths.extend(importer.scan_gamelogs(self.logs_path, self.fingerprints,
+                self.folder_mtimes, self.parsed_file_dict))
+        if self.drafts_path:
+            for (root,dirs,files) in os.walk(self.drafts_path):
+                try:
+                    mtime = os.stat(root).st_mtime_ns
+                except OSError:
+                    continue
+                if self.draft_folder_mtimes.get(root) == mtime:
+                    continue
+                self.draft_folder_mtimes[root] = mtime
+                file_paths.extend(os.path.join(root,file) for file in files
+                    if importer.is_draftlog(file) and (file not in self.parsed_draft_dict))
+        return file_paths
+
+    def add_pending(self, file_paths: list[str]) -> None:
+        for file_path in file_paths:
+            if self.is_gamelog(file_path) or (self.is_draftlog(file_path) and (
+                os.path.basename(file_path) not in self.parsed_draft_dict)):
+                self.pending.setdefault(file_path, None)
+
+    def parse_settled(self) -> None:
+        """Parses the pending logs that did not change for settle_time seconds."""
+        now = time.monotonic()
+        for file_path, seen in list(self.pending.items()):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                del self.pending[file_path]
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if (seen is None) or (seen[0] != signature):
+                self.pending[file_path] = (signature, now)
+                continue
+            if now - seen[1] < self.settle_time:
+                continue
+            del self.pending[file_path]
+            if self.failed.get(file_path) != signature:
+                self.parse(file_path, signature)
+
+    def parse(self, file_path: str, signature: tuple[int, int]) -> None:
+        file = os.path.basename(file_path)
+        try:
+            if self.is_gamelog(file_path):
+                result = importer.parse_gamelog(file_path)
+                parsed_data = result[2]
+                self.fingerprints[file_path] = (file, *result[4],
+                    parsed_data[0].Match_ID if parsed_data else "NA")
+                if parsed_data:
+                    self.parsed_file_dict[file] = (parsed_data[0].Match_ID, None)
+                self.results.put(("gamelog", result))
+            else:
+                parsed_data = importer.parse_draftlog(file_path)
+                self.parsed_draft_dict[file] = parsed_data[2]
+                self.results.put(("draftlog", (file_path, parsed_data)))
+        except Exception as e: # tried again once the file changes
+            self.failed[file_path] = signature
+            self.results.put(("error", f"Encountered {e} in file {file}. Skipping."))